@@ -8,6 +8,8 @@ from plotly.subplots import make_subplots
 import glob
 import os
 from finmind_tools import get_api_quota_info
+from industry_overview import calculate_industry_rankings
+from perf import plotly_chart, rerun, span
 from language_config import get_text, create_language_selector, create_sidebar_navigation
 
 # Set page config with default title (will be overridden by sidebar)
@@ -89,12 +91,6 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Main Header
-st.markdown(f'<h1 class="main-header">{get_text("dashboard_title")}</h1>', unsafe_allow_html=True)
-
-# --- Market Overview Section ---
-st.markdown(f"## {get_text('market_overview')}")
-
 # Industry name mapping function
 def get_translated_industry_name(chinese_name):
     """Map Chinese CSV filename to translated industry name"""
@@ -169,32 +165,11 @@ def load_all_industries_data():
     
     return industries_data, len(total_companies)
 
-industries_data, total_unique_companies = load_all_industries_data()
-
-# Top metrics row
-col1, col2, col3, col4 = st.columns(4)
-
-with col1:
-    st.markdown(f"""
-    <div class="metric-card">
-        <h3>{get_text('industries')}</h3>
-        <h2>{len(industries_data)}</h2>
-        <p>{get_text('market_sectors')}</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col2:
-    st.markdown(f"""
-    <div class="metric-card">
-        <h3>{get_text('companies')}</h3>
-        <h2>{total_unique_companies}</h2>
-        <p>{get_text('listed_stocks')}</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col3:
+def render_quota_card(card):
+    """Fills the API status card; called last so the quota request does not delay the rest of the page"""
     try:
-        quota_info = get_api_quota_info()
+        with span("load.api_quota"):
+            quota_info = get_api_quota_info()
         if quota_info:
             remaining = quota_info["remaining"]
             # Use darker colors for better contrast
@@ -202,7 +177,7 @@ with col3:
                 bg_color = "linear-gradient(135deg, #C0392B 0%, #A93226 100%)"
             else:
                 bg_color = "linear-gradient(135deg, #27AE60 0%, #229954 100%)"
-            st.markdown(f"""
+            card.markdown(f"""
             <div class="metric-card" style="background: {bg_color};">
                 <h3>{get_text('api_status')}</h3>
                 <h2>{remaining}</h2>
@@ -210,7 +185,7 @@ with col3:
             </div>
             """, unsafe_allow_html=True)
         else:
-            st.markdown(f"""
+            card.markdown(f"""
             <div class="metric-card">
                 <h3>{get_text('api_status')}</h3>
                 <h2>--</h2>
@@ -218,7 +193,7 @@ with col3:
             </div>
             """, unsafe_allow_html=True)
     except:
-        st.markdown(f"""
+        card.markdown(f"""
         <div class="metric-card">
             <h3>{get_text('api_status')}</h3>
             <h2>--</h2>
@@ -226,36 +201,76 @@ with col3:
         </div>
         """, unsafe_allow_html=True)
 
-with col4:
-    # Calculate actual date range from data
-    try:
-        # Get date range from a sample of the data
-        sample_csv = next(iter(industries_data.values()))['latest_data'] if industries_data else None
-        if sample_csv is not None and 'date' in sample_csv.columns:
-            # Get the actual date range from all CSV files
-            all_dates = []
-            for csv_file in glob.glob("finmind_data/*.csv"):
-                try:
-                    df = pd.read_csv(csv_file, usecols=['date'], nrows=1000)  # Sample for performance
-                    all_dates.extend(df['date'].tolist())
-                except:
-                    continue
+def main():
+    # Main Header
+    st.markdown(f'<h1 class="main-header">{get_text("dashboard_title")}</h1>', unsafe_allow_html=True)
+
+    # --- Market Overview Section ---
+    st.markdown(f"## {get_text('market_overview')}")
+    with span("load.industries"):
+        industries_data, total_unique_companies = load_all_industries_data()
+
+    # Top metrics row
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.markdown(f"""
+    <div class="metric-card">
+        <h3>{get_text('industries')}</h3>
+        <h2>{len(industries_data)}</h2>
+        <p>{get_text('market_sectors')}</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    with col2:
+        st.markdown(f"""
+    <div class="metric-card">
+        <h3>{get_text('companies')}</h3>
+        <h2>{total_unique_companies}</h2>
+        <p>{get_text('listed_stocks')}</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    with col3:
+        quota_card = st.empty()
+        quota_card.markdown(f"""
+    <div class="metric-card">
+        <h3>{get_text('api_status')}</h3>
+        <h2>--</h2>
+        <p>{get_text('checking_quota')}</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    with col4:
+        # Calculate actual date range from data
+        try:
+            # Get date range from a sample of the data
+            sample_csv = next(iter(industries_data.values()))['latest_data'] if industries_data else None
+            if sample_csv is not None and 'date' in sample_csv.columns:
+                # Get the actual date range from all CSV files
+                all_dates = []
+                for csv_file in glob.glob("finmind_data/*.csv"):
+                    try:
+                        df = pd.read_csv(csv_file, usecols=['date'], nrows=1000)  # Sample for performance
+                        all_dates.extend(df['date'].tolist())
+                    except:
+                        continue
             
-            if all_dates:
-                min_date = min(all_dates)
-                max_date = max(all_dates)
-                # Format as "Mar 2019 - Mar 2025"
-                min_formatted = pd.to_datetime(min_date).strftime("%b %Y")
-                max_formatted = pd.to_datetime(max_date).strftime("%b %Y")
-                date_range = f"{min_formatted} - {max_formatted}"
+                if all_dates:
+                    min_date = min(all_dates)
+                    max_date = max(all_dates)
+                    # Format as "Mar 2019 - Mar 2025"
+                    min_formatted = pd.to_datetime(min_date).strftime("%b %Y")
+                    max_formatted = pd.to_datetime(max_date).strftime("%b %Y")
+                    date_range = f"{min_formatted} - {max_formatted}"
+                else:
+                    date_range = "Mar 2019 - Mar 2025"
             else:
                 date_range = "Mar 2019 - Mar 2025"
-        else:
+        except:
             date_range = "Mar 2019 - Mar 2025"
-    except:
-        date_range = "Mar 2019 - Mar 2025"
     
-    st.markdown(f"""
+        st.markdown(f"""
     <div class="metric-card">
         <h3>{get_text('data_period')}</h3>
         <h2>{date_range}</h2>
@@ -263,203 +278,141 @@ with col4:
     </div>
     """, unsafe_allow_html=True)
 
-st.markdown("---")
+    st.markdown("---")
 
-# --- Industry Overview Charts ---
-st.markdown(f"### {get_text('market_structure_rankings')}")
+    # --- Industry Overview Charts ---
+    st.markdown(f"### {get_text('market_structure_rankings')}")
 
-# First row: Company distribution
-col1, col2 = st.columns([1, 1.4])
+    # First row: Company distribution
+    col1, col2 = st.columns([1, 1.4])
 
-with col1:
-    st.markdown(f"#### {get_text('industries_by_company_count')}")
-    if industries_data:
-        # Create industry size chart
-        industry_sizes = []
-        for industry, data in industries_data.items():
-            industry_sizes.append({
-                'Industry': get_translated_industry_name(industry),
-                'Companies': data['total_companies']
-            })
+    with col1:
+        st.markdown(f"#### {get_text('industries_by_company_count')}")
+        if industries_data:
+            # Create industry size chart
+            industry_sizes = []
+            for industry, data in industries_data.items():
+                industry_sizes.append({
+                    'Industry': get_translated_industry_name(industry),
+                    'Companies': data['total_companies']
+                })
         
-        size_df = pd.DataFrame(industry_sizes).sort_values('Companies', ascending=True)
+            size_df = pd.DataFrame(industry_sizes).sort_values('Companies', ascending=True)
         
-        fig_bar = px.bar(
-            size_df, 
-            x='Companies', 
-            y='Industry',
-            orientation='h',
-            color='Companies',
-            color_continuous_scale='blues',
-            title=get_text('companies_per_industry')
-        )
-        fig_bar.update_layout(
-            height=600,  # Increased height to accommodate all industry names
-            showlegend=False,
-            title_font_size=14,
-            font=dict(size=11),
-            margin=dict(l=120, r=20, t=40, b=20),  # More left margin for industry names
-            yaxis=dict(tickfont=dict(size=11))  # Larger font for Chinese industry names
-        )
-        st.plotly_chart(fig_bar, use_container_width=True)
+            fig_bar = px.bar(
+                size_df, 
+                x='Companies', 
+                y='Industry',
+                orientation='h',
+                color='Companies',
+                color_continuous_scale='blues',
+                title=get_text('companies_per_industry')
+            )
+            fig_bar.update_layout(
+                height=600,  # Increased height to accommodate all industry names
+                showlegend=False,
+                title_font_size=14,
+                font=dict(size=11),
+                margin=dict(l=120, r=20, t=40, b=20),  # More left margin for industry names
+                yaxis=dict(tickfont=dict(size=11))  # Larger font for Chinese industry names
+            )
+            plotly_chart(fig_bar, use_container_width=True)
 
-with col2:
-    st.markdown(f"#### {get_text('market_distribution')}")
-    if industries_data:
-        # Create pie chart
-        fig_pie = px.pie(
-            size_df,
-            values='Companies',
-            names='Industry',
-            title=get_text('market_share_by_industry'),
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
-        fig_pie.update_traces(
-            textposition='outside', 
-            textinfo='percent+label',
-            textfont_size=9,  # Smaller font to fit more labels
-            pull=[0.05 if x == size_df['Companies'].max() else 0 for x in size_df['Companies']],
-            hovertemplate='<b>%{label}</b><br>' +
-                         'Companies: %{value}<br>' +
-                         'Percentage: %{percent}<br>' +
-                         '<extra></extra>'
-        )
-        fig_pie.update_layout(
-            height=650,  # Increased height for better spacing
-            title_font_size=14,
-            font=dict(size=9),
-            showlegend=False,
-            margin=dict(t=80, b=150, l=120, r=120),  # Much larger margins for leader lines
-            annotations=[
-                dict(text='', x=0.5, y=-0.1, xref='paper', yref='paper', 
-                     showarrow=False, font=dict(size=8))
-            ]
-        )
-        st.plotly_chart(fig_pie, use_container_width=True)
+    with col2:
+        st.markdown(f"#### {get_text('market_distribution')}")
+        if industries_data:
+            # Create pie chart
+            fig_pie = px.pie(
+                size_df,
+                values='Companies',
+                names='Industry',
+                title=get_text('market_share_by_industry'),
+                color_discrete_sequence=px.colors.qualitative.Set3
+            )
+            fig_pie.update_traces(
+                textposition='outside', 
+                textinfo='percent+label',
+                textfont_size=9,  # Smaller font to fit more labels
+                pull=[0.05 if x == size_df['Companies'].max() else 0 for x in size_df['Companies']],
+                hovertemplate='<b>%{label}</b><br>' +
+                             'Companies: %{value}<br>' +
+                             'Percentage: %{percent}<br>' +
+                             '<extra></extra>'
+            )
+            fig_pie.update_layout(
+                height=650,  # Increased height for better spacing
+                title_font_size=14,
+                font=dict(size=9),
+                showlegend=False,
+                margin=dict(t=80, b=150, l=120, r=120),  # Much larger margins for leader lines
+                annotations=[
+                    dict(text='', x=0.5, y=-0.1, xref='paper', yref='paper', 
+                         showarrow=False, font=dict(size=8))
+                ]
+            )
+            plotly_chart(fig_pie, use_container_width=True)
 
-# Second row: Financial Analysis Rankings
-st.markdown("---")
+    # Second row: Financial Analysis Rankings
+    st.markdown("---")
 
-def calculate_industry_rankings():
-    """Calculate average pass rates for each industry across all analysis types"""
-    industry_rankings = {}
-    
-    for csv_file in glob.glob("finmind_data/*.csv"):
-        try:
-            industry_name = os.path.basename(csv_file).replace('.csv', '')
-            df = pd.read_csv(csv_file)
-            
-            if df.empty or 'date' not in df.columns:
-                continue
-                
-            # Filter to recent data (2020+) like in the analysis modules
-            df = df[df['date'] >= '2020-01-01'].copy()
-            
-            if df.empty:
-                continue
-            
-            # Calculate metrics for each analysis type
-            rankings = {}
-            
-            # Balance Sheet Analysis (simplified)
-            try:
-                balance_data = df[df['type'].isin(['CashAndCashEquivalents', 'TotalLiabilities', 'RetainedEarnings', 'TotalCurrentLiabilities'])].copy()
-                if not balance_data.empty:
-                    # Simple balance sheet health check
-                    cash_avg = balance_data[balance_data['type'] == 'CashAndCashEquivalents']['value'].mean() if not balance_data[balance_data['type'] == 'CashAndCashEquivalents'].empty else 0
-                    debt_avg = balance_data[balance_data['type'].isin(['TotalLiabilities', 'TotalCurrentLiabilities'])]['value'].mean() if not balance_data[balance_data['type'].isin(['TotalLiabilities', 'TotalCurrentLiabilities'])].empty else 0
-                    retained_avg = balance_data[balance_data['type'] == 'RetainedEarnings']['value'].mean() if not balance_data[balance_data['type'] == 'RetainedEarnings'].empty else 0
-                    rankings['Balance Sheet'] = max(0, (cash_avg + retained_avg - debt_avg) / 1000000)  # Simplified score
-            except:
-                rankings['Balance Sheet'] = 0
-            
-            # Income Statement Analysis (simplified)  
-            try:
-                income_data = df[df['type'].isin(['Revenue', 'NetIncome', 'IncomeBeforeIncomeTax', 'GrossProfit'])].copy()
-                if not income_data.empty:
-                    revenue_avg = income_data[income_data['type'] == 'Revenue']['value'].mean() if not income_data[income_data['type'] == 'Revenue'].empty else 0
-                    profit_avg = income_data[income_data['type'] == 'NetIncome']['value'].mean() if not income_data[income_data['type'] == 'NetIncome'].empty else 0
-                    gross_profit_avg = income_data[income_data['type'] == 'GrossProfit']['value'].mean() if not income_data[income_data['type'] == 'GrossProfit'].empty else 0
-                    # Calculate profitability score - use absolute value to show performance magnitude
-                    if profit_avg != 0:
-                        rankings['Income Statement'] = abs(profit_avg) / 1000000
-                    elif gross_profit_avg != 0:
-                        rankings['Income Statement'] = abs(gross_profit_avg) / 1000000  
-                    else:
-                        rankings['Income Statement'] = 0
-            except:
-                rankings['Income Statement'] = 0
-            
-            # Cash Flow Analysis (simplified)
-            try:
-                cf_data = df[df['type'] == 'CashFlowsFromOperatingActivities'].copy()
-                if not cf_data.empty:
-                    cf_avg = cf_data['value'].mean()
-                    rankings['Cash Flow'] = max(0, cf_avg) / 1000000  # Simplified score
-                else:
-                    rankings['Cash Flow'] = 0
-            except:
-                rankings['Cash Flow'] = 0
-            
-            industry_rankings[industry_name] = rankings
-            
-        except Exception as e:
-            continue
-    
-    return industry_rankings
-
-# Calculate rankings
-industry_rankings = calculate_industry_rankings()
+    # Calculate rankings
+    with span("compute.industry_rankings"):
+        industry_rankings = calculate_industry_rankings()
 
-if industry_rankings:
-    # Create three ranking charts
-    col1, col2, col3 = st.columns(3)
+    if industry_rankings:
+        # Create three ranking charts
+        col1, col2, col3 = st.columns(3)
     
-    analysis_types = ['Balance Sheet', 'Income Statement', 'Cash Flow']
-    colors = ['#2E86AB', '#A23B72', '#F18F01']
+        analysis_types = ['Balance Sheet', 'Income Statement', 'Cash Flow']
+        colors = ['#2E86AB', '#A23B72', '#F18F01']
     
-    for i, (analysis_type, color) in enumerate(zip(analysis_types, colors)):
-        # Prepare data for this analysis type
-        ranking_data = []
-        for industry, scores in industry_rankings.items():
-            score = scores.get(analysis_type, 0)
-            ranking_data.append({
-                'Industry': get_translated_industry_name(industry),
-                'Score': score
-            })
+        for i, (analysis_type, color) in enumerate(zip(analysis_types, colors)):
+            # Prepare data for this analysis type
+            ranking_data = []
+            for industry, scores in industry_rankings.items():
+                score = scores.get(analysis_type, 0)
+                ranking_data.append({
+                    'Industry': get_translated_industry_name(industry),
+                    'Score': score
+                })
         
-        rank_df = pd.DataFrame(ranking_data).sort_values('Score', ascending=True)
+            rank_df = pd.DataFrame(ranking_data).sort_values('Score', ascending=True)
         
-        # Create chart
-        fig = px.bar(
-            rank_df,  # Show all industries
-            x='Score',
-            y='Industry',
-            orientation='h',
-            title=get_text(f"{analysis_type.lower().replace(' ', '_')}_strength"),
-            color_discrete_sequence=[color]
-        )
-        # Add unit descriptions for each analysis type
-        if analysis_type == "Balance Sheet":
-            x_title = get_text('balance_sheet_desc')
-        elif analysis_type == "Income Statement":
-            x_title = get_text('income_statement_desc')
-        else:  # Cash Flow
-            x_title = get_text('cash_flow_desc')
+            # Create chart
+            fig = px.bar(
+                rank_df,  # Show all industries
+                x='Score',
+                y='Industry',
+                orientation='h',
+                title=get_text(f"{analysis_type.lower().replace(' ', '_')}_strength"),
+                color_discrete_sequence=[color]
+            )
+            # Add unit descriptions for each analysis type
+            if analysis_type == "Balance Sheet":
+                x_title = get_text('balance_sheet_desc')
+            elif analysis_type == "Income Statement":
+                x_title = get_text('income_statement_desc')
+            else:  # Cash Flow
+                x_title = get_text('cash_flow_desc')
             
-        fig.update_layout(
-            height=500,
-            title_font_size=14,
-            font=dict(size=9),
-            showlegend=False,
-            xaxis_title=x_title,
-            yaxis_title=""
-        )
+            fig.update_layout(
+                height=500,
+                title_font_size=14,
+                font=dict(size=9),
+                showlegend=False,
+                xaxis_title=x_title,
+                yaxis_title=""
+            )
         
-        with [col1, col2, col3][i]:
-            st.plotly_chart(fig, use_container_width=True)
+            with [col1, col2, col3][i]:
+                plotly_chart(fig, use_container_width=True)
+
+    st.markdown("---")
+
+    # Quick actions are now available in the left sidebar for easy navigation
 
-st.markdown("---")
+    render_quota_card(quota_card)
 
-# Quick actions are now available in the left sidebar for easy navigation
 
+with rerun("dashboard"):
+    main()
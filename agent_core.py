@@ -0,0 +1,533 @@
+# agent_core.py
+
+import queue
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Dict
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_openai import ChatOpenAI
+
+from agent_tools import compare_stocks, get_best_stock_for_industry, get_financial_statements
+from finmind_tools import (
+    get_language_instruction, get_price_30days, get_taiwan_stock_info,
+    load_industry_rankings, loaded_industries
+)
+from language_config import get_text
+from profile_store import get_profile, save_profile
+from prompt_encoding import column_legend, count_tokens, encode_table
+from stock_scorer import score_industry
+from stock_search import StockSearchIndex
+
+# --- Stock Agent configuration shared by the page and offline jobs ---
+AGENT_MODEL = "gpt-3.5-turbo"
+
+# Industries offered as one-click prompts on the Stock Agent page
+PRESET_INDUSTRIES = [
+    "食品工業", "居家生活", "半導體業", "電子商務業",
+    "農業科技", "玻璃陶瓷", "水泥工業", "造紙工業",
+    "運動休閒類", "橡膠工業", "油電燃氣業", "綠能環保類",
+    "塑膠工業", "航運業", "文化創意業", "農業科技業", "觀光事業", "貿易百貨", "光電業", "生技醫療業"
+]
+
+SYSTEM_PROMPTS = {
+    "zh": """你是一位專業的金融分析師，能夠分析股票指標、排名和行業表現。
+
+你會收到特定行業的結構化數據，包括平均比率、利潤率、每股盈餘、自由現金流，以及各類別（資產負債表、損益表、現金流）的「通過百分比」。
+
+📌「通過百分比」反映了從2020年至今，該股票在各季度中**符合所有定義條件**的百分比。
+
+但是，**不要只關注「通過百分比」**。將其作為**眾多因素之一**。你的工作是**全面分析**股票——平衡財務健康（如現金/債務、股權）、盈利能力（如利潤率、每股盈餘）和現金流強度。
+
+請按照以下結構提供詳細分析：
+
+## 資產負債表分析
+分析每隻股票的財務健康狀況，包括現金/債務比率、負債/權益比率、通過百分比等，並說明各股票的優勢和劣勢。
+
+## 損益表分析  
+評估每隻股票的盈利能力，包括毛利率、淨利率、每股盈餘、通過百分比等，並比較各股票的表現。
+
+## 現金流分析
+檢視每隻股票的現金流強度，包括自由現金流、經營現金流、通過百分比等，並評估其現金產生能力。
+
+## 結論
+綜合所有分析，明確說明哪隻股票是最佳選擇，使用以下格式：
+"[股票名稱]（股票代號）是該行業最佳股票，因為..."
+或"最佳股票是[股票名稱]（股票代號），原因是..."
+
+重要格式要求：
+1. 絶對不要使用「我認為」、「我覺得」、「我想」、「我相信」等主觀表達
+2. 不要使用**粗體**格式
+3. 直接陳述事實和結論
+4. 在陳述最終推薦時，請務必同時包含股票名稱和4位數股票代號（括號內）
+
+請提供詳細且結構化的分析。""",
+    "en": """You are a helpful financial assistant capable of analyzing stock metrics, rankings, and industry performance.
+
+You receive structured data for a given industry, including metrics like average ratios, margins, EPS, free cash flow, and a '% Passed' score for each category (balance sheet, income statement, cash flow).
+
+📌 '% Passed' reflects the **percentage of quarters (2020 to present)** where a stock met **all defined conditions** for that category.
+
+However, do **not focus solely on '% Passed'**. Use it as **one factor among many**. Your job is to analyze the stock **holistically** — balancing financial health (e.g. cash/debt, equity), profitability (e.g. margins, EPS), and cash flow strength.
+
+Summarize strengths and weaknesses clearly for each category, and then give a reasoned conclusion about the best stock in the industry.
+
+IMPORTANT: In your conclusion, clearly state which stock is the best choice using this format:
+"Based on the analysis, [StockName] (StockID) is the best stock in this industry because..."
+or "The best stock is [StockName] (StockID) due to..."
+
+Always include both the stock name and its 4-digit ID in parentheses when stating your final recommendation."""
+}
+
+
+# The search index is built on the calling thread from the shared stock info
+# future, never inside _panel_pool, so it cannot wait on a pool slot it occupies.
+# Until the list arrives (at most SEARCH_INDEX_WAIT_SECONDS) questions are routed
+# by industry aliases alone instead of waiting on the full download.
+SEARCH_INDEX_WAIT_SECONDS = 2.0
+
+_search_lock = threading.Lock()
+_search_index = (None, None)  # (stock info future it was built from, index)
+_alias_index = StockSearchIndex(None)
+
+
+def get_search_index():
+    """Stock name/ID/industry index, rebuilt when the shared stock info list refreshes"""
+    global _search_index
+    future = _shared_future(("stock_info",), PANEL_TTL_SECONDS["stock_info"], get_taiwan_stock_info)
+    try:
+        stock_info = future.result(timeout=SEARCH_INDEX_WAIT_SECONDS)
+    except Exception as e:
+        if not isinstance(e, FutureTimeout):
+            print(f"⚠️ Stock list unavailable for search: {e}")
+        return _alias_index
+    with _search_lock:
+        source, index = _search_index
+        if source is not future:
+            index = StockSearchIndex(stock_info)
+            _search_index = (future, index)
+        return index
+
+
+def detect_industry(user_query):
+    """Chinese industry name mentioned in the question, or '' if none matches"""
+    return get_search_index().find_industry(user_query)
+
+
+def route_question(user_query):
+    """
+    (industry, mentioned stocks) for a question. A question that names only a
+    company ("台積電", "2330 vs 2303") is routed to the first company's industry.
+    """
+    index = get_search_index()
+    industry, alias = index.match_industry(user_query)
+    # Company names inside the industry phrase itself are not mentions
+    stocks = index.find_stocks(user_query.lower().replace(alias, " ") if alias else user_query)
+    if not industry and stocks:
+        industry = stocks[0]["industry"]
+    return industry, stocks
+
+
+def preset_question(industry, lang):
+    """The question a preset industry button submits (industry kept in Chinese for detection)"""
+    return f"{get_text('best_stock_in', lang)} {industry}"
+
+
+def build_full_prompt(user_query, tool_result, lang):
+    """Complete single-turn prompt sent to the LLM"""
+    system_prompt = SYSTEM_PROMPTS["zh" if lang == "zh" else "en"]
+    return f"""{system_prompt}
+
+User Question: {user_query}
+
+Industry Analysis Data:
+{tool_result}
+
+Please provide your analysis and recommendation:"""
+
+
+def pick_best_stock(industry):
+    """Deterministic (stock_id, stock_name) pick for an industry from its ranking tables"""
+    rankings = load_industry_rankings(industry)
+    if not rankings:
+        return None, None
+    scores = score_industry(rankings)
+    if scores.empty:
+        return None, None
+    return scores.iloc[0]["stock_id"], scores.iloc[0]["stock_name"]
+
+
+def format_composite_scores(industry, top_n=5):
+    """Composite score table appended to the ranking data so the narrative matches the pick"""
+    scores = score_industry(load_industry_rankings(industry)).head(top_n)
+    if scores.empty:
+        return ""
+    best = scores.iloc[0]
+    return f"""
+Composite score (percentile-weighted across all three categories; bal/inc/cf/score are 0-1):
+{encode_table(scores, precision=3)}
+
+The best stock by composite score is {best['stock_name']} ({best['stock_id']}). Explain this choice in your conclusion.
+"""
+
+
+def build_agent_prompt(user_query, lang):
+    """
+    Returns (full_prompt, industry). `industry` is '' when the question names no
+    known industry, the industry has no ranking data, or it compares several
+    named stocks; only prompts with an industry are worth caching.
+    """
+    industry, stocks = route_question(user_query)
+    if len(stocks) >= 2 and not detect_industry(user_query):
+        # Comparison question: one cross-industry cube lookup instead of several industry dumps
+        tool_result = compare_stocks([s["stock_id"] for s in stocks])
+        tool_result += "\nThe user is comparing these stocks: compare them directly and conclude which is strongest.\n"
+        return build_full_prompt(user_query, tool_result, lang), ""
+    if industry:
+        tool_result = get_best_stock_for_industry(industry, lang)
+        if industry in loaded_industries():
+            tool_result += format_composite_scores(industry)
+        else:
+            industry = ""
+    else:
+        tool_result = f"Could not identify specific industry from query: {user_query}"
+    if stocks:
+        mentioned = ", ".join(f"{s['stock_name']} ({s['stock_id']}, {s['industry'] or 'N/A'})" for s in stocks)
+        tool_result += f"\nStocks mentioned by the user: {mentioned}. Address them specifically.\n"
+    if len(stocks) == 1:
+        # Single-stock question: its own statements, not just its place in the industry tables
+        tool_result += get_financial_statements(stocks[0]["stock_id"])
+    return build_full_prompt(user_query, tool_result, lang), industry
+
+
+def build_industry_prompt(industry, lang):
+    """Full prompt for a preset industry button in the given language"""
+    full_prompt, _ = build_agent_prompt(preset_question(industry, lang), lang)
+    return full_prompt
+
+
+# --- Parallel section analysis ---
+# Each ranking table is analysed by its own concurrent LLM call, then a short
+# synthesis call writes the conclusion from the three sections.
+SECTIONS = {
+    # key: (title key in language_config, table name in the prompt, what to compare)
+    "balance": ("balance_sheet_analysis", "balance sheet",
+                "financial health: cash vs debt, debt-to-equity and retained earnings growth"),
+    "income": ("income_statement_analysis", "income statement",
+               "profitability: gross, interest and net profit margins and EPS"),
+    "cashflow": ("cash_flow_analysis", "cash flow",
+                 "cash generation: free cash flow and net debt change"),
+}
+
+# Answers from section mode are cached separately from single-call answers
+SECTIONS_CACHE_MODEL = f"{AGENT_MODEL}/sections"
+
+# Output caps: the wall-clock time of section mode is the longest section plus the synthesis
+SECTION_MAX_TOKENS = 400
+SYNTHESIS_MAX_TOKENS = 250
+
+SECTION_PROMPT = """You are a financial analyst. Below are the top 5 stocks of the {industry} industry ranked by {table_name} quality.
+'pass' is the % of quarters since 2020 meeting all {table_name} rules; treat it as one factor among many.
+
+Columns:
+{legend}
+
+{table}
+
+Write only the {table_name} part of an industry report: compare the strengths and weaknesses of these stocks on {focus}.
+Keep it to a short paragraph or a compact list. No heading, no introduction and no overall conclusion.
+Do not use subjective phrases such as "I think" and do not use bold formatting.
+{language_instruction}"""
+
+SYNTHESIS_PROMPT = """You are a financial analyst. The user asked: {question}
+
+Section analyses of the {industry} industry:
+
+{sections}
+{composite}
+Write only the conclusion in 3-5 sentences, weighing all three sections. State the recommendation as:
+{conclusion_format}
+Do not repeat the section analyses, do not use subjective phrases and do not use bold formatting.
+{language_instruction}"""
+
+CONCLUSION_FORMATS = {
+    "zh": "「[股票名稱]（股票代號）是該行業最佳股票，因為...」",
+    "en": '"Based on the analysis, [StockName] (StockID) is the best stock in this industry because..."',
+}
+
+_section_pool = ThreadPoolExecutor(max_workers=6, thread_name_prefix="agent-section")
+
+
+def build_section_prompts(industry, lang):
+    """{section key: prompt} with only that section's top-5 table, or {} without ranking data"""
+    rankings = load_industry_rankings(industry)
+    if not rankings:
+        return {}
+    prompts = {}
+    for key, (_, table_name, focus) in SECTIONS.items():
+        table = rankings.get(key)
+        if table is None or table.empty:
+            continue
+        top = table.head(5)
+        prompts[key] = SECTION_PROMPT.format(
+            industry=industry,
+            table_name=table_name,
+            legend=column_legend(top),
+            table=encode_table(top),
+            focus=focus,
+            language_instruction=get_language_instruction(lang)
+        )
+    return prompts
+
+
+def build_synthesis_prompt(user_query, industry, section_texts, lang):
+    """Conclusion prompt over the finished sections plus the composite score table"""
+    sections = "\n\n".join(
+        f"{SECTIONS[key][1].capitalize()}:\n{text.strip()}" for key, text in section_texts.items()
+    )
+    return SYNTHESIS_PROMPT.format(
+        question=user_query,
+        industry=industry,
+        sections=sections,
+        composite=format_composite_scores(industry),
+        conclusion_format=CONCLUSION_FORMATS["zh" if lang == "zh" else "en"],
+        language_instruction=get_language_instruction(lang)
+    )
+
+
+def stream_sections(llm, prompts):
+    """
+    Streams every prompt concurrently. Yields (key, text_so_far, done) in arrival
+    order, so callers on the main thread can render each section as it grows.
+    A failed section ends with a warning line instead of raising.
+    """
+    events = queue.Queue()
+
+    def run(key, prompt):
+        try:
+            for chunk in llm.stream(prompt, max_tokens=SECTION_MAX_TOKENS):
+                if chunk.content:
+                    events.put((key, chunk.content, False))
+        except Exception as e:
+            events.put((key, f"\n\n⚠️ {e}", False))
+        finally:
+            events.put((key, "", True))
+
+    for key, prompt in prompts.items():
+        _section_pool.submit(run, key, prompt)
+
+    texts = dict.fromkeys(prompts, "")
+    remaining = len(prompts)
+    while remaining:
+        key, delta, done = events.get()
+        texts[key] += delta
+        remaining -= done
+        yield key, texts[key], done
+
+
+# --- LangChain resources ---
+def create_llm(api_key, streaming=True, base_url=None):
+    """`base_url` (or OPENAI_BASE_URL) points at any OpenAI-compatible server, e.g. benchmarks/openai_stub.py"""
+    return ChatOpenAI(
+        model_name=AGENT_MODEL,
+        temperature=0,
+        api_key=api_key,
+        base_url=base_url,
+        streaming=streaming
+    )
+
+
+# --- Session memory ---
+# Recent turns kept verbatim for the model, by token count; older turns are summarised
+MEMORY_TOKEN_BUDGET = 1500
+# Turns a session keeps for display; older ones are dropped
+MAX_SESSION_TURNS = 20
+# Turns rendered in full on the Stock Agent page; older ones are collapsed
+EXPANDED_TURNS = 2
+# Earlier questions kept in the summary of turns that left the window
+SUMMARY_QUESTIONS = 10
+
+
+class SessionMemory:
+    """
+    Conversation memory of one session, bounded by MEMORY_TOKEN_BUDGET. The
+    newest turns that fit the budget are kept verbatim; turns pushed out of the
+    window are reduced to their question in a short summary, so memory size and
+    the history sent to the model stay constant however long the session runs.
+    """
+
+    def __init__(self, token_budget=MEMORY_TOKEN_BUDGET):
+        self.token_budget = token_budget
+        self._window = deque()  # (question, answer, tokens), oldest first
+        self._window_tokens = 0
+        self._earlier = deque(maxlen=SUMMARY_QUESTIONS)
+
+    def __len__(self):
+        return len(self._window)
+
+    @property
+    def tokens(self):
+        return self._window_tokens
+
+    def add_turn(self, question, answer):
+        tokens = count_tokens(question, AGENT_MODEL) + count_tokens(answer, AGENT_MODEL)
+        self._window.append((question, answer, tokens))
+        self._window_tokens += tokens
+        # The newest turn always stays, even if it alone exceeds the budget
+        while len(self._window) > 1 and self._window_tokens > self.token_budget:
+            old_question, _, old_tokens = self._window.popleft()
+            self._window_tokens -= old_tokens
+            self._earlier.append(old_question)
+
+    def clear(self):
+        self._window.clear()
+        self._window_tokens = 0
+        self._earlier.clear()
+
+    def summary(self):
+        """One line naming the earlier questions, or ''"""
+        if not self._earlier:
+            return ""
+        return "Earlier in this conversation the user asked: " + "; ".join(self._earlier)
+
+    def messages(self):
+        """Summary plus the windowed turns as chat messages"""
+        messages = [SystemMessage(content=self.summary())] if self._earlier else []
+        for question, answer, _ in self._window:
+            messages.extend([HumanMessage(content=question), AIMessage(content=answer)])
+        return messages
+
+
+def new_session_memory():
+    return SessionMemory()
+
+
+def with_history(prompt, memory):
+    """
+    LLM input for a follow-up question: the session's summary and windowed turns,
+    then `prompt`. Only used for answers that are not cached, since a cached answer
+    must not depend on what else a session asked.
+    """
+    return [*memory.messages(), HumanMessage(content=prompt)]
+
+
+# --- Right panel prefetch ---
+# Price, stock info and the company description for the recommended stock are
+# fetched concurrently as soon as the pick is known. Results are shared across
+# sessions per stock (and language), so reruns and other users reuse them.
+PANEL_TTL_SECONDS = {
+    "price": 3600,
+    "stock_info": 86400,
+    "description": 7 * 86400,
+}
+
+_panel_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="agent-panel")
+_panel_lock = threading.Lock()
+_panel_futures: Dict[tuple, tuple] = {}  # key -> (future, started_at)
+
+# Subjective openings the description prompt forbids but the model sometimes uses
+_SUBJECTIVE_PHRASES = ("我認為", "我覺得", "我想", "我相信")
+
+
+def _shared_future(key, ttl, fn, *args):
+    """Returns the running/finished future for `key`, submitting fn(*args) if none is fresh"""
+    now = time.time()
+    with _panel_lock:
+        entry = _panel_futures.get(key)
+        if entry is not None:
+            future, started_at = entry
+            failed = future.done() and future.exception() is not None
+            if not failed and now - started_at < ttl:
+                return future
+        future = _panel_pool.submit(fn, *args)
+        _panel_futures[key] = (future, now)
+        return future
+
+
+def clean_description(text):
+    """Strip subjective phrases and markdown emphasis from a generated description"""
+    for phrase in _SUBJECTIVE_PHRASES:
+        text = text.replace(phrase, "")
+    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
+    text = re.sub(r'\*(.*?)\*', r'\1', text)
+    return text.strip()
+
+
+def build_description_prompt(stock_id, stock_name, industry, lang):
+    if lang == "zh":
+        if industry:
+            return f"""
+                    簡要描述{stock_name}（台股代號：{stock_id}）的業務內容。
+                    該公司屬於{industry}行業。
+                    請用2-3句話提供簡潔的公司背景和主要業務活動。
+                    重點介紹公司主要業務、產品/服務和市場地位。
+                    
+                    重要規則：
+                    1. 請直接陳述事實，絕對不要使用「我認為」、「我覺得」、「我想」、「我相信」等主觀表達
+                    2. 直接以公司名稱開頭，例如：「{stock_name}是...」
+                    3. 不要使用任何markdown格式（如**粗體**）
+                    
+                    請用繁體中文回答。
+                    """
+        return f"""
+                    簡要描述{stock_name}（台股代號：{stock_id}）的業務內容。
+                    這是一家台灣公司。請用2-3句話提供簡潔的公司背景和主要業務活動。
+                    重點介紹公司主要業務、產品/服務和市場地位。
+                    
+                    重要規則：
+                    1. 請直接陳述事實，絕對不要使用「我認為」、「我覺得」、「我想」、「我相信」等主觀表達
+                    2. 直接以公司名稱開頭，例如：「{stock_name}是...」
+                    3. 不要使用任何markdown格式（如**粗體**）
+                    
+                    請用繁體中文回答。
+                    """
+    if industry:
+        return f"""
+                    Briefly describe what {stock_name} (Taiwan stock ID: {stock_id}) does.
+                    The company is in the {industry} industry sector. 
+                    Provide a concise company background and main business activities in 2-3 sentences.
+                    Focus on what the company does, their main products/services, and market position.
+                    """
+    return f"""
+                    Briefly describe what {stock_name} (Taiwan stock ID: {stock_id}) does.
+                    This is a Taiwanese company. Provide a concise company background and main business activities in 2-3 sentences.
+                    Focus on what the company does, their main products/services, and market position.
+                    """
+
+
+def generate_company_description(llm, stock_id, stock_name, industry, lang):
+    """Stored profile if the batch job has one; otherwise generate live and store it"""
+    profile = get_profile(stock_id, lang)
+    if profile:
+        return profile
+    prompt = build_description_prompt(stock_id, stock_name, industry, lang)
+    profile = clean_description(llm.invoke(prompt).content)
+    save_profile(stock_id, lang, profile, stock_name, industry, AGENT_MODEL)
+    return profile
+
+
+def prefetch_stock_panel(llm, stock_id, stock_name, industry, lang):
+    """
+    Starts (or joins) the three right-panel fetches for a stock and returns
+    {"price": Future, "stock_info": Future, "description": Future}. Safe to call on
+    every rerun: work already running or fresh is reused.
+    """
+    profile = get_profile(stock_id, lang)
+    if profile:
+        # Stored profiles are an instant lookup; no need to go through the pool
+        description_future = Future()
+        description_future.set_result(profile)
+    else:
+        description_future = _shared_future(
+            ("description", stock_id, lang), PANEL_TTL_SECONDS["description"],
+            generate_company_description, llm, stock_id, stock_name, industry, lang
+        )
+    return {
+        "price": _shared_future(("price", stock_id), PANEL_TTL_SECONDS["price"], get_price_30days, stock_id),
+        "stock_info": _shared_future(("stock_info",), PANEL_TTL_SECONDS["stock_info"], get_taiwan_stock_info),
+        "description": description_future,
+    }
@@ -0,0 +1,75 @@
+# agent_tools.py
+
+from typing import List
+
+from finmind_tools import build_industry_ranking_prompt, get_data_version, load_metrics_cube
+from metrics_cube import DEFAULT_COMPARE_QUARTERS, MAX_COMPARE_STOCKS, METRIC_DESCRIPTIONS
+from prompt_encoding import encode_table
+from statement_index import DEFAULT_QUARTERS, read_statements, summarize_statements
+
+# Data tools of the Stock Agent. agent_core.build_agent_prompt calls them directly
+# and puts their text into the prompt: the industry rankings for industry questions,
+# one stock's statements when a question names a single stock, and the metrics
+# cube for comparisons of several stocks.
+
+
+def get_best_stock_for_industry(industry: str, lang: str = "en") -> str:
+    """
+    Determines the best stock for a given industry by analyzing balance sheet,
+    income statement, and cash flow rankings. Passes real ranking tables for LLM evaluation.
+    """
+    return build_industry_ranking_prompt(industry, lang)
+
+
+def get_financial_statements(stock_id: str, start_date: str = "2019-01-01", quarters: int = DEFAULT_QUARTERS) -> str:
+    """
+    Quarterly financial statement summary for one Taiwan stock ID from the local data:
+    revenue, margins, net income, EPS, balance sheet and cash flow items for the latest quarters.
+    """
+    df = read_statements(stock_id, get_data_version())
+    if df.empty:
+        return f"No financial data found for {stock_id}."
+
+    summary = summarize_statements(df, quarters, start_date)
+    if summary.empty:
+        return f"No financial data found for {stock_id} since {start_date}."
+
+    stock_name = df["stock_name"].iloc[0] if "stock_name" in df.columns else stock_id
+    return f"""
+{stock_name} ({stock_id}) quarterly statements. Amounts in TWD millions, eps in TWD.
+Cash flow rows are year-to-date; free_cash_flow = operating_cash_flow - |capex|.
+{encode_table(summary)}
+"""
+
+
+def compare_stocks(stock_ids: List[str], quarters: int = DEFAULT_COMPARE_QUARTERS) -> str:
+    """
+    Compares several Taiwan stocks (any industries) by their stock IDs: pass rates of the
+    balance sheet, income statement and cash flow rules, average metrics and recent
+    quarterly history of margins, EPS, debt-to-equity and free cash flow. Called directly
+    by agent_core.build_agent_prompt for questions naming several stocks.
+    """
+    summary, history, missing = load_metrics_cube().compare(stock_ids, quarters)
+    if summary.empty:
+        return f"No financial data found for {', '.join(missing) or 'the given stocks'}."
+
+    aliases = [c for c in summary.columns if c in METRIC_DESCRIPTIONS]
+    legend = "\n".join(f"{a}: {METRIC_DESCRIPTIONS[a]}" for a in aliases)
+    result = f"""
+Comparison of {len(summary)} stocks. Pass rates cover all quarters since 2020; other
+columns are averages over the latest {len(history.columns) - 1} quarters.
+
+Columns:
+{legend}
+
+Summary:
+{encode_table(summary)}
+
+Quarterly history (rows are metric:stock_id):
+{encode_table(history)}
+"""
+    if missing:
+        result += f"\nNo data for: {', '.join(missing)}\n"
+    if len(stock_ids) > MAX_COMPARE_STOCKS:
+        result += f"\nOnly the first {MAX_COMPARE_STOCKS} stocks were compared.\n"
+    return result
@@ -0,0 +1,208 @@
+"""
+End-to-end latency of the Stock Agent flow against the local OpenAI stub.
+
+Each run replays what modules/2_Stock_Agent.py does for one question:
+ranking tool call, prompt build, answer cache lookup, best-stock pick,
+right-panel prefetch, answer stream and waiting for the panel. --sections
+streams the answer as three concurrent section calls plus a synthesis call
+instead of one call. The LLM is
+benchmarks/openai_stub.py with a known TTFT and token rate, so everything above
+the stub's own schedule is Python overhead.
+
+    python -m benchmarks.agent_latency --industries 光電業 金融業 --runs 3
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import wait
+
+import profile_store
+from agent_core import (
+    AGENT_MODEL, SYNTHESIS_MAX_TOKENS, build_agent_prompt, build_section_prompts, build_synthesis_prompt, create_llm, pick_best_stock,
+    prefetch_stock_panel, preset_question, stream_sections
+)
+from benchmarks.openai_stub import (
+    DEFAULT_COMPLETION_TOKENS, DEFAULT_TOKENS_PER_SECOND, DEFAULT_TTFT, start_stub_server
+)
+from finmind_tools import get_data_version, load_industry_rankings
+from llm_cache import get_cached_answer
+
+def _ms(seconds):
+    return seconds * 1000
+
+
+def _stub_seconds(n_tokens, ttft, tokens_per_second):
+    """Time the stub itself takes to stream n_tokens"""
+    return ttft + max(0, n_tokens - 1) / tokens_per_second
+
+
+def _stream_single(llm, full_prompt, ttft, tokens_per_second):
+    """(first_token_at, tokens, stub seconds on the critical path) for the single-call answer"""
+    first_token_at = None
+    n_tokens = 0
+    for chunk in llm.stream(full_prompt):
+        if chunk.content:
+            n_tokens += 1
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+    return first_token_at, n_tokens, _stub_seconds(n_tokens, ttft, tokens_per_second)
+
+
+def _stream_sections(llm, question, industry, lang, ttft, tokens_per_second):
+    """Same for section mode: the longest concurrent section, then the synthesis call"""
+    first_token_at = None
+    section_texts = {}
+    section_tokens = {}
+    for key, text, done in stream_sections(llm, build_section_prompts(industry, lang)):
+        section_texts[key] = text
+        if not done:
+            section_tokens[key] = section_tokens.get(key, 0) + 1
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+    synthesis_tokens = 0
+    synthesis_prompt = build_synthesis_prompt(question, industry, section_texts, lang)
+    for chunk in llm.stream(synthesis_prompt, max_tokens=SYNTHESIS_MAX_TOKENS):
+        if chunk.content:
+            synthesis_tokens += 1
+    stub_seconds = (_stub_seconds(max(section_tokens.values(), default=0), ttft, tokens_per_second)
+                    + _stub_seconds(synthesis_tokens, ttft, tokens_per_second))
+    return first_token_at, sum(section_tokens.values()) + synthesis_tokens, stub_seconds
+
+
+def run_once(llm, industry, lang, ttft, tokens_per_second, market_data=True, sections=False):
+    """Timings in ms for one question; 'overhead_*' entries are measured minus the stub schedule"""
+    timings = {}
+    start = time.perf_counter()
+
+    t = time.perf_counter()
+    load_industry_rankings(industry)
+    timings["rankings"] = _ms(time.perf_counter() - t)
+
+    t = time.perf_counter()
+    question = preset_question(industry, lang)
+    full_prompt, matched = build_agent_prompt(question, lang)
+    timings["prompt_build"] = _ms(time.perf_counter() - t)
+    if not matched:
+        return None
+
+    t = time.perf_counter()
+    get_cached_answer(full_prompt, AGENT_MODEL, lang, get_data_version())
+    timings["cache_lookup"] = _ms(time.perf_counter() - t)
+
+    t = time.perf_counter()
+    best_id, best_name = pick_best_stock(industry)
+    timings["best_stock"] = _ms(time.perf_counter() - t)
+
+    t = time.perf_counter()
+    panel = prefetch_stock_panel(llm, best_id, best_name, industry, lang)
+    if not market_data:
+        panel = {"description": panel["description"]}
+    timings["panel_submit"] = _ms(time.perf_counter() - t)
+
+    # Answer stream; the panel fetches run meanwhile as in the app
+    stream_start = time.perf_counter()
+    if sections:
+        first_token_at, n_tokens, stub_seconds = _stream_sections(
+            llm, question, industry, lang, ttft, tokens_per_second
+        )
+    else:
+        first_token_at, n_tokens, stub_seconds = _stream_single(llm, full_prompt, ttft, tokens_per_second)
+    stream_end = time.perf_counter()
+    timings["ttft"] = _ms((first_token_at or stream_end) - stream_start)
+    timings["stream"] = _ms(stream_end - stream_start)
+
+    t = time.perf_counter()
+    wait(panel.values())
+    timings["panel_wait"] = _ms(time.perf_counter() - t)
+    timings["end_to_end"] = _ms(time.perf_counter() - start)
+
+    # What the user waits for before the first word vs what the stub imposes
+    timings["ttft_from_question"] = _ms((first_token_at or stream_end) - start)
+    timings["overhead_ttft"] = timings["ttft"] - _ms(ttft)
+    timings["overhead_stream"] = timings["stream"] - _ms(stub_seconds)
+    timings["overhead_pre_stream"] = timings["ttft_from_question"] - timings["ttft"]
+    timings["tokens"] = n_tokens
+    return timings
+
+
+def summarize(results):
+    """{metric: (median, min, max)} over all runs"""
+    keys = [k for k in results[0] if k != "tokens"]
+    return {
+        k: (statistics.median(r[k] for r in results), min(r[k] for r in results), max(r[k] for r in results))
+        for k in keys
+    }
+
+
+def print_summary(title, summary):
+    print(f"\n{title}")
+    print(f"  {'stage':<22}{'median ms':>12}{'min ms':>12}{'max ms':>12}")
+    for key, (median, low, high) in summary.items():
+        print(f"  {key:<22}{median:>12.1f}{low:>12.1f}{high:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stock Agent latency benchmark against a local OpenAI stub')
+    parser.add_argument('--industries', nargs='+', default=['光電業'], help='Industries to ask about')
+    parser.add_argument('--languages', nargs='+', default=['en'], choices=['en', 'zh'])
+    parser.add_argument('--runs', type=int, default=3, help='Runs per industry and language')
+    parser.add_argument('--ttft', type=float, default=DEFAULT_TTFT, help='Stub seconds to first token')
+    parser.add_argument('--tps', type=float, default=DEFAULT_TOKENS_PER_SECOND, help='Stub tokens per second')
+    parser.add_argument('--tokens', type=int, default=DEFAULT_COMPLETION_TOKENS, help='Stub tokens per completion')
+    parser.add_argument('--no-market-data', action='store_true',
+                        help='Do not wait for the FinMind price / stock info fetches')
+    parser.add_argument('--sections', action='store_true',
+                        help='Use parallel section analysis (3 concurrent calls + synthesis)')
+    parser.add_argument('--json', type=str, help='Also write raw timings to this file')
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(ttft=args.ttft, tokens_per_second=args.tps,
+                                         completion_tokens=args.tokens)
+    print(f"🧪 OpenAI stub at {base_url} (TTFT {args.ttft}s, {args.tps:g} tok/s, {args.tokens} tokens)")
+    llm = create_llm("stub-key", base_url=base_url)
+
+    # Stub descriptions must not end up in the real profile store
+    profile_dir = tempfile.mkdtemp(prefix="agent-bench-")
+    profile_store.PROFILE_DB_PATH = os.path.join(profile_dir, "profiles.sqlite")
+
+    raw = {}
+    first_runs = []
+    warm_runs = []
+    for industry in args.industries:
+        for lang in args.languages:
+            for i in range(args.runs):
+                timings = run_once(llm, industry, lang, args.ttft, args.tps,
+                                   not args.no_market_data, args.sections)
+                if timings is None:
+                    print(f"  {industry} ({lang}): no ranking data, skipped")
+                    break
+                raw.setdefault(f"{industry}|{lang}", []).append(timings)
+                (first_runs if i == 0 else warm_runs).append(timings)
+                print(f"  {industry} ({lang}) run {i + 1}: TTFT {timings['ttft_from_question']:.0f} ms, "
+                      f"end to end {timings['end_to_end']:.0f} ms, {timings['tokens']} tokens")
+
+    server.shutdown()
+    if not first_runs:
+        print("❌ No runs completed")
+        return
+
+    # First runs include ranking loads and panel fetches; later runs hit the shared caches
+    print_summary("First run per question (cold)", summarize(first_runs))
+    if warm_runs:
+        print_summary("Repeat runs (warm)", summarize(warm_runs))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "stub": {"ttft": args.ttft, "tokens_per_second": args.tps, "tokens": args.tokens},
+                "runs": raw,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Raw timings written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
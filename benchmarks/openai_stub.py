@@ -0,0 +1,182 @@
+"""
+Local OpenAI-compatible chat completions server for benchmarks and offline runs.
+
+Serves POST /v1/chat/completions (streaming SSE and plain JSON) with a
+configurable time to first token and token rate, so the agent pipeline can be
+timed end to end without an API key or network. Point the app at it with
+OPENAI_BASE_URL=http://127.0.0.1:<port>/v1.
+
+    python -m benchmarks.openai_stub --port 8001 --ttft 0.5 --tps 40
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_TTFT = 0.3
+DEFAULT_TOKENS_PER_SECOND = 50.0
+DEFAULT_COMPLETION_TOKENS = 200
+
+# The agent prompt names the pick ("... is Name (1234)"); echo it like a real answer would
+_PICK_PATTERN = re.compile(r"best stock by composite score is (.+?) \((\w+)\)")
+
+_FILLER = (
+    "The company shows consistent profitability, a conservative balance sheet and "
+    "steady free cash flow across recent quarters, which supports the recommendation."
+).split()
+
+
+def build_completion(prompt, n_tokens):
+    """Deterministic answer text split into `n_tokens` word tokens"""
+    match = _PICK_PATTERN.search(prompt)
+    if match:
+        lead = f"Based on the analysis, {match.group(1)} ({match.group(2)}) is the best stock in this industry because"
+    else:
+        lead = "Based on the data provided,"
+    words = lead.split()
+    while len(words) < n_tokens:
+        words.extend(_FILLER)
+    words = words[:max(1, n_tokens)]
+    return [w if i == 0 else " " + w for i, w in enumerate(words)]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    # Set by make_server
+    ttft = DEFAULT_TTFT
+    tokens_per_second = DEFAULT_TOKENS_PER_SECOND
+    completion_tokens = DEFAULT_COMPLETION_TOKENS
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        received_at = time.perf_counter()
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        prompt = "\n".join(str(m.get("content") or "") for m in body.get("messages", []))
+        # Like the API, max_tokens caps the completion length
+        max_tokens = body.get("max_completion_tokens") or body.get("max_tokens") or self.completion_tokens
+        tokens = build_completion(prompt, min(self.completion_tokens, max_tokens))
+        model = body.get("model", "stub")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+
+        if body.get("stream"):
+            self._stream(tokens, model, completion_id, received_at)
+        else:
+            self._sleep_until(received_at + self.ttft + (len(tokens) - 1) / self.tokens_per_second)
+            self._send_json({
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                    "finish_reason": "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": len(prompt) // 4,
+                    "completion_tokens": len(tokens),
+                    "total_tokens": len(prompt) // 4 + len(tokens),
+                },
+            })
+
+    def _stream(self, tokens, model, completion_id, received_at):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        def chunk(delta, finish_reason=None):
+            return {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+
+        try:
+            self._send_event(chunk({"role": "assistant", "content": ""}))
+            # Token i is due at ttft + i / rate after the request arrived, so slow
+            # writes do not accumulate drift
+            for i, token in enumerate(tokens):
+                self._sleep_until(received_at + self.ttft + i / self.tokens_per_second)
+                self._send_event(chunk({"content": token}))
+            self._send_event(chunk({}, "stop"))
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client stopped reading
+        self.close_connection = True
+
+    def _send_event(self, payload):
+        self.wfile.write(f"data: {json.dumps(payload, ensure_ascii=False)}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+    def _send_json(self, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    @staticmethod
+    def _sleep_until(deadline):
+        remaining = deadline - time.perf_counter()
+        if remaining > 0:
+            time.sleep(remaining)
+
+
+def make_server(host="127.0.0.1", port=0, ttft=DEFAULT_TTFT,
+                tokens_per_second=DEFAULT_TOKENS_PER_SECOND, completion_tokens=DEFAULT_COMPLETION_TOKENS):
+    """ThreadingHTTPServer with its own handler settings; port 0 picks a free port"""
+    handler = type("ConfiguredStubHandler", (StubHandler,), {
+        "ttft": ttft,
+        "tokens_per_second": tokens_per_second,
+        "completion_tokens": completion_tokens,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_stub_server(**kwargs):
+    """Starts the stub on a background thread; returns (server, base_url)"""
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True, name="openai-stub").start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local OpenAI-compatible streaming stub')
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--ttft', type=float, default=DEFAULT_TTFT, help='Seconds to first token')
+    parser.add_argument('--tps', type=float, default=DEFAULT_TOKENS_PER_SECOND, help='Tokens per second')
+    parser.add_argument('--tokens', type=int, default=DEFAULT_COMPLETION_TOKENS, help='Tokens per completion')
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.ttft, args.tps, args.tokens)
+    print(f"🧪 OpenAI stub on http://{args.host}:{args.port}/v1 "
+          f"(TTFT {args.ttft}s, {args.tps:g} tok/s, {args.tokens} tokens)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("👋 Stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Time and peak memory of the CSV loaders and analysis pipelines.
+
+Runs analyze_csv_to_wide_df, the three column analyses (with figures, as the
+industry pages call them), the Dashboard's calculate_industry_rankings and
+preload_all_industry_rankings (cold: empty ranking cache; warm: from disk)
+over the real finmind_data and synthetic datasets from
+benchmarks/synthetic_data.py, generated on first use. Per-file cases are
+summed over every industry CSV; peak memory is the largest increase over one
+call, traced with tracemalloc in a separate pass so it does not skew timings
+(preload peaks cover the main process only, not the ranking workers).
+
+    python -m benchmarks.pipelines --datasets real small --repeat 3
+    python -m benchmarks.pipelines --check            # exit 1 on regressions vs the baseline
+    python -m benchmarks.pipelines --save-baseline    # record this machine's numbers
+"""
+
+import argparse
+import gc
+import glob
+import json
+import logging
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+import finmind_tools
+from benchmarks.synthetic_data import DEFAULT_OUT_DIR, SCALES, generate_dataset
+from finmind_tools import (
+    analyze_csv_to_wide_df, preload_all_industry_rankings, run_buffett_column1_analysis,
+    run_buffett_column2_analysis, run_cashflow_column3_analysis
+)
+from industry_overview import calculate_industry_rankings
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_DATASETS = ["real", "small"]
+
+# Chart titles read st.session_state via get_text; outside `streamlit run` that only logs a warning
+logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").setLevel(logging.ERROR)
+
+# Cases run on each industry's wide frame, in order
+FRAME_CASES = {
+    "run_buffett_column1_analysis": run_buffett_column1_analysis,
+    "run_buffett_column2_analysis": run_buffett_column2_analysis,
+    "run_cashflow_column3_analysis": run_cashflow_column3_analysis,
+}
+
+
+def dataset_dir(name, regenerate=False):
+    """Directory of a dataset: finmind_data for 'real', otherwise a synthetic scale (generated if missing)"""
+    if name == "real":
+        return "finmind_data"
+    out_dir = os.path.join(DEFAULT_OUT_DIR, name)
+    if regenerate or not glob.glob(os.path.join(out_dir, "*.csv")):
+        scale = SCALES[name]
+        print(f"🧪 Generating synthetic '{name}' data ({scale['stocks']:,} stocks x {scale['quarters']} quarters) ...")
+        generate_dataset(out_dir, scale["stocks"], scale["quarters"])
+    return out_dir
+
+
+def measure_time(fn, *args):
+    """(seconds, result)"""
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def measure_peak(fn, *args):
+    """(peak MB allocated above the starting point during the call, result); tracemalloc must be running"""
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    result = fn(*args)
+    return (tracemalloc.get_traced_memory()[1] - before) / 1e6, result
+
+
+def _preload(data_dir, cache_dir, cold):
+    """preload_all_industry_rankings over `data_dir`, with the in-memory rankings cleared first"""
+    finmind_tools.DATA_DIR = data_dir
+    finmind_tools.RANKING_CACHE_DIR = cache_dir
+    finmind_tools.ranking_data_by_industry.clear()
+    if cold:
+        for path in glob.glob(os.path.join(cache_dir, "*", "*.pkl")):
+            os.remove(path)
+    preload_all_industry_rankings(wait=True)
+
+
+def run_pass(data_dir, measure, combine, cache_dir):
+    """One measurement of every case: {case: value}, per-file values combined with `combine`"""
+    values = {}
+
+    def record(case, value):
+        values[case] = combine(values[case], value) if case in values else value
+
+    for csv_file in sorted(glob.glob(os.path.join(data_dir, "*.csv"))):
+        value, wide = measure(analyze_csv_to_wide_df, csv_file)
+        record("analyze_csv_to_wide_df", value)
+        for case, fn in FRAME_CASES.items():
+            value, _ = measure(fn, wide)
+            record(case, value)
+        del wide
+
+    record("calculate_industry_rankings", measure(calculate_industry_rankings, data_dir)[0])
+    record("preload_all_industry_rankings[cold]", measure(_preload, data_dir, cache_dir, True)[0])
+    record("preload_all_industry_rankings[warm]", measure(_preload, data_dir, cache_dir, False)[0])
+    return values
+
+
+def bench_dataset(data_dir, repeat, memory=True):
+    """{case: {"seconds", "min_seconds", "peak_mb"}} for one dataset"""
+    original = (finmind_tools.DATA_DIR, finmind_tools.RANKING_CACHE_DIR)
+    results = {}
+    with tempfile.TemporaryDirectory() as cache_dir, warnings.catch_warnings():
+        # The pipelines warn on empty slices and downcasting; irrelevant for timing
+        warnings.simplefilter("ignore")
+        try:
+            runs = [run_pass(data_dir, measure_time, lambda a, b: a + b, cache_dir) for _ in range(repeat)]
+            for case in runs[0]:
+                samples = [run[case] for run in runs]
+                results[case] = {"seconds": round(statistics.median(samples), 4),
+                                 "min_seconds": round(min(samples), 4)}
+            if memory:
+                tracemalloc.start()
+                try:
+                    peaks = run_pass(data_dir, measure_peak, max, cache_dir)
+                finally:
+                    tracemalloc.stop()
+                for case, peak in peaks.items():
+                    results[case]["peak_mb"] = round(peak, 1)
+        finally:
+            finmind_tools.DATA_DIR, finmind_tools.RANKING_CACHE_DIR = original
+            finmind_tools.ranking_data_by_industry.clear()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """[(key, metric, baseline, current)] for every metric more than `threshold` above the baseline"""
+    regressions = []
+    for key, current in results.items():
+        reference = baseline.get(key)
+        if not reference:
+            continue
+        for metric in ("seconds", "peak_mb"):
+            if metric in current and reference.get(metric):
+                if current[metric] > reference[metric] * (1 + threshold):
+                    regressions.append((key, metric, reference[metric], current[metric]))
+    return regressions
+
+
+def load_baseline(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)["results"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def print_results(dataset, results, baseline):
+    print(f"\n{dataset}")
+    print(f"  {'case':<38}{'median s':>10}{'min s':>10}{'peak MB':>10}{'vs base':>10}")
+    for case, r in results.items():
+        reference = baseline.get(f"{dataset}/{case}", {}).get("seconds")
+        change = f"{(r['seconds'] / reference - 1) * 100:+.0f}%" if reference else "-"
+        peak = f"{r['peak_mb']:.1f}" if "peak_mb" in r else "-"
+        print(f"  {case:<38}{r['seconds']:>10.3f}{r['min_seconds']:>10.3f}{peak:>10}{change:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CSV loaders and analysis pipelines')
+    parser.add_argument('--datasets', nargs='+', default=DEFAULT_DATASETS, choices=["real", *SCALES],
+                        help='real = finmind_data; others are synthetic scales')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed passes per dataset (median reported)')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc pass')
+    parser.add_argument('--regenerate', action='store_true', help='Regenerate synthetic datasets')
+    parser.add_argument('--baseline', type=str, default=BASELINE_PATH, help='Baseline JSON')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Allowed slowdown / memory growth vs the baseline (0.25 = 25%%)')
+    parser.add_argument('--check', action='store_true', help='Exit 1 if any case regresses past the threshold')
+    parser.add_argument('--save-baseline', action='store_true', help='Write these results into the baseline')
+    parser.add_argument('--json', type=str, help='Also write the results to this file')
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    results = {}
+    for dataset in args.datasets:
+        data_dir = dataset_dir(dataset, args.regenerate)
+        dataset_results = bench_dataset(data_dir, max(1, args.repeat), memory=not args.no_memory)
+        print_results(dataset, dataset_results, baseline)
+        results.update({f"{dataset}/{case}": r for case, r in dataset_results.items()})
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"results": results}, f, ensure_ascii=False, indent=2)
+
+    if args.save_baseline:
+        merged = dict(baseline, **results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"threshold": args.threshold, "results": merged}, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"\n💾 Baseline written to {args.baseline}")
+        return
+
+    regressions = compare(results, baseline, args.threshold)
+    if not baseline:
+        print(f"\n⚠️ No baseline at {args.baseline}; run with --save-baseline to create one")
+    elif regressions:
+        print(f"\n❌ {len(regressions)} regression(s) over {args.threshold:.0%}:")
+        for key, metric, reference, current in regressions:
+            print(f"  {key} {metric}: {reference} -> {current}")
+        if args.check:
+            raise SystemExit(1)
+    else:
+        print(f"\n✅ No regressions over {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Cold-start import time of the app's modules, each in a fresh interpreter.
+
+Every case runs in its own `python -c` with the network blocked (DNS lookups
+and socket connects raise and are counted), so a module that logs in or calls
+an API at import time shows up as network attempts instead of hanging on a
+timeout. Each case also lists which heavy dependencies ended up loaded;
+finmind_tools and the Dashboard's imports must not load LangChain or the
+FinMind SDK, and no import may touch the network.
+
+    python -m benchmarks.startup --repeat 5
+    python -m benchmarks.startup --check            # exit 1 on eager heavy imports or network use
+    python -m benchmarks.startup --pages            # also time a full Dashboard run (AppTest)
+"""
+
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencies whose import cost belongs to one feature, not to app start
+HEAVY_MODULES = ("langchain", "langchain_core", "langchain_openai", "openai", "FinMind", "plotly.express")
+
+
+def page_imports(path):
+    """The top-level import statements of a page script, as code for the child"""
+    with open(os.path.join(REPO_DIR, path), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+# name: (code timed in the child, heavy modules it must not load, network allowed)
+CASES = {
+    "finmind_tools": ("import finmind_tools", HEAVY_MODULES, False),
+    "dashboard_imports": (
+        # Read from the Dashboard itself so the case follows its import block; its charts use plotly.express
+        page_imports("Dashboard_儀表板.py"),
+        ("langchain", "langchain_core", "langchain_openai", "openai", "FinMind"), False
+    ),
+    "agent_core": ("import agent_core", (), False),
+}
+
+PAGE_CASES = {
+    # Import plus one complete rerun; the quota card is expected to try the network
+    "dashboard_run": (
+        "from streamlit.testing.v1 import AppTest\n"
+        "AppTest.from_file('Dashboard_儀表板.py', default_timeout=300).run()",
+        ("langchain", "langchain_core", "langchain_openai", "openai", "FinMind"), True
+    ),
+}
+
+_CHILD = r"""
+import json, logging, socket, sys, time, warnings
+warnings.simplefilter("ignore")
+logging.disable(logging.WARNING)
+attempts = []
+def _blocked(target):
+    attempts.append(str(target)[:80])
+    raise OSError("network disabled by benchmarks.startup")
+socket.getaddrinfo = lambda host, *args, **kwargs: _blocked(host)
+socket.socket.connect = lambda self, address: _blocked(address)
+socket.socket.connect_ex = lambda self, address: _blocked(address)
+start = time.perf_counter()
+exec(compile(CODE, "<startup case>", "exec"))
+seconds = time.perf_counter() - start
+print("\n" + json.dumps({
+    "seconds": seconds,
+    "loaded": [m for m in HEAVY if m in sys.modules],
+    "network": attempts,
+}))
+"""
+
+
+def run_case(code):
+    """{"seconds", "loaded", "network"} from one fresh interpreter"""
+    child = f"CODE = {code!r}\nHEAVY = {HEAVY_MODULES!r}\n{_CHILD}"
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run([sys.executable, "-c", child], cwd=REPO_DIR, env=env,
+                            capture_output=True, text=True, timeout=600)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def bench(cases, repeat):
+    """{case: {"seconds", "min_seconds", "loaded", "network", "problems"}}"""
+    results = {}
+    for name, (code, forbidden, network_allowed) in cases.items():
+        try:
+            runs = [run_case(code) for _ in range(repeat)]
+        except (RuntimeError, subprocess.TimeoutExpired) as e:
+            results[name] = {"error": str(e), "problems": [f"failed: {e}"]}
+            continue
+        samples = [run["seconds"] for run in runs]
+        loaded, network = runs[0]["loaded"], runs[0]["network"]
+        problems = [f"imports {m}" for m in loaded if m in forbidden]
+        if network and not network_allowed:
+            problems.append(f"{len(network)} network attempt(s), first {network[0]}")
+        results[name] = {
+            "seconds": round(statistics.median(samples), 3),
+            "min_seconds": round(min(samples), 3),
+            "loaded": loaded,
+            "network": len(network),
+            "problems": problems,
+        }
+    return results
+
+
+def print_results(results):
+    print(f"  {'case':<20}{'median s':>10}{'min s':>10}{'net':>6}  heavy modules loaded")
+    for name, r in results.items():
+        if "error" in r:
+            print(f"  {name:<20}  ❌ {r['error']}")
+            continue
+        print(f"  {name:<20}{r['seconds']:>10.3f}{r['min_seconds']:>10.3f}{r['network']:>6}  "
+              f"{', '.join(r['loaded']) or '-'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark cold-start import time')
+    parser.add_argument('--repeat', type=int, default=3, help='Fresh interpreters per case (median reported)')
+    parser.add_argument('--pages', action='store_true', help='Also time a full Dashboard run with AppTest')
+    parser.add_argument('--check', action='store_true',
+                        help='Exit 1 if a case loads a forbidden heavy module or uses the network')
+    parser.add_argument('--json', type=str, help='Also write the results to this file')
+    args = parser.parse_args()
+
+    cases = dict(CASES, **(PAGE_CASES if args.pages else {}))
+    results = bench(cases, max(1, args.repeat))
+    print_results(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"results": results}, f, ensure_ascii=False, indent=2)
+
+    problems = [(name, p) for name, r in results.items() for p in r["problems"]]
+    if problems:
+        print(f"\n❌ {len(problems)} startup problem(s):")
+        for name, problem in problems:
+            print(f"  {name}: {problem}")
+        if args.check:
+            raise SystemExit(1)
+    else:
+        print("\n✅ No eager heavy imports or network use at import time")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""
+Synthetic FinMind-format data for scale testing.
+
+Writes long-format statement CSVs (date, stock_id, type, value, origin_name,
+stock_name, industry), one per industry like finmind_data/, and optionally a
+month-partitioned daily price store like finmind_data/prices/. Values follow
+simple per-stock models (revenue scale and growth, margins, leverage, capex)
+so the Buffett and cash flow rules pass for some stocks and fail for others,
+and rows can be dropped at configurable rates to mimic missing filings.
+
+    python -m benchmarks.synthetic_data --scale large --out .cache/synthetic/large
+    python -m benchmarks.synthetic_data --stocks 2000 --quarters 40 --missing-rate 0.05
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from price_store import PRICE_COLUMNS
+from stock_search import INDUSTRY_ALIASES
+
+# Named presets; the real finmind_data is about 130 stocks x 26 quarters (350k rows)
+SCALES = {
+    "small": {"stocks": 500, "quarters": 26},
+    "medium": {"stocks": 2000, "quarters": 40},
+    "large": {"stocks": 10000, "quarters": 80},
+}
+
+DEFAULT_OUT_DIR = ".cache/synthetic"
+LAST_QUARTER = "2025-06-30"
+# Stocks generated per block, bounding memory at any scale
+CHUNK_STOCKS = 500
+
+# Statement items read by the analysis pipelines: type -> origin_name
+CORE_TYPES = {
+    "Revenue": "營業收入",
+    "CostOfGoodsSold": "營業成本",
+    "GrossProfit": "營業毛利（毛損）淨額",
+    "OperatingExpenses": "營業費用",
+    "OperatingIncome": "營業利益（損失）",
+    "InterestExpense": "利息費用",
+    "PreTaxIncome": "稅前淨利（淨損）",
+    "TAX": "所得稅費用（利益）",
+    "IncomeAfterTaxes": "本期淨利（淨損）",
+    "EPS": "基本每股盈餘（元）",
+    "CashAndCashEquivalents": "現金及約當現金",
+    "CurrentAssets": "流動資產合計",
+    "TotalAssets": "資產總額",
+    "ShorttermBorrowings": "短期借款",
+    "LongtermBorrowings": "長期借款",
+    "CurrentLiabilities": "流動負債合計",
+    "Liabilities": "負債總額",
+    "RetainedEarnings": "保留盈餘合計",
+    "Equity": "權益總計",
+    "Depreciation": "折舊費用",
+    "CashFlowsFromOperatingActivities": "營業活動之淨現金流入（流出）",
+    "PropertyAndPlantAndEquipment": "取得不動產、廠房及設備",
+    "CashProvidedByInvestingActivities": "投資活動之淨現金流入（流出）",
+    "ProceedsFromLongTermDebt": "舉借長期借款",
+    "RepaymentOfLongTermDebt": "償還長期借款",
+    "CashFlowsProvidedFromFinancingActivities": "籌資活動之淨現金流入（流出）",
+}
+
+# Other items of real reports; "_per" items are percentages of total assets
+PADDING_TYPES = {
+    "AccountsPayable": "應付帳款",
+    "AccountsReceivableNet": "應收帳款淨額",
+    "BillsReceivableNet": "應收票據淨額",
+    "CapitalStock": "股本合計",
+    "CapitalSurplus": "資本公積合計",
+    "CurrentIncomeTaxAssets": "本期所得稅資產",
+    "CurrentProvisions": "負債準備－流動",
+    "CurrentTaxLiabilities": "本期所得稅負債",
+    "DeferredTaxAssets": "遞延所得稅資產",
+    "BondsPayable": "應付公司債",
+    "AmortizationExpense": "攤銷費用",
+    "BadDebts": "呆帳費用、承諾及保證責任準備提存",
+    "CashBalancesBeginningOfPeriod": "期初現金及約當現金餘額",
+    "CashBalancesEndOfPeriod": "期末現金及約當現金餘額",
+    "CashBalancesIncrease": "本期現金及約當現金增加（減少）數",
+    "CashReceivedThroughOperations": "營運產生之現金流入（流出）",
+    "DecreaseInShortTermLoans": "短期借款減少",
+    "EquityAttributableToOwnersOfParent": "淨利（淨損）歸屬於母公司業主",
+}
+PADDING_TYPES.update({
+    f"{name}_per": origin for name, origin in list(PADDING_TYPES.items())[:10]
+})
+PADDING_TYPES.update({
+    f"{name}_per": CORE_TYPES[name]
+    for name in ("CashAndCashEquivalents", "CurrentAssets", "TotalAssets", "ShorttermBorrowings",
+                 "LongtermBorrowings", "CurrentLiabilities", "Liabilities", "RetainedEarnings", "Equity")
+})
+
+# About the number of items per report in the real CSVs
+DEFAULT_EXTRA_TYPES = 100
+
+
+def padding_types(count):
+    """(type, origin_name) of `count` non-core items; real names first, then numbered ones"""
+    items = list(PADDING_TYPES.items())[:count]
+    items += [(f"OtherItem{i}", f"其他項目{i}") for i in range(count - len(items))]
+    return items
+
+
+def industry_names(count):
+    names = list(INDUSTRY_ALIASES)[:count]
+    return names + [f"合成產業{i}" for i in range(count - len(names))]
+
+
+def quarter_dates(quarters, last_quarter=LAST_QUARTER):
+    return pd.date_range(end=last_quarter, periods=quarters, freq="QE").strftime("%Y-%m-%d").to_numpy()
+
+
+def _core_values(rng, n, q):
+    """type -> (stocks, quarters) array of one block of stocks"""
+    t = np.arange(q)
+
+    def per_stock(low, high):
+        return rng.uniform(low, high, n)[:, None]
+
+    def noise(sigma):
+        return rng.lognormal(0, sigma, (n, q))
+
+    base = rng.lognormal(np.log(3e9), 1.2, n)[:, None]  # quarterly revenue scale, TWD
+    season = 1 + 0.08 * np.sin(2 * np.pi * (t + rng.integers(0, 4, n)[:, None]) / 4)
+    revenue = base * np.exp(rng.normal(0.01, 0.02, n)[:, None] * t) * season * noise(0.08)
+
+    gross_margin = np.clip(rng.normal(0.25, 0.12, n)[:, None] + rng.normal(0, 0.03, (n, q)), -0.1, 0.9)
+    gross = revenue * gross_margin
+    opex = revenue * np.clip(rng.normal(0.12, 0.05, n), 0.02, None)[:, None] * noise(0.05)
+    op_income = gross - opex
+
+    short_debt = base * per_stock(0, 1.5) * noise(0.1)
+    long_debt = base * per_stock(0, 2) * noise(0.1)
+    interest = (short_debt + long_debt) * per_stock(0.003, 0.01)
+    pretax = op_income - interest + revenue * rng.normal(0, 0.01, (n, q))
+    tax = np.where(pretax > 0, pretax * 0.2, pretax * 0.05)
+    net = pretax - tax
+    shares = base * per_stock(0.02, 0.2)  # puts EPS in the usual 0-10 TWD range
+
+    retained = base * per_stock(0.5, 4) + np.cumsum(net * 0.5, axis=1)
+    equity = retained + base * per_stock(1, 3)
+    cash = base * per_stock(0.2, 3) * noise(0.15)
+    current_assets = cash + revenue * per_stock(0.6, 1.5)
+    current_liabilities = short_debt + revenue * per_stock(0.3, 0.8)
+    liabilities = current_liabilities + long_debt
+
+    depreciation = revenue * per_stock(0.02, 0.1)
+    operating_cf = net + depreciation + revenue * rng.normal(0, 0.05, (n, q))
+    capex = -revenue * per_stock(0.02, 0.15) * noise(0.3)
+    # Debt is raised and repaid in some quarters only; unreported quarters are NaN
+    proceeds = np.where(rng.random((n, q)) < 0.3, long_debt * rng.uniform(0.05, 0.3, (n, q)), np.nan)
+    repayment = np.where(rng.random((n, q)) < 0.5, -long_debt * rng.uniform(0.05, 0.2, (n, q)), np.nan)
+    dividends = np.where(t % 4 == 2, np.maximum(net, 0) * 2, 0)
+
+    return {
+        "Revenue": revenue,
+        "CostOfGoodsSold": revenue - gross,
+        "GrossProfit": gross,
+        "OperatingExpenses": opex,
+        "OperatingIncome": op_income,
+        "InterestExpense": interest,
+        "PreTaxIncome": pretax,
+        "TAX": tax,
+        "IncomeAfterTaxes": net,
+        "EPS": net / shares,
+        "CashAndCashEquivalents": cash,
+        "CurrentAssets": current_assets,
+        "TotalAssets": equity + liabilities,
+        "ShorttermBorrowings": short_debt,
+        "LongtermBorrowings": long_debt,
+        "CurrentLiabilities": current_liabilities,
+        "Liabilities": liabilities,
+        "RetainedEarnings": retained,
+        "Equity": equity,
+        "Depreciation": depreciation,
+        "CashFlowsFromOperatingActivities": operating_cf,
+        "PropertyAndPlantAndEquipment": capex,
+        "CashProvidedByInvestingActivities": capex + revenue * rng.normal(0, 0.02, (n, q)),
+        "ProceedsFromLongTermDebt": proceeds,
+        "RepaymentOfLongTermDebt": repayment,
+        "CashFlowsProvidedFromFinancingActivities": (
+            np.nan_to_num(proceeds) + np.nan_to_num(repayment) - dividends
+        ),
+    }
+
+
+def statement_block(rng, stock_ids, stock_names, industry, dates, extra_types=DEFAULT_EXTRA_TYPES,
+                    missing_rate=0.02, gap_rate=0.03, late_listing_rate=0.1):
+    """
+    Long-format rows of one block of stocks, ordered by stock then date like the
+    real CSVs. `missing_rate` drops single items, `gap_rate` drops whole
+    stock-quarters and `late_listing_rate` of stocks start reporting partway.
+    """
+    n, q = len(stock_ids), len(dates)
+    values = _core_values(rng, n, q)
+    revenue = values["Revenue"]
+    for name, _ in padding_types(extra_types):
+        if name.endswith("_per"):
+            values[name] = rng.uniform(0, 30, (n, q))
+        else:
+            values[name] = revenue * rng.uniform(0.01, 0.5, n)[:, None] * rng.lognormal(0, 0.1, (n, q))
+
+    origins = dict(CORE_TYPES, **dict(padding_types(extra_types)))
+    types = list(values)
+    stacked = np.stack([values[name] for name in types], axis=-1)  # (stocks, quarters, types)
+    per_share = np.array([name == "EPS" or name.endswith("_per") for name in types])
+    stacked = np.where(per_share, np.round(stacked, 2), np.round(stacked / 1000) * 1000)
+
+    # Whole-quarter gaps and late listings
+    reported = rng.random((n, q)) >= gap_rate
+    first = np.where(rng.random(n) < late_listing_rate, rng.integers(0, max(1, q - 4), n), 0)
+    reported &= np.arange(q)[None, :] >= first[:, None]
+
+    n_types = len(types)
+    flat = stacked.reshape(-1)
+    keep = ~np.isnan(flat) & np.repeat(reported.reshape(-1), n_types) & (rng.random(flat.size) >= missing_rate)
+    rows = np.flatnonzero(keep)
+    stock_idx = rows // (q * n_types)
+    date_idx = (rows // n_types) % q
+    type_idx = rows % n_types
+
+    return pd.DataFrame({
+        "date": pd.Categorical.from_codes(date_idx, dates),
+        "stock_id": pd.Categorical.from_codes(stock_idx, stock_ids),
+        "type": pd.Categorical.from_codes(type_idx, types),
+        "value": flat[rows],
+        # Origin names repeat across items ("X" and "X_per"), so they are not categories
+        "origin_name": np.array([origins[name] for name in types], dtype=object)[type_idx],
+        "stock_name": np.asarray(stock_names, dtype=object)[stock_idx],
+        "industry": industry,
+    })
+
+
+def price_frame(rng, stock_ids, days, end_date=None):
+    """Daily OHLCV rows (PRICE_COLUMNS) over the last `days` business days, as a random walk"""
+    dates = pd.bdate_range(end=end_date or pd.Timestamp.now().normalize(), periods=days)
+    n, d = len(stock_ids), len(dates)
+    start = rng.uniform(10, 600, n)[:, None]
+    close = start * np.exp(np.cumsum(rng.normal(0, 0.02, (n, d)), axis=1))
+    prev_close = np.concatenate([start, close[:, :-1]], axis=1)
+    open_ = prev_close * np.exp(rng.normal(0, 0.005, (n, d)))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.02, (n, d)))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.02, (n, d)))
+    volume = (rng.lognormal(np.log(2e6), 1, n)[:, None] * rng.lognormal(0, 0.3, (n, d))).round()
+
+    df = pd.DataFrame({
+        "date": np.tile(dates.to_numpy(), n),
+        "stock_id": np.repeat(np.asarray(stock_ids, dtype=str), d),
+        "Trading_Volume": volume.reshape(-1),
+        "Trading_money": (volume * close).round().reshape(-1),
+        "open": open_.round(2).reshape(-1),
+        "max": high.round(2).reshape(-1),
+        "min": low.round(2).reshape(-1),
+        "close": close.round(2).reshape(-1),
+        "spread": (close - prev_close).round(2).reshape(-1),
+        "Trading_turnover": (volume / 1000).round().reshape(-1),
+    })
+    return df[PRICE_COLUMNS]
+
+
+def write_prices(df, store_dir):
+    """One parquet per month, the layout of price_store (fresh store, no merging)"""
+    os.makedirs(store_dir, exist_ok=True)
+    for month, part in df.groupby(df["date"].dt.strftime("%Y-%m")):
+        part.sort_values(["stock_id", "date"]).to_parquet(os.path.join(store_dir, f"{month}.parquet"), index=False)
+
+
+def generate_dataset(out_dir, stocks, quarters, industries=14, extra_types=DEFAULT_EXTRA_TYPES,
+                     missing_rate=0.02, gap_rate=0.03, late_listing_rate=0.1, price_days=0, seed=0):
+    """
+    Writes <out_dir>/<industry>.csv for `stocks` stocks spread over `industries`
+    industries, plus <out_dir>/prices/ when price_days > 0. Returns a summary dict.
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    dates = quarter_dates(quarters)
+    stock_ids = np.array([str(1000 + i) for i in range(stocks)])
+    names = industry_names(industries)
+
+    rows = 0
+    files = []
+    for k, industry in enumerate(names):
+        members = stock_ids[k::len(names)]
+        path = os.path.join(out_dir, f"{industry}.csv")
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            for start in range(0, len(members), CHUNK_STOCKS):
+                block_ids = members[start:start + CHUNK_STOCKS]
+                block = statement_block(
+                    rng, block_ids, [f"合成{sid}" for sid in block_ids], industry, dates,
+                    extra_types, missing_rate, gap_rate, late_listing_rate
+                )
+                block.to_csv(f, index=False, header=start == 0)
+                rows += len(block)
+        files.append(path)
+
+    price_rows = 0
+    if price_days > 0:
+        prices = price_frame(rng, stock_ids, price_days)
+        write_prices(prices, os.path.join(out_dir, "prices"))
+        price_rows = len(prices)
+
+    return {
+        "out_dir": out_dir,
+        "stocks": stocks,
+        "quarters": quarters,
+        "industries": len(names),
+        "statement_rows": rows,
+        "statement_bytes": sum(os.path.getsize(p) for p in files),
+        "price_rows": price_rows,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic FinMind-format statements and prices')
+    parser.add_argument('--scale', choices=sorted(SCALES), help='Preset stocks/quarters (overridden by --stocks/--quarters)')
+    parser.add_argument('--stocks', type=int, help='Number of stocks (default 500)')
+    parser.add_argument('--quarters', type=int, help='Quarters of history per stock (default 26)')
+    parser.add_argument('--industries', type=int, default=14, help='Number of industry files')
+    parser.add_argument('--extra-types', type=int, default=DEFAULT_EXTRA_TYPES,
+                        help='Non-core items per report (real data has about 100)')
+    parser.add_argument('--missing-rate', type=float, default=0.02, help='Fraction of single items dropped')
+    parser.add_argument('--gap-rate', type=float, default=0.03, help='Fraction of stock-quarters with no report')
+    parser.add_argument('--late-listing-rate', type=float, default=0.1, help='Fraction of stocks listed partway')
+    parser.add_argument('--price-days', type=int, default=0, help='Business days of daily prices (0 = none)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', type=str, help=f'Output directory (default {DEFAULT_OUT_DIR}/<scale>)')
+    args = parser.parse_args()
+
+    preset = SCALES.get(args.scale or "small")
+    stocks = args.stocks or preset["stocks"]
+    quarters = args.quarters or preset["quarters"]
+    out_dir = args.out or os.path.join(DEFAULT_OUT_DIR, args.scale or f"{stocks}x{quarters}")
+
+    print(f"🧪 Generating {stocks:,} stocks x {quarters} quarters into {out_dir} ...")
+    started = time.perf_counter()
+    summary = generate_dataset(
+        out_dir, stocks, quarters, args.industries, args.extra_types, args.missing_rate,
+        args.gap_rate, args.late_listing_rate, args.price_days, args.seed
+    )
+    print(f"✅ {summary['statement_rows']:,} statement rows in {summary['industries']} files "
+          f"({summary['statement_bytes'] / 1e6:,.1f} MB), {summary['price_rows']:,} price rows "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Whole-market daily price ingestion from FinMind into the local price store.
+
+Pulls TaiwanStockPrice for every stock one trading date at a time (a single bulk
+request per day instead of one request per stock) and appends it to the
+month-partitioned parquet store in price_store.py.
+
+Note: requesting TaiwanStockPrice without a data_id requires a FinMind token
+with whole-market access.
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from finmind_client import FINMIND_TOKEN, FinMindUnavailable, breaker, finmind_get
+from indicators import rebuild_latest_indicators
+from price_store import PRICE_STORE_DIR, append_prices, max_stored_date
+
+
+def download_market_day(trade_date, token=FINMIND_TOKEN):
+    """Download TaiwanStockPrice for all stocks on a single date"""
+    day = trade_date.strftime("%Y-%m-%d")
+    records = finmind_get("TaiwanStockPrice", token=token, start_date=day, end_date=day)
+    return pd.DataFrame(records)
+
+
+def ingest_range(start_date, end_date, store_dir=None, sleep=0.2):
+    """Ingest every weekday in [start_date, end_date]; stops early if FinMind becomes unavailable"""
+    days = pd.bdate_range(start_date, end_date)
+    print(f"🔄 Ingesting {len(days)} trading days ({start_date:%Y-%m-%d} → {end_date:%Y-%m-%d})")
+
+    ingested_days = 0
+    total_rows = 0
+    for i, day in enumerate(days, 1):
+        try:
+            df = download_market_day(day)
+        except FinMindUnavailable as e:
+            print(f"  ❌ {day:%Y-%m-%d}: {e}")
+            if breaker.is_open():
+                print(f"  ⏸️  FinMind circuit open, stopping. Re-run later to resume from {day:%Y-%m-%d}.")
+                break
+            continue
+
+        if df.empty:
+            print(f"  [{i}/{len(days)}] {day:%Y-%m-%d}: no trading data (holiday)")
+        else:
+            rows = append_prices(df, store_dir)
+            ingested_days += 1
+            total_rows += rows
+            print(f"  [{i}/{len(days)}] {day:%Y-%m-%d}: {rows:,} stocks")
+
+        time.sleep(sleep)  # Rate limiting
+
+    print(f"✅ Ingested {ingested_days} days, {total_rows:,} rows into {store_dir or PRICE_STORE_DIR}")
+    return ingested_days
+
+
+def update_indicators(store_dir=None):
+    """Recompute the latest-day indicator table for every stock in the store"""
+    print("📈 Rebuilding latest-day technical indicators...")
+    count = rebuild_latest_indicators(store_dir)
+    print(f"✅ Indicators updated for {count:,} stocks")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ingest whole-market daily prices from FinMind')
+    parser.add_argument('--start', type=str, help='First date to ingest (YYYY-MM-DD)')
+    parser.add_argument('--end', type=str, help='Last date to ingest (YYYY-MM-DD, default: today)')
+    parser.add_argument('--days', type=int, default=120,
+                        help='Lookback when the store is empty and --start is not given (default: 120)')
+    parser.add_argument('--store', type=str, default=None, help=f'Store directory (default: {PRICE_STORE_DIR})')
+    parser.add_argument('--indicators-only', action='store_true',
+                        help='Skip the download and only rebuild latest-day indicators')
+    args = parser.parse_args()
+
+    if args.indicators_only:
+        update_indicators(args.store)
+        return
+
+    end_date = pd.Timestamp(args.end) if args.end else pd.Timestamp(datetime.now().date())
+
+    if args.start:
+        start_date = pd.Timestamp(args.start)
+    else:
+        # Incremental: continue from the day after the newest stored date
+        latest = max_stored_date(args.store)
+        if latest is not None:
+            start_date = latest + timedelta(days=1)
+        else:
+            start_date = end_date - timedelta(days=args.days)
+
+    if start_date > end_date:
+        print(f"📊 Price store already up to date ({end_date:%Y-%m-%d})")
+        return
+
+    if ingest_range(start_date, end_date, args.store):
+        update_indicators(args.store)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+# finmind_client.py
+
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+
+import requests
+from dotenv import load_dotenv
+
+# --- Load Token ---
+load_dotenv()
+FINMIND_TOKEN = os.getenv("FINMIND_TOKEN", "")
+
+FINMIND_DATA_URL = "https://api.finmindtrade.com/api/v4/data"
+FINMIND_USER_INFO_URL = "https://api.web.finmindtrade.com/v2/user_info"
+
+# Seconds before a FinMind request is abandoned (previously there was no timeout at all)
+REQUEST_TIMEOUT = float(os.getenv("FINMIND_TIMEOUT", "10"))
+
+# HTTP / payload status codes FinMind uses when the hourly quota is used up
+QUOTA_STATUS_CODES = (402, 429)
+
+
+class FinMindUnavailable(Exception):
+    """Raised when a FinMind call is skipped by the circuit breaker or fails."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker guarding every FinMind data request.
+
+    - closed: requests go through; consecutive outages are counted
+    - open: requests are rejected immediately so callers serve local/cached data
+    - half_open: after the cool-down, a single probe request is let through;
+      success closes the breaker, failure re-opens it with a longer cool-down
+
+    Quota errors (402/429) open the breaker straight away until the top of the
+    next hour, which is when FinMind resets the hourly quota. Timeouts, connection
+    errors and 5xx responses open it after `failure_threshold` consecutive failures.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=3, reset_timeout=60, max_reset_timeout=900):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._current_timeout = reset_timeout
+        self._opened_until = 0.0
+        self._probe_in_flight = False
+        self._reason = ""
+        self._quota_exhausted = False
+
+    def _refresh(self, now):
+        # Caller holds the lock
+        if self._state == self.OPEN and now >= self._opened_until:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+
+    def allow_request(self):
+        """Return True if a request may go over the network right now."""
+        with self._lock:
+            self._refresh(time.time())
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def is_open(self):
+        """Read-only check that never consumes the half-open probe."""
+        with self._lock:
+            self._refresh(time.time())
+            return self._state == self.OPEN
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._current_timeout = self.reset_timeout
+            self._probe_in_flight = False
+            self._reason = ""
+            self._quota_exhausted = False
+
+    def record_failure(self, reason):
+        """Count an outage-type failure (timeout, connection error, 5xx)."""
+        with self._lock:
+            self._failures += 1
+            self._reason = reason
+            if self._state == self.HALF_OPEN:
+                # Probe failed: back off further before the next probe
+                self._current_timeout = min(self._current_timeout * 2, self.max_reset_timeout)
+                self._open(self._current_timeout)
+            elif self._failures >= self.failure_threshold:
+                self._open(self._current_timeout)
+
+    def release_probe(self):
+        """Give back the half-open probe after a failure that says nothing about FinMind's health."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def trip_quota(self, reason="quota exhausted"):
+        """Open immediately until FinMind's hourly quota resets."""
+        now = datetime.now()
+        next_hour = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        with self._lock:
+            self._reason = reason
+            self._quota_exhausted = True
+            self._open((next_hour - now).total_seconds())
+
+    def _open(self, seconds):
+        # Caller holds the lock
+        self._state = self.OPEN
+        self._opened_until = time.time() + seconds
+        self._probe_in_flight = False
+
+    def status(self):
+        """Snapshot for UI display."""
+        with self._lock:
+            self._refresh(time.time())
+            retry_in = max(0.0, self._opened_until - time.time()) if self._state == self.OPEN else 0.0
+            return {
+                "state": self._state,
+                "reason": self._reason,
+                "quota_exhausted": self._quota_exhausted,
+                "consecutive_failures": self._failures,
+                "retry_in_seconds": int(retry_in),
+            }
+
+
+# One breaker per process: Streamlit sessions share the same FinMind quota
+breaker = CircuitBreaker()
+
+
+def sdk_failure_kind(exc):
+    """
+    'quota', 'outage' or None for an exception raised by the FinMind SDK (DataLoader).
+
+    The SDK retries connection errors itself and then fails on the missing
+    response, and reports HTTP errors as a plain Exception carrying the status code.
+    """
+    if isinstance(exc, (requests.Timeout, requests.ConnectionError)):
+        return "outage"
+    message = str(exc)
+    if isinstance(exc, AttributeError) and "'NoneType' object has no attribute 'json'" in message:
+        return "outage"
+    match = re.search(r"Final response status: (\d{3})", message)
+    if match:
+        status = int(match.group(1))
+        if status in QUOTA_STATUS_CODES:
+            return "quota"
+        if status >= 500:
+            return "outage"
+        return None
+    if "upper limit" in message.lower():
+        return "quota"
+    return None
+
+
+def finmind_get(dataset, token=FINMIND_TOKEN, timeout=None, **params):
+    """
+    Fetches a FinMind v4 dataset through the circuit breaker.
+
+    Returns the list of records from the response payload. Raises FinMindUnavailable
+    without touching the network while the breaker is open, and on quota, outage
+    or payload errors.
+    """
+    if not breaker.allow_request():
+        status = breaker.status()
+        raise FinMindUnavailable(
+            f"FinMind circuit open ({status['reason']}), retry in {status['retry_in_seconds']}s"
+        )
+
+    query = {"dataset": dataset, "token": token}
+    query.update({k: v for k, v in params.items() if v is not None})
+
+    try:
+        response = requests.get(FINMIND_DATA_URL, params=query, timeout=timeout or REQUEST_TIMEOUT)
+    except (requests.Timeout, requests.ConnectionError) as e:
+        breaker.record_failure(type(e).__name__)
+        raise FinMindUnavailable(f"FinMind request failed: {e}") from e
+
+    if response.status_code in QUOTA_STATUS_CODES:
+        breaker.trip_quota(f"HTTP {response.status_code}")
+        raise FinMindUnavailable(f"FinMind quota exhausted (HTTP {response.status_code})")
+    if response.status_code >= 500:
+        breaker.record_failure(f"HTTP {response.status_code}")
+        raise FinMindUnavailable(f"FinMind server error (HTTP {response.status_code})")
+
+    try:
+        response.raise_for_status()
+        data = response.json()
+    except (requests.HTTPError, ValueError) as e:
+        # Bad parameters or a malformed payload are not outages; leave the breaker alone
+        breaker.record_success()
+        raise FinMindUnavailable(f"FinMind request error: {e}") from e
+
+    status = data.get("status")
+    if status in QUOTA_STATUS_CODES:
+        breaker.trip_quota(data.get("msg", f"status {status}"))
+        raise FinMindUnavailable(f"FinMind quota exhausted: {data.get('msg', status)}")
+
+    breaker.record_success()
+    if status != 200:
+        raise FinMindUnavailable(f"FinMind error: {data.get('msg', status)}")
+    return data.get("data", [])
@@ -1,43 +1,97 @@
 # finmind_tools.py
 
 import os
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
 import pandas as pd
 from typing import Dict
 from dotenv import load_dotenv
-from FinMind.data import DataLoader
 import requests
 from typing import Dict
 import numpy as np
-import plotly.express as px
-from langchain.tools import tool
+from finmind_client import (
+    FINMIND_USER_INFO_URL,
+    FinMindUnavailable,
+    breaker,
+    finmind_get,
+    sdk_failure_kind,
+)
+from perf import record_span, span, timed
+from price_store import append_backfill, load_history, stored_date_range
+from prompt_encoding import column_legend, encode_table
+from metrics_cube import MetricsCube
+
+# Directory of the long-format industry CSVs
+DATA_DIR = os.getenv("FINMIND_DATA_DIR", "finmind_data")
 
 # --- Load Token ---
 load_dotenv()
 FINMIND_TOKEN = os.getenv("FINMIND_TOKEN", "")
 
-# --- Initialize API ---
-api = None
-if FINMIND_TOKEN:
-    try:
-        api = DataLoader()
-        api.login_by_token(api_token=FINMIND_TOKEN)
-    except:
-        api = None
+# --- FinMind DataLoader ---
+# Importing FinMind and logging in cost a second or more and a network round trip,
+# so both wait until the first call that needs the SDK (get_all_financials).
+# A failed login is retried after a backoff that doubles up to the maximum.
+API_LOGIN_RETRY_SECONDS = 60
+API_LOGIN_MAX_RETRY_SECONDS = 900
+
+_api = None
+_api_retry_at = 0.0
+_api_backoff = API_LOGIN_RETRY_SECONDS
+_api_lock = threading.Lock()
+
+def get_api():
+    """Logged-in FinMind DataLoader, created on first use; None without a token or while a failed login backs off"""
+    global _api, _api_retry_at, _api_backoff
+    with _api_lock:
+        if _api is None and FINMIND_TOKEN and time.time() >= _api_retry_at:
+            try:
+                from FinMind.data import DataLoader
+                api = DataLoader()
+                api.login_by_token(api_token=FINMIND_TOKEN)
+                _api = api
+            except Exception as e:
+                print(f"❌ FinMind login failed, retrying in {_api_backoff}s: {e}")
+                _api_retry_at = time.time() + _api_backoff
+                _api_backoff = min(_api_backoff * 2, API_LOGIN_MAX_RETRY_SECONDS)
+        return _api
+
+# --- Last known good responses, served while the FinMind circuit is open ---
+_last_good_lock = threading.Lock()
+_last_good_stock_info = None
+_csv_stock_info_cache: Dict[str, pd.DataFrame] = {}
+
+def get_data_version(data_dir=None):
+    """Fingerprint of the local industry CSVs (names, sizes, mtimes) used as a cache key"""
+    import glob
+    import hashlib
+
+    digest = hashlib.sha1()
+    for csv_file in sorted(glob.glob(os.path.join(data_dir or DATA_DIR, "*.csv"))):
+        stat = os.stat(csv_file)
+        digest.update(f"{os.path.basename(csv_file)}:{stat.st_size}:{int(stat.st_mtime)}".encode("utf-8"))
+    return digest.hexdigest()[:12]
 
 # --- FinMind Stock Info ---
 def get_taiwan_stock_info(token=FINMIND_TOKEN):
-    # Try API first
-    url = "https://api.finmindtrade.com/api/v4/data"
-    params = {"dataset": "TaiwanStockInfo", "token": token}
+    global _last_good_stock_info
+
+    # Try API first (skipped instantly while the circuit breaker is open)
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        if data.get("status") == 200:
-            return pd.DataFrame(data["data"])
-    except Exception as e:
+        df = pd.DataFrame(finmind_get("TaiwanStockInfo", token=token))
+        with _last_good_lock:
+            _last_good_stock_info = df
+        return df
+    except FinMindUnavailable as e:
         print(f"❌ Error fetching stock info: {e}")
-    
+
+    with _last_good_lock:
+        if _last_good_stock_info is not None:
+            return _last_good_stock_info
+
     # Fallback: Extract stock info from local CSV files
     try:
         return get_stock_info_from_csv()
@@ -48,10 +102,17 @@ def get_taiwan_stock_info(token=FINMIND_TOKEN):
 def get_stock_info_from_csv():
     """Fallback function to get stock info from local CSV files when API is exhausted"""
     import glob
+
+    # Re-reading ~350k rows on every fallback is what made outages slow; key on the data version
+    version = get_data_version()
+    cached = _csv_stock_info_cache.get(version)
+    if cached is not None:
+        return cached
+
     stock_info_list = []
     
-    # Get all CSV files in finmind_data directory
-    csv_files = glob.glob("finmind_data/*.csv")
+    # Get all CSV files in the data directory
+    csv_files = glob.glob(os.path.join(DATA_DIR, "*.csv"))
     
     for csv_file in csv_files:
         try:
@@ -59,64 +120,146 @@ def get_stock_info_from_csv():
             industry_name = os.path.basename(csv_file).replace('.csv', '')
             
             # Read CSV and get unique stock info
-            df = pd.read_csv(csv_file)
-            if 'stock_id' in df.columns and 'stock_name' in df.columns:
-                unique_stocks = df[['stock_id', 'stock_name']].drop_duplicates()
-                unique_stocks['industry_category'] = industry_name
-                stock_info_list.append(unique_stocks)
+            df = pd.read_csv(csv_file, usecols=['stock_id', 'stock_name'], dtype={'stock_id': str})
+            unique_stocks = df[['stock_id', 'stock_name']].drop_duplicates()
+            unique_stocks['industry_category'] = industry_name
+            stock_info_list.append(unique_stocks)
         except Exception as e:
             print(f"Error reading {csv_file}: {e}")
     
     if stock_info_list:
         combined_df = pd.concat(stock_info_list, ignore_index=True)
+        _csv_stock_info_cache.clear()
+        _csv_stock_info_cache[version] = combined_df
         return combined_df
     
     return pd.DataFrame()
 
-# --- FinMind Price (Last 30 Days) ---
-def get_price_30days(stock_id, token=FINMIND_TOKEN):
-    url = "https://api.finmindtrade.com/api/v4/data"
-    params = {
-        "dataset": "TaiwanStockPrice",
-        "data_id": stock_id,
-        "start_date": (pd.Timestamp.now() - pd.Timedelta(days=30)).date().isoformat(),
-        "token": token
-    }
+# --- FinMind Price History (local store, incremental append) ---
+# Minutes between API checks for a stock whose store is behind (holidays return no rows)
+PRICE_RECHECK_MINUTES = 30
+# Upper bound on remembered checks; entries past PRICE_RECHECK_MINUTES are swept on every check
+PRICE_CHECKS_MAX = 4096
+_price_checked_at: "OrderedDict[tuple, pd.Timestamp]" = OrderedDict()  # oldest check first
+
+def _fetch_prices_into_store(stock_id, start_date, end_date=None, token=FINMIND_TOKEN):
+    """Fetch a date range for one stock from FinMind into the price store's backfill (never the market partitions)"""
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        if data.get("status") == 200 and data["data"]:
-            df = pd.DataFrame(data["data"])
-            return df.dropna(subset=["open", "max", "min", "close"])
-    except Exception as e:
+        records = finmind_get(
+            "TaiwanStockPrice",
+            token=token,
+            data_id=stock_id,
+            start_date=start_date.date().isoformat(),
+            end_date=end_date.date().isoformat() if end_date is not None else None,
+        )
+        if records:
+            append_backfill(pd.DataFrame(records))
+    except FinMindUnavailable as e:
         print(f"❌ Error fetching price: {e}")
-    return pd.DataFrame()
+
+def get_price_history(stock_id, days=30, token=FINMIND_TOKEN):
+    """
+    Daily OHLCV for a stock over any lookback (30d, 1y, 5y...), served from the local
+    price store. Only the days missing from the store are requested from FinMind:
+    days after the stored max date, and days before the stored min date when a
+    longer lookback than what is stored is asked for.
+    """
+    stock_id = str(stock_id)
+    now = pd.Timestamp.now()
+    start = now.normalize() - pd.Timedelta(days=days)
+    latest_trading_day = pd.bdate_range(end=now.normalize(), periods=1)[0]
+
+    # Throttle API checks per (stock, lookback): holidays, new listings and
+    # delisted stocks would otherwise trigger a request on every call
+    key = (stock_id, days)
+    recheck = pd.Timedelta(minutes=PRICE_RECHECK_MINUTES)
+    with _last_good_lock:
+        while _price_checked_at:
+            oldest_key, oldest = next(iter(_price_checked_at.items()))
+            if now - oldest < recheck and len(_price_checked_at) < PRICE_CHECKS_MAX:
+                break
+            del _price_checked_at[oldest_key]
+        if key in _price_checked_at:
+            return load_history(stock_id, days)
+        _price_checked_at[key] = now
+
+    first, last = stored_date_range(stock_id)
+    if first is None:
+        _fetch_prices_into_store(stock_id, start, token=token)
+    else:
+        if first > start + pd.Timedelta(days=7):
+            # Backfill the older part of a longer lookback
+            _fetch_prices_into_store(stock_id, start, first - pd.Timedelta(days=1), token=token)
+        if last < latest_trading_day:
+            _fetch_prices_into_store(stock_id, last + pd.Timedelta(days=1), token=token)
+
+    return load_history(stock_id, days)
+
+# --- FinMind Price (Last 30 Days) ---
+def get_price_30days(stock_id, token=FINMIND_TOKEN):
+    return get_price_history(stock_id, 30, token)
 
 # --- API Usage ---
+def _circuit_quota_info():
+    """Quota info derived from the circuit breaker while it is open for quota reasons"""
+    status = breaker.status()
+    if status["state"] == breaker.OPEN and status["quota_exhausted"]:
+        return {
+            "remaining": 0,
+            "used": None,
+            "limit": 600,
+            "minutes_until_reset": max(1, status["retry_in_seconds"] // 60),
+            "is_exhausted": True
+        }
+    return None
+
+def get_finmind_circuit_status():
+    """Circuit breaker state for UI display ('closed', 'open' or 'half_open')"""
+    return breaker.status()
+
 def get_api_usage(token=FINMIND_TOKEN):
-    url = "https://api.web.finmindtrade.com/v2/user_info"
+    if breaker.is_open():
+        quota = _circuit_quota_info()
+        return f"0 / {quota['limit']}" if quota else "❓ Unknown"
     headers = {"Authorization": f"Bearer {token}"}
     try:
-        response = requests.get(url, headers=headers)
+        response = requests.get(FINMIND_USER_INFO_URL, headers=headers, timeout=5)
         if response.ok:
             data = response.json()
             used = data.get("user_count")
             limit = data.get("api_request_limit")
             if used is not None and limit is not None:
+                if limit - used <= 0:
+                    breaker.trip_quota("user_info reports 0 calls remaining")
                 return f"{limit - used} / {limit}"
         return "❓ Unknown"
     except Exception as e:
         return f"❌ Exception: {e}"
 
+# Seconds a quota answer is reused; every Dashboard and agent rerun asks for it
+QUOTA_CACHE_SECONDS = int(os.getenv("QUOTA_CACHE_SECONDS", "60"))
+_quota_cache: Dict[str, tuple] = {}
+
 def get_api_quota_info(token=FINMIND_TOKEN):
     """Get detailed API quota information including reset time"""
     if not token:
         return None
-        
+
+    # While the circuit is open, answer from its state instead of two more network calls
+    if breaker.is_open():
+        return _circuit_quota_info()
+
+    cached = _quota_cache.get(token)
+    if cached and time.monotonic() - cached[0] < QUOTA_CACHE_SECONDS:
+        return cached[1]
+    info = _fetch_api_quota_info(token)
+    _quota_cache[token] = (time.monotonic(), info)
+    return info
+
+def _fetch_api_quota_info(token):
     # Try method 1: Web API endpoint
     try:
-        url = "https://api.web.finmindtrade.com/v2/user_info"
+        url = FINMIND_USER_INFO_URL
         headers = {"Authorization": f"Bearer {token}"}
         response = requests.get(url, headers=headers, timeout=5)
         if response.ok:
@@ -134,6 +277,10 @@ def get_api_quota_info(token=FINMIND_TOKEN):
                 time_until_reset = next_hour - now
                 
                 minutes_remaining = int(time_until_reset.total_seconds() / 60)
+
+                # Open the circuit now so price/info calls stop hitting an exhausted quota
+                if remaining <= 0:
+                    breaker.trip_quota("user_info reports 0 calls remaining")
                 
                 return {
                     "remaining": remaining,
@@ -147,91 +294,250 @@ def get_api_quota_info(token=FINMIND_TOKEN):
     
     # Try method 2: Test API call to see if token works
     try:
-        url = "https://api.finmindtrade.com/api/v4/data"
-        params = {
-            "dataset": "TaiwanStockInfo",
-            "token": token,
-            "data_id": "2330"  # Test with TSMC
+        finmind_get("TaiwanStockInfo", token=token, data_id="2330", timeout=5)  # Test with TSMC
+        # Token works, but we can't get exact quota - show estimated
+        return {
+            "remaining": 500,  # Estimate
+            "used": 100,
+            "limit": 600,
+            "minutes_until_reset": 30,
+            "is_exhausted": False
         }
-        response = requests.get(url, params=params, timeout=5)
-        if response.ok:
-            data = response.json()
-            if data.get("status") == 200:
-                # Token works, but we can't get exact quota - show estimated
-                return {
-                    "remaining": 500,  # Estimate
-                    "used": 100,
-                    "limit": 600,
-                    "minutes_until_reset": 30,
-                    "is_exhausted": False
-                }
-    except Exception as e:
+    except FinMindUnavailable as e:
         print(f"Method 2 failed: {e}")
     
-    return None
+    return _circuit_quota_info()
 
 
 
 # --- Tool for Stock Agent ---
-# Internal memory store to hold ranking data for each industry
-ranking_data_by_industry: Dict[str, Dict[str, pd.DataFrame]] = {}
+# Internal memory store to hold ranking data for each (industry, data version)
+ranking_data_by_industry: Dict[tuple, Dict[str, pd.DataFrame]] = {}
 
-def register_industry_rankings(industry_name: str, bal_df: pd.DataFrame, inc_df: pd.DataFrame, cf_df: pd.DataFrame):
+def register_industry_rankings(industry_name: str, bal_df: pd.DataFrame, inc_df: pd.DataFrame, cf_df: pd.DataFrame,
+                               data_version: str = None):
     """
     Registers the ranking data for a given industry to be used later by the agent.
+    Tables of older data versions of the same industry are dropped.
     """
-    ranking_data_by_industry[industry_name] = {
+    data_version = data_version or get_data_version()
+    for key in [k for k in ranking_data_by_industry if k[0] == industry_name and k[1] != data_version]:
+        ranking_data_by_industry.pop(key, None)
+    ranking_data_by_industry[(industry_name, data_version)] = {
         "balance": bal_df,
         "income": inc_df,
         "cashflow": cf_df
     }
+    return ranking_data_by_industry[(industry_name, data_version)]
+
+def loaded_industries():
+    """Industries whose rankings for the current data version are in memory"""
+    data_version = get_data_version()
+    return [industry for industry, version in ranking_data_by_industry if version == data_version]
+
+# --- Persisted, parallel ranking computation ---
+# Rankings depend only on the industry CSVs, so they are cached on disk per data
+# version and computed in worker processes (pandas work holds the GIL).
+RANKING_CACHE_DIR = os.getenv("RANKING_CACHE_DIR", ".cache/rankings")
+RANKING_WORKERS = int(os.getenv("RANKING_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_ranking_lock = threading.Lock()
+_ranking_futures: Dict[tuple, Future] = {}
+_ranking_pool = None
+
+def compute_industry_rankings(csv_file: str) -> Dict[str, pd.DataFrame]:
+    """Balance / income / cash-flow ranking tables for one industry CSV (no figures)"""
+    df_original = analyze_csv_to_wide_df(csv_file)
+    return {
+        "balance": run_buffett_column1_analysis(df_original, include_figures=False)["ranking_df"],
+        "income": run_buffett_column2_analysis(df_original, include_figures=False)["ranking_inc"],
+        "cashflow": run_cashflow_column3_analysis(df_original, include_figures=False)["ranking_df"]
+    }
+
+def _industry_csv(industry_name: str) -> str:
+    return os.path.join(DATA_DIR, f"{industry_name}.csv")
+
+def _ranking_cache_path(industry_name: str, data_version: str) -> str:
+    return os.path.join(RANKING_CACHE_DIR, data_version, f"{industry_name}.pkl")
+
+def _get_ranking_pool():
+    # Caller holds _ranking_lock. Spawned workers avoid forking a threaded Streamlit server.
+    global _ranking_pool
+    if _ranking_pool is None:
+        _ranking_pool = ProcessPoolExecutor(
+            max_workers=RANKING_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _ranking_pool
+
+def _on_rankings_computed(industry_name: str, data_version: str, future: Future):
+    """Runs once per computation: register for the agent and persist to disk, then retire the future"""
+    try:
+        if future.cancelled() or future.exception() is not None:
+            return
+        rankings = future.result()
+        register_industry_rankings(industry_name, rankings["balance"], rankings["income"], rankings["cashflow"],
+                                   data_version)
+        path = _ranking_cache_path(industry_name, data_version)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            pd.to_pickle(rankings, tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Could not persist rankings for {industry_name}: {e}")
+    finally:
+        # Only now, so a loader arriving meanwhile finds the future or the published result, never neither
+        with _ranking_lock:
+            _ranking_futures.pop((industry_name, data_version), None)
+
+def _load_cached_rankings(industry_name: str, data_version: str):
+    path = _ranking_cache_path(industry_name, data_version)
+    if not os.path.exists(path):
+        return None
+    try:
+        rankings = pd.read_pickle(path)
+    except Exception as e:
+        print(f"⚠️ Ignoring unreadable ranking cache {path}: {e}")
+        return None
+    return register_industry_rankings(industry_name, rankings["balance"], rankings["income"], rankings["cashflow"],
+                                      data_version)
+
+def _submit_industry_rankings(industry_name: str, data_version: str) -> Future:
+    """Returns the in-flight computation for an industry, starting one only if none is running"""
+    with _ranking_lock:
+        key = (industry_name, data_version)
+        future = _ranking_futures.get(key)
+        if future is None:
+            future = _get_ranking_pool().submit(compute_industry_rankings, _industry_csv(industry_name))
+            _ranking_futures[key] = future
+            future.add_done_callback(lambda f: _on_rankings_computed(industry_name, data_version, f))
+        return future
+
+def load_industry_rankings(industry_name: str, wait: bool = True, data_version: str = None):
+    """
+    Rankings for one industry: memory, then the disk cache for the current data
+    version, then a (shared) worker-process computation. Returns None if the
+    industry has no CSV, or if wait=False and the computation is still running.
+    """
+    data_version = data_version or get_data_version()
+    data = ranking_data_by_industry.get((industry_name, data_version))
+    if data:
+        return data
+    if not os.path.exists(_industry_csv(industry_name)):
+        return None
+
+    data = _load_cached_rankings(industry_name, data_version)
+    if data or not wait:
+        if not data:
+            _submit_industry_rankings(industry_name, data_version)
+        return data
 
-def preload_all_industry_rankings():
+    try:
+        rankings = _submit_industry_rankings(industry_name, data_version).result()
+    except Exception as e:
+        # Worker pool unavailable (e.g. restricted sandbox): compute in this thread instead
+        print(f"⚠️ Ranking worker failed for {industry_name} ({e}); computing in-process")
+        rankings = compute_industry_rankings(_industry_csv(industry_name))
+    # Waiters can wake before the done-callback has registered the result
+    data = ranking_data_by_industry.get((industry_name, data_version))
+    if data is None:
+        data = register_industry_rankings(industry_name, rankings["balance"], rankings["income"],
+                                          rankings["cashflow"], data_version)
+    return data
+
+def preload_all_industry_rankings(wait: bool = True):
     """
     Preloads ranking data for all industries by analyzing their CSV files.
     This ensures the Stock Agent has access to all industry data without needing
     users to visit each industry page first.
+
+    Cached industries load from disk; the rest are computed in parallel worker
+    processes. With wait=False the computations run in the background and the
+    call returns immediately.
     """
     import glob
     
-    # Get all CSV files in finmind_data directory
-    csv_files = glob.glob("finmind_data/*.csv")
-    
-    for csv_file in csv_files:
+    # Get all CSV files in the data directory
+    csv_files = glob.glob(os.path.join(DATA_DIR, "*.csv"))
+    industries = [os.path.basename(f).replace('.csv', '') for f in csv_files]
+    data_version = get_data_version()
+
+    for industry_name in industries:
         try:
-            # Extract industry name from filename (e.g., "綠能環保類.csv" -> "綠能環保類")
-            industry_name = os.path.basename(csv_file).replace('.csv', '')
-            
-            # Skip if already loaded
-            if industry_name in ranking_data_by_industry:
-                continue
-                
-            # Load and analyze the CSV file
-            df_original = analyze_csv_to_wide_df(csv_file)
-            
-            # Run the three analysis pipelines
-            results_bal = run_buffett_column1_analysis(df_original.copy())
-            results_inc = run_buffett_column2_analysis(df_original.copy())  
-            results_cf = run_cashflow_column3_analysis(df_original.copy())
-            
-            # Extract ranking DataFrames
-            ranking_bal = results_bal["ranking_df"]
-            ranking_inc = results_inc["ranking_inc"] 
-            ranking_cf = results_cf["ranking_df"]
-            
-            # Register the rankings
-            register_industry_rankings(industry_name, ranking_bal, ranking_inc, ranking_cf)
-            
+            load_industry_rankings(industry_name, wait=False, data_version=data_version)
         except Exception as e:
             # Silently skip problematic files to avoid breaking the agent
-            print(f"Warning: Could not preload {csv_file}: {e}")
-            continue
+            print(f"Warning: Could not preload {industry_name}: {e}")
+
+    if wait:
+        for industry_name in industries:
+            try:
+                load_industry_rankings(industry_name, wait=True, data_version=data_version)
+            except Exception as e:
+                print(f"Warning: Could not preload {industry_name}: {e}")
+
+# --- Cross-industry metrics cube for stock comparisons ---
+_cube_lock = threading.Lock()
+_metrics_cubes: Dict[str, MetricsCube] = {}
+
+def compute_industry_metrics(csv_file: str) -> pd.DataFrame:
+    """Per-quarter metrics and pass flags of every stock in one industry CSV (one row per stock and date)"""
+    df_original = analyze_csv_to_wide_df(csv_file)
+    bal = run_buffett_column1_analysis(df_original, include_figures=False)["df_wide"]
+    inc = run_buffett_column2_analysis(df_original, include_figures=False)["df_wide"]
+    cf = run_cashflow_column3_analysis(df_original, include_figures=False)["df_wide"]
+    keys = ["stock_id", "date"]
+    df = bal[keys + ["stock_name", "CashOverDebt_Pct", "DebtToEquity", "RetainedEarningsGrowth_Pct",
+                     "PassedAllBuffettRules"]].merge(
+        inc[keys + ["GrossMargin", "InterestMargin", "NetProfitMargin", "EPS", "PassedAllBuffettIncomeRules"]],
+        on=keys, how="outer"
+    ).merge(
+        cf[keys + ["FreeCashFlow", "NetDebtChange", "Passed"]], on=keys, how="outer"
+    )
+    df = df.rename(columns={
+        "PassedAllBuffettRules": "PassedBalance",
+        "PassedAllBuffettIncomeRules": "PassedIncome",
+        "Passed": "PassedCashflow"
+    })
+    df["InterestMargin"] = df["InterestMargin"].replace([np.inf, -np.inf], np.nan)
+    df["industry"] = os.path.basename(csv_file).replace(".csv", "")
+    df["date"] = pd.to_datetime(df["date"]).dt.strftime("%Y-%m-%d")
+    return df
+
+def load_metrics_cube() -> MetricsCube:
+    """Metrics cube for the current data version: memory, then disk, then built from every industry CSV"""
+    import glob
 
-def get_language_instruction():
+    data_version = get_data_version()
+    with _cube_lock:
+        cube = _metrics_cubes.get(data_version)
+        if cube is not None:
+            return cube
+
+        path = os.path.join(RANKING_CACHE_DIR, data_version, "metrics_cube.npz")
+        try:
+            cube = MetricsCube.load(path)
+        except (OSError, ValueError, KeyError):
+            frames = []
+            for csv_file in sorted(glob.glob(os.path.join(DATA_DIR, "*.csv"))):
+                try:
+                    frames.append(compute_industry_metrics(csv_file))
+                except Exception as e:
+                    print(f"Warning: Could not compute metrics for {csv_file}: {e}")
+            cube = MetricsCube.from_frame(pd.concat(frames, ignore_index=True))
+            try:
+                cube.save(path)
+            except OSError as e:
+                print(f"⚠️ Could not persist metrics cube: {e}")
+        _metrics_cubes[data_version] = cube
+        return cube
+
+def get_language_instruction(lang=None):
     """Get language instruction for AI prompts based on current language setting"""
     from language_config import get_current_language
     
-    current_lang = get_current_language()
+    current_lang = lang or get_current_language()
     if current_lang == "zh":
         return "請用繁體中文回答。"
     else:
@@ -312,23 +618,19 @@ def get_chart_titles():
             'operating_cashflow_label': 'Operating Cash Flow'
         }
 
-@tool
-def get_best_stock_for_industry(industry: str) -> str:
+def build_industry_ranking_prompt(industry: str, lang=None) -> str:
     """
-    Determines the best stock for a given industry by analyzing balance sheet,
-    income statement, and cash flow rankings. Passes real ranking tables for LLM evaluation.
+    Top-5 ranking tables for an industry formatted for the LLM.
+    `lang` overrides the session language (for use outside Streamlit).
     """
-    data = ranking_data_by_industry.get(industry)
-    if not data:
-        # Try to preload all industry rankings if not already loaded
-        try:
-            preload_all_industry_rankings()
-            data = ranking_data_by_industry.get(industry)
-        except Exception as e:
-            pass  # Silently continue if preload fails
+    try:
+        # Memory, disk cache, or a (shared) background computation for this industry only
+        data = load_industry_rankings(industry)
+    except Exception as e:
+        data = None  # Silently continue if loading fails
             
     if not data:
-        return f"❌ No ranking data found for '{industry}'. Available industries: {list(ranking_data_by_industry.keys())}"
+        return f"❌ No ranking data found for '{industry}'. Available industries: {loaded_industries()}"
 
     bal = data.get("balance")
     inc = data.get("income")
@@ -337,26 +639,28 @@ def get_best_stock_for_industry(industry: str) -> str:
     if bal is None or inc is None or cf is None:
         return "⚠️ Incomplete ranking data."
 
-    # Convert to Markdown so GPT can "read" it
-    bal_md = bal.head(5).to_markdown(index=False)
-    inc_md = inc.head(5).to_markdown(index=False)
-    cf_md = cf.head(5).to_markdown(index=False)
+    # Compact CSV rows with short column aliases (see prompt_encoding.COLUMN_ALIASES)
+    bal_top, inc_top, cf_top = bal.head(5), inc.head(5), cf.head(5)
+    legend = column_legend(bal_top, inc_top, cf_top)
 
     # Add language instruction
-    language_instruction = get_language_instruction()
+    language_instruction = get_language_instruction(lang)
     
     prompt = f"""
-Based on the following top 5 ranked stocks in the **{industry}** industry,
-analyze which stock is the best overall choice and justify your answer.
+Top 5 ranked stocks in the {industry} industry. Analyze which stock is the best
+overall choice and justify your answer.
+
+Columns:
+{legend}
 
-### Balance Sheet Ranking
-{bal_md}
+Balance sheet:
+{encode_table(bal_top)}
 
-### Income Statement Ranking
-{inc_md}
+Income statement:
+{encode_table(inc_top)}
 
-### Cash Flow Ranking
-{cf_md}
+Cash flow:
+{encode_table(cf_top)}
 
 {language_instruction}
 """
@@ -365,72 +669,56 @@ analyze which stock is the best overall choice and justify your answer.
 
 # --- Get all 3 reports for a stock ---
 def get_all_financials(stock_id: str, start_date: str = "2019-01-01") -> pd.DataFrame:
+    api = get_api()
     if not api:
         print(f"❌ API not initialized. Cannot fetch data for {stock_id}")
         return pd.DataFrame()
+    if not breaker.allow_request():
+        print(f"❌ FinMind circuit open. Skipping financials for {stock_id}")
+        return pd.DataFrame()
     try:
         fin = api.taiwan_stock_financial_statement(stock_id=stock_id, start_date=start_date)
         bal = api.taiwan_stock_balance_sheet(stock_id=stock_id, start_date=start_date)
         cash = api.taiwan_stock_cash_flows_statement(stock_id=stock_id, start_date=start_date)
-
-        fin['report'] = 'IncomeStatement'
-        bal['report'] = 'BalanceSheet'
-        cash['report'] = 'CashFlow'
-
-        df = pd.concat([fin, bal, cash], ignore_index=True)
-        df['stock_id'] = stock_id
-        return df
     except Exception as e:
+        # Only outages count towards opening the circuit, as in finmind_get
+        kind = sdk_failure_kind(e)
+        if kind == "quota":
+            breaker.trip_quota(str(e)[:200])
+        elif kind == "outage":
+            breaker.record_failure(type(e).__name__)
+        else:
+            breaker.release_probe()
         print(f"❌ Error fetching data for {stock_id}: {e}")
         return pd.DataFrame()
+    breaker.record_success()
 
-# --- Get all stock IDs by industry name ---
-def get_stocks_by_industry(industry: str) -> pd.DataFrame:
-    url = "https://api.finmindtrade.com/api/v4/data"
-    params = {
-        "dataset": "TaiwanStockInfo",
-        "token": FINMIND_TOKEN
-    }
-    try:
-        r = requests.get(url, params=params)
-        r.raise_for_status()
-        data = r.json().get("data", [])
-        df = pd.DataFrame(data)
-        return df[df["industry_category"].str.contains(industry, na=False)]
-    except Exception as e:
-        print(f"❌ Error fetching industry stocks: {e}")
-        return pd.DataFrame()
+    fin['report'] = 'IncomeStatement'
+    bal['report'] = 'BalanceSheet'
+    cash['report'] = 'CashFlow'
 
+    df = pd.concat([fin, bal, cash], ignore_index=True)
+    df['stock_id'] = stock_id
+    return df
 
+# The Stock Agent's data tools moved to agent_tools; importing them from here still works
+_AGENT_TOOLS = ("get_best_stock_for_industry", "get_financial_statements", "compare_stocks")
 
-# --- Tool wrapper for LLM agent (LangChain use) ---
-from langchain_core.tools import tool
+def __getattr__(name):
+    if name in _AGENT_TOOLS:
+        import agent_tools
+        return getattr(agent_tools, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-@tool
-def get_financial_statements(stock_id: str, start_date: str = "2019-01-01") -> str:
-    """
-    Fetches Taiwan financial statements for a stock ID and returns a summary of all available metrics.
-    Displays both English code (type) and original Chinese name (origin_name).
-    """
-    df = get_financial_statements(stock_id, start_date)
-    if df.empty:
-        return f"No financial data found for {stock_id} since {start_date}."
-
-    summary = ""
-    for date in sorted(df["date"].unique(), reverse=True):
-        sub = df[df["date"] == date]
-        if sub.empty:
-            continue
-
-        summary += f"\n📅 Date: {date}\n"
-        for _, row in sub.iterrows():
-            try:
-                value_fmt = f"{row['value']:.2f}" if isinstance(row['value'], (int, float)) else str(row['value'])
-                summary += f"• {row['type']} ({row['origin_name']}): {value_fmt}\n"
-            except:
-                continue
+# --- Get all stock IDs by industry name ---
+def get_stocks_by_industry(industry: str) -> pd.DataFrame:
+    # Goes through get_taiwan_stock_info so an open circuit falls back to local data
+    df = get_taiwan_stock_info(FINMIND_TOKEN)
+    if df.empty or "industry_category" not in df.columns:
+        print(f"❌ Error fetching industry stocks for {industry}")
+        return pd.DataFrame()
+    return df[df["industry_category"].str.contains(industry, na=False)]
 
-    return summary if summary else "No recognized financial metrics found."
 
 
 def analyze_csv_to_wide_df(csv_path: str) -> pd.DataFrame:
@@ -448,27 +736,30 @@ def analyze_csv_to_wide_df(csv_path: str) -> pd.DataFrame:
         raise FileNotFoundError(f"❌ File not found: {csv_path}")
 
     # Step 1: Load and preprocess
-    df = pd.read_csv(csv_path)
-    df['date'] = pd.to_datetime(df['date'])
+    with span("load.read_csv"):
+        df = pd.read_csv(csv_path)
+        df['date'] = pd.to_datetime(df['date'])
 
     # Step 2: Drop duplicate rows, allowing 'industry' to vary
     columns_except_industry = [col for col in df.columns if col != 'industry']
     df = df.drop_duplicates(subset=columns_except_industry)
 
     # Step 3: Pivot to wide format
-    df_wide = df.pivot_table(
-        index=['date', 'stock_id', 'stock_name', 'industry'],
-        columns='type',
-        values='value',
-        aggfunc='first'
-    ).reset_index()
-    df_wide.columns.name = None
+    with span("load.pivot"):
+        df_wide = df.pivot_table(
+            index=['date', 'stock_id', 'stock_name', 'industry'],
+            columns='type',
+            values='value',
+            aggfunc='first'
+        ).reset_index()
+        df_wide.columns.name = None
 
     return df_wide
 
 
 # Tool for Column 1 for Balance_Sheet
-def run_buffett_column1_analysis(df: pd.DataFrame) -> Dict[str, object]:
+@timed("analysis.balance")
+def run_buffett_column1_analysis(df: pd.DataFrame, include_figures: bool = True) -> Dict[str, object]:
     """
     Runs full Buffett-style analysis pipeline used in Streamlit Column 1:
     - Applies Buffett rules
@@ -476,6 +767,7 @@ def run_buffett_column1_analysis(df: pd.DataFrame) -> Dict[str, object]:
     - Filters date >= 2020
     - Prepares heatmap data and top 5 stock trends
     - Returns all data + plotly figures for rendering
+      (include_figures=False skips the figures when only the rankings are needed)
     """
 
     # --- Step 1: Apply Buffett Rules ---
@@ -562,7 +854,12 @@ def run_buffett_column1_analysis(df: pd.DataFrame) -> Dict[str, object]:
     ['stock_id', 'stock_name', '% Passed',
      'Avg % Cash/Debt', 'Avg Debt/Equity', 'Avg % Ret. Earnings Growth']
 ]
+    if not include_figures:
+        return {"df_wide": df, "df_top5": df_top5, "ranking_df": ranking_df}
+
     # --- Step 7: Plotly Charts ---
+    figures_started = time.perf_counter()
+    import plotly.express as px
     fig_heat = px.imshow(
         heat_matrix,
         color_continuous_scale=[[0.0, "#ffffff"], [1.0, "#006400"]],
@@ -610,6 +907,7 @@ def run_buffett_column1_analysis(df: pd.DataFrame) -> Dict[str, object]:
     )
     fig4.add_hline(y=0, line_dash="dash", line_color="red", annotation_text="Threshold: > 0")
     fig4.update_layout(template='plotly_white')
+    record_span("figures.balance", figures_started)
 
     return {
         "df_wide": df,
@@ -623,10 +921,12 @@ def run_buffett_column1_analysis(df: pd.DataFrame) -> Dict[str, object]:
     }
 
 # Tool for Column 2 for Income_Statement
-def run_buffett_column2_analysis(df: pd.DataFrame) -> dict:
+@timed("analysis.income")
+def run_buffett_column2_analysis(df: pd.DataFrame, include_figures: bool = True) -> dict:
     """
     Applies Buffett-style income statement rules to a wide-format DataFrame.
-    Returns charts and rankings for Streamlit Column 2.
+    Returns charts and rankings for Streamlit Column 2
+    (figures are None when include_figures=False).
 
     Rules:
     - Gross Margin > 30%
@@ -634,7 +934,6 @@ def run_buffett_column2_analysis(df: pd.DataFrame) -> dict:
     - Net Profit Margin > 5%
     - EPS positive and YoY growth
     """
-    import plotly.express as px
     import pandas as pd
     import numpy as np
 
@@ -700,19 +999,24 @@ def run_buffett_column2_analysis(df: pd.DataFrame) -> dict:
     sorted_labels = pass_rate_df.sort_values(by='PassRate', ascending=False)['stock_label']
     heat_matrix = heat_matrix.loc[sorted_labels]
 
-    fig_income = px.imshow(
-        heat_matrix,
-        color_continuous_scale=[[0.0, "#ffffff"], [1.0, "#006400"]],
-        zmin=0, zmax=1,
-        aspect='auto'
-    )
-    fig_income.update_coloraxes(showscale=False)
-    fig_income.update_layout(
-        xaxis_title="Date",
-        yaxis_title="Stock + % Passed",
-        height=800,
-        template="plotly_white"
-    )
+    fig_income = fig1 = fig2 = fig3 = fig4 = None
+    if include_figures:
+        figures_started = time.perf_counter()
+        import plotly.express as px
+        fig_income = px.imshow(
+            heat_matrix,
+            color_continuous_scale=[[0.0, "#ffffff"], [1.0, "#006400"]],
+            zmin=0, zmax=1,
+            aspect='auto'
+        )
+        fig_income.update_coloraxes(showscale=False)
+        fig_income.update_layout(
+            xaxis_title="Date",
+            yaxis_title="Stock + % Passed",
+            height=800,
+            template="plotly_white"
+        )
+        record_span("figures.income", figures_started)
 
     # --- Top 5 Trend Charts ---
     top_ids = pass_rate_df.sort_values(by='PassRate', ascending=False).head(5)['stock_id'].tolist()
@@ -720,19 +1024,23 @@ def run_buffett_column2_analysis(df: pd.DataFrame) -> dict:
     df_top5 = df[df['stock_id'].isin(top_ids)].copy()
     df_top5['stock_name'] = df_top5['stock_id'].map(top_names)
 
-    # Get language-aware chart titles
-    titles = get_chart_titles()
+    if include_figures:
+        figures_started = time.perf_counter()
+        import plotly.express as px
+        # Get language-aware chart titles
+        titles = get_chart_titles()
     
-    fig1 = px.line(df_top5, x='date', y='GrossMargin', color='stock_name', title=titles['chart1_income'])
-    fig2 = px.line(df_top5, x='date', y='InterestMargin', color='stock_name', title=titles['chart2_income'])
-    fig3 = px.line(df_top5, x='date', y='NetProfitMargin', color='stock_name', title=titles['chart3_income'])
-    fig4 = px.line(df_top5, x='date', y='EPS', color='stock_name', title=titles['chart4_income'])
-
-    # Add threshold lines
-    fig1.add_hline(y=0.30, line_dash="dash", line_color="red", annotation_text="Threshold: > 30%")
-    fig2.add_hline(y=0.25, line_dash="dash", line_color="red", annotation_text="Threshold: < 25%")
-    fig3.add_hline(y=0.05, line_dash="dash", line_color="red", annotation_text="Threshold: > 5%")
-    fig4.add_hline(y=0, line_dash="dash", line_color="red", annotation_text="Threshold: EPS > 0 & ↑")
+        fig1 = px.line(df_top5, x='date', y='GrossMargin', color='stock_name', title=titles['chart1_income'])
+        fig2 = px.line(df_top5, x='date', y='InterestMargin', color='stock_name', title=titles['chart2_income'])
+        fig3 = px.line(df_top5, x='date', y='NetProfitMargin', color='stock_name', title=titles['chart3_income'])
+        fig4 = px.line(df_top5, x='date', y='EPS', color='stock_name', title=titles['chart4_income'])
+
+        # Add threshold lines
+        fig1.add_hline(y=0.30, line_dash="dash", line_color="red", annotation_text="Threshold: > 30%")
+        fig2.add_hline(y=0.25, line_dash="dash", line_color="red", annotation_text="Threshold: < 25%")
+        fig3.add_hline(y=0.05, line_dash="dash", line_color="red", annotation_text="Threshold: > 5%")
+        fig4.add_hline(y=0, line_dash="dash", line_color="red", annotation_text="Threshold: EPS > 0 & ↑")
+        record_span("figures.income", figures_started)
 
     # --- Ranking Table ---
 # --- Ranking Table (Colab-style) ---
@@ -781,8 +1089,8 @@ def run_buffett_column2_analysis(df: pd.DataFrame) -> dict:
     }
 
 #Tool for Column 3 for Cashflow
-def run_cashflow_column3_analysis(df: pd.DataFrame) -> dict:
-    import plotly.express as px
+@timed("analysis.cashflow")
+def run_cashflow_column3_analysis(df: pd.DataFrame, include_figures: bool = True) -> dict:
     import pandas as pd
 
     df = df.copy()
@@ -829,19 +1137,24 @@ def run_cashflow_column3_analysis(df: pd.DataFrame) -> dict:
     sorted_labels = pass_rate_df.sort_values(by='PassRate', ascending=False)['stock_label']
     heat_matrix = heat_matrix.loc[sorted_labels]
 
-    fig_heat = px.imshow(
-        heat_matrix,
-        color_continuous_scale=[[0.0, "#ffffff"], [1.0, "#006400"]],
-        zmin=0, zmax=1,
-        aspect='auto'
-    )
-    fig_heat.update_coloraxes(showscale=False)
-    fig_heat.update_layout(
-        xaxis_title="Date",
-        yaxis_title="Stock + % Passed",
-        height=800,
-        template="plotly_white"
-    )
+    fig_heat = fig1 = fig2 = fig3 = fig4 = fig5 = fig6 = None
+    if include_figures:
+        figures_started = time.perf_counter()
+        import plotly.express as px
+        fig_heat = px.imshow(
+            heat_matrix,
+            color_continuous_scale=[[0.0, "#ffffff"], [1.0, "#006400"]],
+            zmin=0, zmax=1,
+            aspect='auto'
+        )
+        fig_heat.update_coloraxes(showscale=False)
+        fig_heat.update_layout(
+            xaxis_title="Date",
+            yaxis_title="Stock + % Passed",
+            height=800,
+            template="plotly_white"
+        )
+        record_span("figures.cashflow", figures_started)
 
     # --- Top 5 Stocks ---
     top_ids = pass_rate_df.sort_values(by='PassRate', ascending=False).head(5)['stock_id'].tolist()
@@ -850,15 +1163,19 @@ def run_cashflow_column3_analysis(df: pd.DataFrame) -> dict:
     df_top5['stock_name'] = df_top5['stock_id'].map(top_names)
 
     # --- Trend Charts ---
-    # Get language-aware chart titles
-    titles = get_chart_titles()
+    if include_figures:
+        figures_started = time.perf_counter()
+        import plotly.express as px
+        # Get language-aware chart titles
+        titles = get_chart_titles()
     
-    fig1 = px.line(df_top5, x='date', y='FreeCashFlow', color='stock_name', title=titles['chart1_cashflow'])
-    fig2 = px.line(df_top5, x='date', y='NetDebtChange', color='stock_name', title=titles['chart2_cashflow'])
-    fig3 = px.line(df_top5, x='date', y='CashFlowsFromOperatingActivities', color='stock_name', title=titles['chart3_cashflow'])
-    fig4 = px.line(df_top5, x='date', y='PropertyAndPlantAndEquipment', color='stock_name', title=titles['chart4_cashflow'])
-    fig5 = px.line(df_top5, x='date', y='DebtIssued', color='stock_name', title=titles['chart5_cashflow'])
-    fig6 = px.line(df_top5, x='date', y='DebtRepaid', color='stock_name', title=titles['chart6_cashflow'])
+        fig1 = px.line(df_top5, x='date', y='FreeCashFlow', color='stock_name', title=titles['chart1_cashflow'])
+        fig2 = px.line(df_top5, x='date', y='NetDebtChange', color='stock_name', title=titles['chart2_cashflow'])
+        fig3 = px.line(df_top5, x='date', y='CashFlowsFromOperatingActivities', color='stock_name', title=titles['chart3_cashflow'])
+        fig4 = px.line(df_top5, x='date', y='PropertyAndPlantAndEquipment', color='stock_name', title=titles['chart4_cashflow'])
+        fig5 = px.line(df_top5, x='date', y='DebtIssued', color='stock_name', title=titles['chart5_cashflow'])
+        fig6 = px.line(df_top5, x='date', y='DebtRepaid', color='stock_name', title=titles['chart6_cashflow'])
+        record_span("figures.cashflow", figures_started)
 
     # --- Ranking Table ---
     ranking_df = df_top5.groupby(['stock_id', 'stock_name'])[
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Batch generation of bilingual company profiles for every stock in the universe.
+
+Profiles are written to the SQLite store in profile_store.py as each one
+completes, so an interrupted run resumes where it stopped (stocks already
+stored are skipped unless --force is given). Requests run concurrently on the
+async OpenAI client, limited by --concurrency.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+
+from agent_core import AGENT_MODEL, build_description_prompt, clean_description
+from finmind_tools import get_taiwan_stock_info
+from profile_store import PROFILE_DB_PATH, existing_profile_keys, profile_count, save_profile
+
+MAX_ATTEMPTS = 3
+
+
+def load_universe(industries=None, limit=None):
+    """One row per stock: stock_id, stock_name, industry_category"""
+    df = get_taiwan_stock_info()
+    if df.empty:
+        return df
+    df = df.drop_duplicates(subset="stock_id")[["stock_id", "stock_name", "industry_category"]]
+    if industries:
+        df = df[df["industry_category"].isin(industries)]
+    df = df.sort_values("stock_id")
+    return df.head(limit) if limit else df
+
+
+async def generate_profile(client, semaphore, model, stock, lang):
+    """Returns the cleaned profile text; retries transient errors with backoff"""
+    prompt = build_description_prompt(stock["stock_id"], stock["stock_name"], stock["industry_category"], lang)
+    async with semaphore:
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                response = await client.chat.completions.create(
+                    model=model,
+                    temperature=0,
+                    messages=[{"role": "user", "content": prompt}]
+                )
+                return clean_description(response.choices[0].message.content or "")
+            except Exception as e:
+                if attempt == MAX_ATTEMPTS:
+                    raise
+                print(f"  ⚠️ {stock['stock_id']} ({lang}) attempt {attempt} failed: {e}")
+                await asyncio.sleep(2 ** attempt)
+
+
+async def run_batch(jobs, model, concurrency, db_path=None):
+    """Generates every (stock, lang) job; returns (done, failed) counts"""
+    client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    semaphore = asyncio.Semaphore(concurrency)
+    total = len(jobs)
+    done = failed = 0
+
+    async def run_one(stock, lang):
+        nonlocal done, failed
+        try:
+            profile = await generate_profile(client, semaphore, model, stock, lang)
+            # Saved immediately so a crash loses at most the in-flight requests
+            save_profile(stock["stock_id"], lang, profile, stock["stock_name"],
+                         stock["industry_category"], model, db_path)
+            done += 1
+            print(f"  [{done + failed}/{total}] ✅ {stock['stock_id']} {stock['stock_name']} ({lang})")
+        except Exception as e:
+            failed += 1
+            print(f"  [{done + failed}/{total}] ❌ {stock['stock_id']} ({lang}): {e}")
+
+    await asyncio.gather(*(run_one(stock, lang) for stock, lang in jobs))
+    await client.close()
+    return done, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate bilingual company profiles for all stocks')
+    parser.add_argument('--languages', nargs='+', default=['en', 'zh'], choices=['en', 'zh'],
+                        help='Languages to generate (default: en zh)')
+    parser.add_argument('--industries', nargs='+', help='Only these industry categories')
+    parser.add_argument('--limit', type=int, help='Only the first N stocks (by stock_id)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent OpenAI requests (default: 8)')
+    parser.add_argument('--model', type=str, default=AGENT_MODEL, help=f'OpenAI model (default: {AGENT_MODEL})')
+    parser.add_argument('--force', action='store_true', help='Regenerate profiles that already exist')
+    parser.add_argument('--db', type=str, default=None, help=f'Profile database (default: {PROFILE_DB_PATH})')
+    args = parser.parse_args()
+
+    load_dotenv()
+    if not os.getenv("OPENAI_API_KEY"):
+        print("❌ OPENAI_API_KEY not found. Please check your .env file.")
+        return
+
+    universe = load_universe(args.industries, args.limit)
+    if universe.empty:
+        print("❌ No stock list available")
+        return
+
+    existing = set() if args.force else existing_profile_keys(args.db)
+    stocks = universe.to_dict("records")
+    jobs = [
+        (stock, lang)
+        for stock in stocks for lang in args.languages
+        if (str(stock["stock_id"]), lang) not in existing
+    ]
+    print(f"📋 {len(stocks)} stocks × {len(args.languages)} languages, {len(jobs)} profiles to generate "
+          f"({len(stocks) * len(args.languages) - len(jobs)} already stored)")
+    if not jobs:
+        return
+
+    start = time.time()
+    done, failed = asyncio.run(run_batch(jobs, args.model, args.concurrency, args.db))
+    print(f"✅ Generated {done}, failed {failed} in {time.time() - start:.0f}s "
+          f"({profile_count(args.db)} profiles stored). Re-run to retry failures.")
+
+
+if __name__ == "__main__":
+    main()
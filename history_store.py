@@ -0,0 +1,144 @@
+# history_store.py
+
+import os
+import re
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from functools import lru_cache
+
+# Stock Agent questions and answers across sessions and reloads
+HISTORY_DB_PATH = os.getenv("HISTORY_DB_PATH", "history/chat_history.sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chat_sessions (
+    session_id TEXT PRIMARY KEY,
+    started_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chat_turns (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id      TEXT NOT NULL REFERENCES chat_sessions (session_id),
+    created_at      TEXT NOT NULL,
+    question        TEXT NOT NULL,
+    question_key    TEXT NOT NULL,
+    answer          TEXT NOT NULL,
+    lang            TEXT,
+    model           TEXT,
+    data_version    TEXT,
+    industry        TEXT,
+    best_stock_id   TEXT,
+    best_stock_name TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_chat_turns_reuse ON chat_turns (question_key, lang, model, data_version);
+CREATE INDEX IF NOT EXISTS idx_chat_turns_industry ON chat_turns (industry, created_at);
+CREATE INDEX IF NOT EXISTS idx_chat_turns_stock ON chat_turns (best_stock_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_chat_turns_created ON chat_turns (created_at);
+CREATE INDEX IF NOT EXISTS idx_chat_turns_session ON chat_turns (session_id, id);
+"""
+
+_COLUMNS = ("id", "session_id", "created_at", "question", "answer", "lang", "model",
+            "data_version", "industry", "best_stock_id", "best_stock_name")
+
+
+def question_key(question):
+    """Whitespace- and case-insensitive form of a question, used for reuse lookups"""
+    return re.sub(r"\s+", " ", str(question)).strip().lower()
+
+
+@lru_cache(maxsize=None)
+def _init_db(path):
+    """Creates the file, WAL mode and schema once per process and path"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with closing(sqlite3.connect(path, timeout=10)) as conn:
+        # WAL lets sessions read while another session writes; the mode is stored in the file
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+
+
+def _connect(db_path=None):
+    path = db_path or HISTORY_DB_PATH
+    _init_db(path)
+    return sqlite3.connect(path, timeout=10)
+
+
+def _row_dict(row):
+    return dict(zip(_COLUMNS, row))
+
+
+def save_turn(session_id, question, answer, lang, model, data_version,
+              industry=None, best_stock_id=None, best_stock_name=None, db_path=None):
+    """Appends one question/answer to a session; returns the turn id"""
+    if not answer:
+        return None
+    now = datetime.now().isoformat(timespec="seconds")
+    with closing(_connect(db_path)) as conn, conn:
+        conn.execute("INSERT OR IGNORE INTO chat_sessions (session_id, started_at) VALUES (?, ?)",
+                     (session_id, now))
+        cursor = conn.execute(
+            "INSERT INTO chat_turns (session_id, created_at, question, question_key, answer, lang, model, "
+            "data_version, industry, best_stock_id, best_stock_name) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (session_id, now, question, question_key(question), answer, lang, model, data_version,
+             industry or None, best_stock_id, best_stock_name)
+        )
+        return cursor.lastrowid
+
+
+def find_answer(question, lang, model, data_version, db_path=None):
+    """
+    Latest stored industry answer to the same question over the same data, or
+    None. Industry prompts are fully determined by question, language and
+    data version, so such an answer is as good as a fresh one.
+    """
+    path = db_path or HISTORY_DB_PATH
+    if not os.path.exists(path):
+        return None
+    with closing(_connect(path)) as conn:
+        row = conn.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM chat_turns "
+            "WHERE question_key = ? AND lang = ? AND model = ? AND data_version = ? AND industry IS NOT NULL "
+            "ORDER BY id DESC LIMIT 1",
+            (question_key(question), lang, model, data_version)
+        ).fetchone()
+    return _row_dict(row) if row else None
+
+
+def list_turns(query=None, industry=None, stock_id=None, session_id=None, shared_industry=False,
+               limit=20, db_path=None):
+    """
+    Stored turns, newest first. `query` matches question, answer and best stock
+    name as a substring; industry, stock and session filters use their indexes.
+    With `shared_industry`, a session also sees other sessions' industry answers,
+    the ones find_answer would reuse for anybody; their other turns stay private.
+    """
+    path = db_path or HISTORY_DB_PATH
+    if not os.path.exists(path):
+        return []
+    clauses, params = [], []
+    if industry:
+        clauses.append("industry = ?")
+        params.append(industry)
+    if stock_id:
+        clauses.append("best_stock_id = ?")
+        params.append(str(stock_id))
+    if session_id:
+        clauses.append("(session_id = ? OR industry IS NOT NULL)" if shared_industry else "session_id = ?")
+        params.append(session_id)
+    if query and query.strip():
+        pattern = f"%{query.strip()}%"
+        clauses.append("(question LIKE ? OR answer LIKE ? OR best_stock_name LIKE ? OR best_stock_id = ?)")
+        params.extend([pattern, pattern, pattern, query.strip()])
+    where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+    with closing(_connect(path)) as conn:
+        rows = conn.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM chat_turns {where}ORDER BY id DESC LIMIT ?",
+            (*params, int(limit))
+        ).fetchall()
+    return [_row_dict(row) for row in rows]
+
+
+def turn_count(db_path=None):
+    path = db_path or HISTORY_DB_PATH
+    if not os.path.exists(path):
+        return 0
+    with closing(_connect(path)) as conn:
+        return conn.execute("SELECT COUNT(*) FROM chat_turns").fetchone()[0]
@@ -0,0 +1,272 @@
+# indicators.py
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from price_store import PRICE_STORE_DIR, load_prices, max_stored_date
+
+# Latest-day indicator values for every stock, rebuilt after each price ingest
+INDICATORS_FILE = "indicators_latest.parquet"
+
+# Calendar days of history loaded for the panel; enough for EMA26 + signal 9 and Wilder RSI to settle
+DEFAULT_LOOKBACK_DAYS = 400
+
+
+def _indicators_path(store_dir=None):
+    return os.path.join(store_dir or PRICE_STORE_DIR, INDICATORS_FILE)
+
+
+def _forward_fill(x):
+    """Forward-fill NaNs along the day axis; leading NaNs stay NaN"""
+    valid = ~np.isnan(x)
+    idx = np.where(valid, np.arange(x.shape[1]), 0)
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    filled = x[np.arange(x.shape[0])[:, None], idx]
+    return np.where(np.cumsum(valid, axis=1) > 0, filled, np.nan)
+
+
+def build_panels(prices, fields, zero_fill=("Trading_Volume",)):
+    """
+    Pivots long price rows into (stock × day) float arrays, one per field.
+
+    Returns ({field: array}, stock_ids, dates). Stocks and dates are factorized
+    once and shared by every field. Gaps after a stock's first trade are
+    forward-filled (suspensions), or zero-filled for volume-like fields;
+    leading gaps stay NaN.
+    """
+    stock_codes, stock_ids = pd.factorize(prices["stock_id"], sort=True)
+    date_codes, dates = pd.factorize(prices["date"], sort=True)
+    shape = (len(stock_ids), len(dates))
+
+    seen = np.zeros(shape, dtype=bool)
+    seen[stock_codes, date_codes] = True
+    started = np.cumsum(seen, axis=1) > 0
+
+    arrays = {}
+    for field in fields:
+        values = np.full(shape, np.nan)
+        values[stock_codes, date_codes] = prices[field].to_numpy(dtype=float)
+        if field in zero_fill:
+            values = np.where(started, np.nan_to_num(values), np.nan)
+        else:
+            values = _forward_fill(values)
+        arrays[field] = values
+    return arrays, np.asarray(stock_ids), np.asarray(dates)
+
+
+def rolling_mean(x, n):
+    """Simple moving average along the day axis; NaN until n valid values are in the window"""
+    valid = ~np.isnan(x)
+    cs = np.cumsum(np.where(valid, x, 0.0), axis=1)
+    cnt = np.cumsum(valid, axis=1)
+    cs = np.concatenate([np.zeros((x.shape[0], 1)), cs], axis=1)
+    cnt = np.concatenate([np.zeros((x.shape[0], 1)), cnt], axis=1)
+    out = np.full(x.shape, np.nan)
+    if x.shape[1] >= n:
+        window_sum = cs[:, n:] - cs[:, :-n]
+        window_cnt = cnt[:, n:] - cnt[:, :-n]
+        out[:, n - 1:] = np.where(window_cnt == n, window_sum / n, np.nan)
+    return out
+
+
+def rolling_std(x, n):
+    """Population standard deviation over the same windows as rolling_mean"""
+    mean = rolling_mean(x, n)
+    mean_sq = rolling_mean(x * x, n)
+    return np.sqrt(np.maximum(mean_sq - mean * mean, 0.0))
+
+
+def recursive_smooth(x, n, alpha):
+    """
+    Exponential smoothing along the day axis, vectorized across stocks.
+
+    Each stock is seeded with the simple mean of its first n valid values, then
+    s[t] = alpha * x[t] + (1 - alpha) * s[t-1]. alpha = 2/(n+1) gives the EMA,
+    alpha = 1/n gives Wilder's smoothing (RSI, ATR).
+    """
+    rows, cols = x.shape
+    out = np.full(x.shape, np.nan)
+    state = np.full(rows, np.nan)
+    seed_sum = np.zeros(rows)
+    seed_cnt = np.zeros(rows, dtype=int)
+
+    for t in range(cols):
+        col = x[:, t]
+        valid = ~np.isnan(col)
+
+        seeding = valid & (seed_cnt < n)
+        seed_sum[seeding] += col[seeding]
+        seed_cnt[seeding] += 1
+        just_seeded = seeding & (seed_cnt == n)
+        state[just_seeded] = seed_sum[just_seeded] / n
+
+        updating = valid & ~seeding & ~np.isnan(state)
+        state[updating] = alpha * col[updating] + (1 - alpha) * state[updating]
+
+        out[:, t] = np.where(seed_cnt >= n, state, np.nan)
+    return out
+
+
+def ema(x, n):
+    return recursive_smooth(x, n, 2.0 / (n + 1))
+
+
+def wilder(x, n):
+    return recursive_smooth(x, n, 1.0 / n)
+
+
+def rsi(close, n=14):
+    """Wilder's RSI"""
+    delta = np.diff(close, axis=1, prepend=np.nan)
+    gain = np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0))
+    loss = np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0.0))
+    avg_gain = wilder(gain, n)
+    avg_loss = wilder(loss, n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / avg_loss
+        out = 100 - 100 / (1 + rs)
+    # No losses in the window: RSI is 100 (or undefined if flat)
+    out = np.where((avg_loss == 0) & (avg_gain > 0), 100.0, out)
+    out = np.where((avg_loss == 0) & (avg_gain == 0), 50.0, out)
+    return out
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger(close, n=20, k=2.0):
+    mid = rolling_mean(close, n)
+    std = rolling_std(close, n)
+    return mid + k * std, mid, mid - k * std
+
+
+def atr(high, low, close, n=14):
+    prev_close = np.concatenate([np.full((close.shape[0], 1), np.nan), close[:, :-1]], axis=1)
+    true_range = np.fmax(
+        high - low,
+        np.fmax(np.abs(high - prev_close), np.abs(low - prev_close))
+    )
+    return wilder(true_range, n)
+
+
+def compute_indicator_panel(prices, sma_windows=(5, 10, 20, 60)):
+    """
+    Computes every indicator for every stock in `prices` at once.
+
+    `prices` is long-format store rows (date, stock_id, open, max, min, close,
+    Trading_Volume). It is never modified. Returns a dict with the (stock × day)
+    arrays keyed by indicator name plus 'stock_ids' and 'dates'.
+    """
+    arrays, stock_ids, dates = build_panels(prices, ["close", "max", "min", "Trading_Volume"])
+    close, high, low, volume = arrays["close"], arrays["max"], arrays["min"], arrays["Trading_Volume"]
+
+    panel = {
+        "stock_ids": stock_ids,
+        "dates": dates,
+        "close": close,
+        "volume": volume,
+    }
+    for n in sma_windows:
+        panel[f"sma_{n}"] = rolling_mean(close, n)
+    panel["ema_12"] = ema(close, 12)
+    panel["ema_26"] = ema(close, 26)
+    panel["rsi_14"] = rsi(close, 14)
+    panel["macd"], panel["macd_signal"], panel["macd_hist"] = macd(close)
+    panel["bb_upper"], panel["bb_mid"], panel["bb_lower"] = bollinger(close)
+    panel["atr_14"] = atr(high, low, close)
+
+    # Screener inputs: average volume and trailing N-day returns (%)
+    panel["volume_sma_20"] = rolling_mean(volume, 20)
+    for n in (5, 20, 60):
+        past = np.concatenate([np.full((close.shape[0], n), np.nan), close[:, :-n]], axis=1)[:, :close.shape[1]]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            panel[f"return_{n}d"] = (close / past - 1) * 100
+    return panel
+
+
+def panel_frame(panel, stock_id):
+    """One stock's indicators as a date-indexed DataFrame (for charts and detail views)"""
+    row = np.flatnonzero(panel["stock_ids"] == stock_id)
+    if row.size == 0:
+        return pd.DataFrame()
+    i = row[0]
+    columns = {
+        name: values[i]
+        for name, values in panel.items()
+        if isinstance(values, np.ndarray) and values.ndim == 2
+    }
+    return pd.DataFrame(columns, index=pd.DatetimeIndex(panel["dates"], name="date"))
+
+
+def stock_indicator_frame(df_price):
+    """Indicators for one stock's price rows, indexed by date; `df_price` is not modified"""
+    prices = df_price.assign(stock_id="_", date=pd.to_datetime(df_price["date"]))
+    if "Trading_Volume" not in prices.columns:
+        prices = prices.assign(Trading_Volume=np.nan)
+    return panel_frame(compute_indicator_panel(prices), "_")
+
+
+def latest_indicators(panel):
+    """Last-day value of every indicator, one row per stock"""
+    latest = {
+        name: values[:, -1]
+        for name, values in panel.items()
+        if isinstance(values, np.ndarray) and values.ndim == 2
+    }
+    df = pd.DataFrame(latest)
+    df.insert(0, "stock_id", panel["stock_ids"])
+    df.insert(1, "date", pd.Timestamp(panel["dates"][-1]) if len(panel["dates"]) else pd.NaT)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        df["volume_ratio"] = df["volume"] / df["volume_sma_20"].where(df["volume_sma_20"] > 0)
+    return df.rename(columns={"close": "current_price"})
+
+
+def compute_latest_indicators(lookback_days=DEFAULT_LOOKBACK_DAYS, store_dir=None):
+    """Loads the recent price panel from the store and returns latest-day indicators"""
+    latest = max_stored_date(store_dir)
+    if latest is None:
+        return pd.DataFrame()
+    prices = load_prices(
+        start_date=latest - pd.Timedelta(days=lookback_days),
+        columns=["date", "stock_id", "max", "min", "close", "Trading_Volume"],
+        store_dir=store_dir,
+    )
+    if prices.empty:
+        return pd.DataFrame()
+    return latest_indicators(compute_indicator_panel(prices))
+
+
+def save_latest_indicators(df, store_dir=None):
+    path = _indicators_path(store_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def indicators_version(store_dir=None):
+    """Changes whenever the indicators table is rebuilt; used as a Streamlit cache key"""
+    path = _indicators_path(store_dir)
+    return str(int(os.path.getmtime(path))) if os.path.exists(path) else ""
+
+
+def load_latest_indicators(store_dir=None):
+    path = _indicators_path(store_dir)
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    return pd.read_parquet(path)
+
+
+def rebuild_latest_indicators(store_dir=None):
+    """Recompute and persist latest-day indicators; returns the number of stocks"""
+    df = compute_latest_indicators(store_dir=store_dir)
+    if df.empty:
+        return 0
+    save_latest_indicators(df, store_dir)
+    return len(df)
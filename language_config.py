@@ -321,6 +321,10 @@ TRANSLATIONS = {
         "en": "Offline",
         "zh": "離線"
     },
+    "checking_quota": {
+        "en": "Checking...",
+        "zh": "查詢中..."
+    },
     
     # Industry names
     "food_industry": {
@@ -726,6 +730,190 @@ TRANSLATIONS = {
     "minutes": {
         "en": "minutes",
         "zh": "分鐘"
+    },
+    "page": {
+        "en": "Page",
+        "zh": "頁數"
+    },
+    "showing_stocks": {
+        "en": "Showing {start}–{end} of {total} stocks",
+        "zh": "顯示第 {start}–{end} 檔，共 {total} 檔股票"
+    },
+    "chart_range": {
+        "en": "Chart range",
+        "zh": "圖表期間"
+    },
+    "lookback_1m": {
+        "en": "1M",
+        "zh": "1個月"
+    },
+    "lookback_3m": {
+        "en": "3M",
+        "zh": "3個月"
+    },
+    "lookback_1y": {
+        "en": "1Y",
+        "zh": "1年"
+    },
+    "lookback_5y": {
+        "en": "5Y",
+        "zh": "5年"
+    },
+    "filter_mode": {
+        "en": "Mode",
+        "zh": "模式"
+    },
+    "mode_browse": {
+        "en": "Browse by industry",
+        "zh": "依產業瀏覽"
+    },
+    "mode_screener": {
+        "en": "Technical screener",
+        "zh": "技術面選股"
+    },
+    "screener_rsi_below": {
+        "en": "RSI below",
+        "zh": "RSI 低於"
+    },
+    "screener_above_sma20": {
+        "en": "Close above SMA 20",
+        "zh": "收盤價高於 20 日均線"
+    },
+    "screener_volume_spike": {
+        "en": "Volume ≥ × 20-day average",
+        "zh": "成交量 ≥ 20 日均量倍數"
+    },
+    "screener_return_days": {
+        "en": "Return period (days)",
+        "zh": "報酬期間（天）"
+    },
+    "screener_return_min": {
+        "en": "Minimum return (%)",
+        "zh": "最低報酬率（%）"
+    },
+    "screener_matches": {
+        "en": "{total} matching stocks · query {ms:.0f} ms · data as of {date}",
+        "zh": "符合條件 {total} 檔 · 查詢 {ms:.0f} 毫秒 · 資料日期 {date}"
+    },
+    "screener_no_indicators": {
+        "en": "No indicator data yet. Run `python download_daily_prices.py` to build the price store.",
+        "zh": "尚無技術指標資料，請先執行 `python download_daily_prices.py` 建立價格資料庫。"
+    },
+    "interval_D": {
+        "en": "daily",
+        "zh": "日線"
+    },
+    "interval_W": {
+        "en": "weekly",
+        "zh": "週線"
+    },
+    "interval_M": {
+        "en": "monthly",
+        "zh": "月線"
+    },
+    "interval_Q": {
+        "en": "quarterly",
+        "zh": "季線"
+    },
+    "token_usage": {
+        "en": "🔢 Prompt tokens: {prompt:,} · completion tokens: {completion:,}",
+        "zh": "🔢 提示詞 token：{prompt:,} · 回覆 token：{completion:,}"
+    },
+    "token_usage_cached": {
+        "en": "⚡ Cached answer (no API call) · prompt tokens: {prompt:,} · completion tokens: {completion:,}",
+        "zh": "⚡ 快取回覆（未呼叫 API）· 提示詞 token：{prompt:,} · 回覆 token：{completion:,}"
+    },
+    "no_stored_profile": {
+        "en": "No stored profile for this company yet (run `python generate_company_profiles.py`).",
+        "zh": "尚無此公司的資料（請執行 `python generate_company_profiles.py`）。"
+    },
+    "run_ai_analysis": {
+        "en": "🤖 Run AI analysis",
+        "zh": "🤖 執行 AI 分析"
+    },
+    "parallel_sections": {
+        "en": "⚡ Parallel section analysis",
+        "zh": "⚡ 分段平行分析"
+    },
+    "parallel_sections_help": {
+        "en": "Analyze the balance sheet, income statement and cash flow in parallel, then write a short conclusion. Faster for industry questions.",
+        "zh": "同時分析資產負債表、損益表與現金流，再撰寫簡短結論。產業問題的回覆更快。"
+    },
+    "section_generating": {
+        "en": "Analyzing...",
+        "zh": "分析中..."
+    },
+    "conclusion": {
+        "en": "🏆 Conclusion",
+        "zh": "🏆 結論"
+    },
+    "search_stock": {
+        "en": "🔎 Search stocks",
+        "zh": "🔎 搜尋股票"
+    },
+    "search_stock_placeholder": {
+        "en": "Stock ID, company name or industry (e.g. 2330, 台積, biotech)",
+        "zh": "股票代號、公司名稱或產業（例如 2330、台積、生技）"
+    },
+    "search_results": {
+        "en": "Search results",
+        "zh": "搜尋結果"
+    },
+    "search_no_results": {
+        "en": "No matching stocks",
+        "zh": "找不到符合的股票"
+    },
+    "show_earlier_turns": {
+        "en": "Show {n} earlier messages",
+        "zh": "顯示較早的 {n} 則對話"
+    },
+    "past_answers": {
+        "en": "📜 Past answers",
+        "zh": "📜 歷史回覆"
+    },
+    "search_past_answers": {
+        "en": "Search past questions and answers",
+        "zh": "搜尋過去的問題與回覆"
+    },
+    "search_past_answers_placeholder": {
+        "en": "Keyword, stock ID or company name",
+        "zh": "關鍵字、股票代號或公司名稱"
+    },
+    "no_past_answers": {
+        "en": "No past answers found",
+        "zh": "找不到歷史回覆"
+    },
+    "include_shared_answers": {
+        "en": "Include industry answers from other sessions",
+        "zh": "包含其他對話的產業回覆"
+    },
+    "perf_panel": {
+        "en": "⏱️ Performance panel",
+        "zh": "⏱️ 效能面板"
+    },
+    "perf_panel_help": {
+        "en": "Time spent in loading, analysis, figure building and chart rendering on each rerun",
+        "zh": "每次重新執行時，載入、分析、圖表建立與圖表渲染所花的時間"
+    },
+    "perf_this_rerun": {
+        "en": "This rerun ({page}): {ms:,.0f} ms",
+        "zh": "本次執行（{page}）：{ms:,.0f} 毫秒"
+    },
+    "perf_by_page": {
+        "en": "This session by page (ms)",
+        "zh": "本次工作階段各頁面（毫秒）"
+    },
+    "perf_export": {
+        "en": "⬇️ Export timings (JSONL)",
+        "zh": "⬇️ 匯出計時資料（JSONL）"
+    },
+    "profile_written": {
+        "en": "🔬 Profile of this rerun: {path}",
+        "zh": "🔬 本次執行的效能剖析檔：{path}"
+    },
+    "finmind_circuit_open": {
+        "en": "⚡ FinMind unavailable ({reason}) — showing local and cached data. Retrying in {minutes} min.",
+        "zh": "⚡ FinMind 暫時無法使用（{reason}）— 目前顯示本地及快取資料，{minutes} 分鐘後重試。"
     }
 }
 
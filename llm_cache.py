@@ -0,0 +1,65 @@
+# llm_cache.py
+
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+
+# Persistent store of LLM answers, one JSON file per key
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", ".cache/llm")
+
+
+def cache_key(prompt, model, language, data_version):
+    """
+    Stable key for an answer. The prompt hash covers the ranking tables sent to
+    the model; data_version additionally separates answers built from older CSVs.
+    """
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    raw = f"{prompt_hash}|{model}|{language}|{data_version}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def _cache_path(key, cache_dir=None):
+    return os.path.join(cache_dir or LLM_CACHE_DIR, key[:2], f"{key}.json")
+
+
+def get_cached_answer(prompt, model, language, data_version, cache_dir=None):
+    """Cached answer text, or None on a miss"""
+    path = _cache_path(cache_key(prompt, model, language, data_version), cache_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)["answer"]
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️ Ignoring unreadable LLM cache entry {path}: {e}")
+        return None
+
+
+def store_answer(prompt, model, language, data_version, answer, cache_dir=None):
+    """Persists an answer atomically; concurrent writers of the same key are harmless"""
+    if not answer:
+        return None
+    path = _cache_path(cache_key(prompt, model, language, data_version), cache_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    entry = {
+        "model": model,
+        "language": language,
+        "data_version": data_version,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "answer": answer,
+    }
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(entry, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def replay_stream(answer, chunk_chars=40, delay=0.0):
+    """Yields a cached answer in chunks so it renders through st.write_stream"""
+    for i in range(0, len(answer), chunk_chars):
+        yield answer[i:i + chunk_chars]
+        if delay:
+            time.sleep(delay)
@@ -0,0 +1,151 @@
+# metrics_cube.py
+
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# Per-quarter metrics kept in the cube: (column in the analysis frames, alias, scale).
+# Columns come from run_buffett_column1/2_analysis and run_cashflow_column3_analysis,
+# so pass flags match the '% Passed' of the ranking tables.
+CUBE_METRICS = [
+    ("CashOverDebt_Pct", "cash_debt", 1),
+    ("DebtToEquity", "de", 1),
+    ("RetainedEarningsGrowth_Pct", "re_g", 1),
+    ("GrossMargin", "gm", 0.01),
+    ("InterestMargin", "im", 0.01),
+    ("NetProfitMargin", "npm", 0.01),
+    ("EPS", "eps", 1),
+    ("FreeCashFlow", "fcf_m", 1e6),
+    ("NetDebtChange", "ndc_m", 1e6),
+    ("PassedBalance", "pass_bal", 1),
+    ("PassedIncome", "pass_inc", 1),
+    ("PassedCashflow", "pass_cf", 1),
+]
+
+# Metrics whose history is returned by compare(); the rest only appear as averages
+HISTORY_METRICS = ["gm", "npm", "eps", "de", "fcf_m"]
+PASS_METRICS = ["pass_bal", "pass_inc", "pass_cf"]
+
+MAX_COMPARE_STOCKS = 6
+DEFAULT_COMPARE_QUARTERS = 8
+
+METRIC_DESCRIPTIONS = {
+    "cash_debt": "cash / total debt, % (10000 = no debt)",
+    "de": "debt-to-equity ratio",
+    "re_g": "retained earnings growth vs 4 quarters ago, %",
+    "gm": "gross margin, %",
+    "im": "interest expense / operating income, %",
+    "npm": "net profit margin, %",
+    "eps": "EPS, TWD",
+    "fcf_m": "free cash flow, TWD millions",
+    "ndc_m": "net debt change, TWD millions",
+    "pass_bal": "% of quarters since 2020 passing all balance sheet rules",
+    "pass_inc": "% of quarters since 2020 passing all income statement rules",
+    "pass_cf": "% of quarters since 2020 passing all cash flow rules",
+}
+
+
+class MetricsCube:
+    """
+    Dense stocks x quarters x metrics array over every industry. Comparing any
+    set of stocks is one fancy-index into `values` plus nan-aware reductions,
+    with no per-industry DataFrame work at query time.
+    """
+
+    def __init__(self, stock_ids, stock_names, industries, dates, metrics, values):
+        self.stock_ids = np.asarray(stock_ids, dtype=str)
+        self.stock_names = np.asarray(stock_names, dtype=str)
+        self.industries = np.asarray(industries, dtype=str)
+        self.dates = np.asarray(dates, dtype=str)
+        self.metrics = list(metrics)
+        self.values = values
+        self._row = {sid: i for i, sid in enumerate(self.stock_ids)}
+        self._col = {m: i for i, m in enumerate(self.metrics)}
+
+    @classmethod
+    def from_frame(cls, df):
+        """From one row per (stock_id, date) with stock_name, industry and CUBE_METRICS columns"""
+        df = df.drop_duplicates(subset=["stock_id", "date"], keep="last")
+        stocks = df.drop_duplicates(subset="stock_id").sort_values("stock_id")
+        stock_ids = stocks["stock_id"].astype(str).to_numpy()
+        dates = np.sort(df["date"].astype(str).unique())
+
+        row = pd.Index(stock_ids).get_indexer(df["stock_id"].astype(str))
+        col = pd.Index(dates).get_indexer(df["date"].astype(str))
+        values = np.full((len(stock_ids), len(dates), len(CUBE_METRICS)), np.nan)
+        for k, (column, _, scale) in enumerate(CUBE_METRICS):
+            if column in df.columns:
+                values[row, col, k] = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float) / scale
+
+        return cls(stock_ids, stocks["stock_name"].astype(str).to_numpy(),
+                   stocks["industry"].astype(str).to_numpy(), dates,
+                   [alias for _, alias, _ in CUBE_METRICS], values)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(tmp_path, stock_ids=self.stock_ids, stock_names=self.stock_names,
+                            industries=self.industries, dates=self.dates,
+                            metrics=np.asarray(self.metrics), values=self.values)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["stock_ids"], data["stock_names"], data["industries"], data["dates"],
+                       data["metrics"].tolist(), data["values"])
+
+    def __len__(self):
+        return len(self.stock_ids)
+
+    def compare(self, stock_ids, quarters=DEFAULT_COMPARE_QUARTERS):
+        """
+        (summary, history, missing) for up to MAX_COMPARE_STOCKS stocks.
+
+        summary: one row per stock with industry, pass rates (%) over all quarters
+        and window averages of every metric. history: HISTORY_METRICS per stock
+        for the latest `quarters` quarters in which any of them reported.
+        """
+        requested = list(dict.fromkeys(str(s).strip() for s in stock_ids))[:MAX_COMPARE_STOCKS]
+        found = [s for s in requested if s in self._row]
+        missing = [s for s in requested if s not in self._row]
+        if not found:
+            return pd.DataFrame(), pd.DataFrame(), missing
+
+        rows = np.array([self._row[s] for s in found])
+        block = self.values[rows]  # (stocks, dates, metrics)
+
+        # Align on the quarters the selected stocks actually report
+        reported = np.flatnonzero(~np.isnan(block).all(axis=(0, 2)))
+        window = reported[-max(1, quarters):]
+
+        pass_cols = [self._col[m] for m in PASS_METRICS]
+        value_cols = [self._col[m] for m in self.metrics if m not in PASS_METRICS]
+        with warnings.catch_warnings():
+            # nanmean of an all-NaN slice warns; stocks without a given metric are expected
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            pass_rates = np.nanmean(block[:, :, pass_cols], axis=1) * 100
+            averages = np.nanmean(block[:, window][:, :, value_cols], axis=1)
+
+        summary = pd.DataFrame({
+            "stock_id": found,
+            "stock_name": self.stock_names[rows],
+            "industry": self.industries[rows],
+        })
+        for j, m in enumerate(PASS_METRICS):
+            summary[m] = pass_rates[:, j].round(0)
+        for j, k in enumerate(value_cols):
+            summary[self.metrics[k]] = averages[:, j]
+
+        history_cols = [self._col[m] for m in HISTORY_METRICS]
+        recent = block[:, window][:, :, history_cols]  # (stocks, window, history metrics)
+        labels = [f"{m}:{s}" for m in HISTORY_METRICS for s in found]
+        history = pd.DataFrame(
+            recent.transpose(2, 0, 1).reshape(len(labels), len(window)),
+            columns=[d[:7] for d in self.dates[window]]
+        )
+        history.insert(0, "metric:stock", labels)
+        return summary, history, missing
+
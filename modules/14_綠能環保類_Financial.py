@@ -11,6 +11,7 @@ from finmind_tools import (
     run_cashflow_column3_analysis 
 )
 from language_config import get_text
+from perf import plotly_chart
 
 # --- Load and pivot the CSV using the reusable tool ---
 try:
@@ -40,14 +41,14 @@ with col1:
     fig4_綠能環保 = results_綠能環保["fig4"]
     ranking_bal_綠能環保 = results_綠能環保["ranking_df"]
 
-    st.plotly_chart(fig_bal_綠能環保, use_container_width=True)
+    plotly_chart(fig_bal_綠能環保, use_container_width=True)
 
     # --- Trend Charts ---
     st.markdown(f"#### {get_text('trend_charts_balance_sheet')}")
-    st.plotly_chart(fig1_綠能環保, use_container_width=True)
-    st.plotly_chart(fig2_綠能環保, use_container_width=True)
-    st.plotly_chart(fig3_綠能環保, use_container_width=True)
-    st.plotly_chart(fig4_綠能環保, use_container_width=True)
+    plotly_chart(fig1_綠能環保, use_container_width=True)
+    plotly_chart(fig2_綠能環保, use_container_width=True)
+    plotly_chart(fig3_綠能環保, use_container_width=True)
+    plotly_chart(fig4_綠能環保, use_container_width=True)
 
     # --- Balance Sheet Rankings ---
     st.markdown(f"#### {get_text('ranked_metrics_top5_balance_sheet')}")
@@ -69,14 +70,14 @@ with col2:
     fig8_綠能環保 = results2_綠能環保["fig4_inc"]
     ranking_inc_綠能環保 = results2_綠能環保["ranking_inc"]
 
-    st.plotly_chart(fig_inc_綠能環保, use_container_width=True)
+    plotly_chart(fig_inc_綠能環保, use_container_width=True)
 
     # --- Trend Charts ---
     st.markdown(f"#### {get_text('trend_charts_income_statement')}")
-    st.plotly_chart(fig5_綠能環保, use_container_width=True)
-    st.plotly_chart(fig6_綠能環保, use_container_width=True)
-    st.plotly_chart(fig7_綠能環保, use_container_width=True)
-    st.plotly_chart(fig8_綠能環保, use_container_width=True)
+    plotly_chart(fig5_綠能環保, use_container_width=True)
+    plotly_chart(fig6_綠能環保, use_container_width=True)
+    plotly_chart(fig7_綠能環保, use_container_width=True)
+    plotly_chart(fig8_綠能環保, use_container_width=True)
 
     # --- Income Statement Rankings ---
     st.markdown(f"#### {get_text('ranked_metrics_top5_income_statement')}")
@@ -98,14 +99,14 @@ with col3:
     fig12_綠能環保 = results3_綠能環保["fig4"]
     ranking_cash_綠能環保 = results3_綠能環保["ranking_df"]
 
-    st.plotly_chart(fig_cash_綠能環保, use_container_width=True)
+    plotly_chart(fig_cash_綠能環保, use_container_width=True)
 
     # --- Trend Charts ---
     st.markdown(f"#### {get_text('trend_charts_cash_flow')}")
-    st.plotly_chart(fig9_綠能環保, use_container_width=True)
-    st.plotly_chart(fig10_綠能環保, use_container_width=True)
-    st.plotly_chart(fig11_綠能環保, use_container_width=True)
-    st.plotly_chart(fig12_綠能環保, use_container_width=True)
+    plotly_chart(fig9_綠能環保, use_container_width=True)
+    plotly_chart(fig10_綠能環保, use_container_width=True)
+    plotly_chart(fig11_綠能環保, use_container_width=True)
+    plotly_chart(fig12_綠能環保, use_container_width=True)
 
     # --- Cash Flow Rankings ---
     st.markdown(f"#### {get_text('ranked_metrics_top5_cash_flow')}")
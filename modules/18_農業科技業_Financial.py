@@ -11,6 +11,7 @@ from finmind_tools import (
     run_cashflow_column3_analysis 
 )
 from language_config import get_text
+from perf import plotly_chart
 
 # --- Load and pivot the CSV using the reusable tool ---
 try:
@@ -46,20 +47,20 @@ with col1:
         ranking_bal_農業科技業 = pd.DataFrame()
 
     if fig_bal_農業科技業:
-        st.plotly_chart(fig_bal_農業科技業, use_container_width=True)
+        plotly_chart(fig_bal_農業科技業, use_container_width=True)
     else:
         st.info("Balance sheet heatmap not available for this industry")
 
     # --- Trend Charts ---
     st.markdown(f"#### {get_text('trend_charts_balance_sheet')}")
     if fig1_農業科技業:
-        st.plotly_chart(fig1_農業科技業, use_container_width=True)
+        plotly_chart(fig1_農業科技業, use_container_width=True)
     if fig2_農業科技業:
-        st.plotly_chart(fig2_農業科技業, use_container_width=True)
+        plotly_chart(fig2_農業科技業, use_container_width=True)
     if fig3_農業科技業:
-        st.plotly_chart(fig3_農業科技業, use_container_width=True)
+        plotly_chart(fig3_農業科技業, use_container_width=True)
     if fig4_農業科技業:
-        st.plotly_chart(fig4_農業科技業, use_container_width=True)
+        plotly_chart(fig4_農業科技業, use_container_width=True)
     
     if not any([fig1_農業科技業, fig2_農業科技業, fig3_農業科技業, fig4_農業科技業]):
         st.info("Trend charts not available - insufficient data for analysis")
@@ -93,20 +94,20 @@ with col2:
         ranking_inc_農業科技業 = pd.DataFrame()
 
     if fig_inc_農業科技業:
-        st.plotly_chart(fig_inc_農業科技業, use_container_width=True)
+        plotly_chart(fig_inc_農業科技業, use_container_width=True)
     else:
         st.info("Income statement heatmap not available for this industry")
 
     # --- Trend Charts ---
     st.markdown(f"#### {get_text('trend_charts_income_statement')}")
     if fig5_農業科技業:
-        st.plotly_chart(fig5_農業科技業, use_container_width=True)
+        plotly_chart(fig5_農業科技業, use_container_width=True)
     if fig6_農業科技業:
-        st.plotly_chart(fig6_農業科技業, use_container_width=True)
+        plotly_chart(fig6_農業科技業, use_container_width=True)
     if fig7_農業科技業:
-        st.plotly_chart(fig7_農業科技業, use_container_width=True)
+        plotly_chart(fig7_農業科技業, use_container_width=True)
     if fig8_農業科技業:
-        st.plotly_chart(fig8_農業科技業, use_container_width=True)
+        plotly_chart(fig8_農業科技業, use_container_width=True)
     
     if not any([fig5_農業科技業, fig6_農業科技業, fig7_農業科技業, fig8_農業科技業]):
         st.info("Trend charts not available - insufficient data for analysis")
@@ -140,20 +141,20 @@ with col3:
         ranking_cf_農業科技業 = pd.DataFrame()
 
     if fig_cf_農業科技業:
-        st.plotly_chart(fig_cf_農業科技業, use_container_width=True)
+        plotly_chart(fig_cf_農業科技業, use_container_width=True)
     else:
         st.info("Cash flow heatmap not available for this industry")
 
     # --- Trend Charts ---
     st.markdown(f"#### {get_text('trend_charts_cash_flow')}")
     if fig9_農業科技業:
-        st.plotly_chart(fig9_農業科技業, use_container_width=True)
+        plotly_chart(fig9_農業科技業, use_container_width=True)
     if fig10_農業科技業:
-        st.plotly_chart(fig10_農業科技業, use_container_width=True)
+        plotly_chart(fig10_農業科技業, use_container_width=True)
     if fig11_農業科技業:
-        st.plotly_chart(fig11_農業科技業, use_container_width=True)
+        plotly_chart(fig11_農業科技業, use_container_width=True)
     if fig12_農業科技業:
-        st.plotly_chart(fig12_農業科技業, use_container_width=True)
+        plotly_chart(fig12_農業科技業, use_container_width=True)
     
     if not any([fig9_農業科技業, fig10_農業科技業, fig11_農業科技業, fig12_農業科技業]):
         st.info("Trend charts not available - insufficient data for analysis")
@@ -4,6 +4,7 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import os
+import time
 import numpy as np
 from datetime import datetime, timedelta
 
@@ -13,12 +14,21 @@ from openai import OpenAI
 from finmind_tools import (
     get_taiwan_stock_info,
     get_price_30days,
+    get_price_history,
     get_api_usage,
     get_all_financials,
     get_stocks_by_industry,
+    get_finmind_circuit_status,
     FINMIND_TOKEN
 )
+from price_store import load_snapshot, store_version
+from indicators import stock_indicator_frame, load_latest_indicators, indicators_version
+from screener import screen_stocks, RETURN_WINDOWS
+from price_charts import prepare_ohlc, resample_line, line_trace
+from profile_store import get_profile
+from stock_search import StockSearchIndex
 from language_config import get_text, get_current_language, is_all_value
+from perf import plotly_chart, record_span, span, timed
 
 # --- Load environment variable for OpenAI ---
 load_dotenv()
@@ -96,6 +106,32 @@ def cached_stock_info():
 def cached_price(stock_id):
     return get_price_30days(stock_id, FINMIND_TOKEN)
 
+@st.cache_data(ttl=3600)
+def cached_price_history(stock_id, days):
+    return get_price_history(stock_id, days, FINMIND_TOKEN)
+
+@st.cache_data(ttl=3600)
+def cached_price_snapshot(store_key):
+    # store_key changes whenever the ingest job writes, invalidating the snapshot
+    return load_snapshot()
+
+@st.cache_data(ttl=3600)
+def cached_screener_table(indicators_key):
+    # Latest-day indicators for the whole market, joined with names once per rebuild
+    df = load_latest_indicators()
+    if df.empty:
+        return df
+    names = (
+        cached_stock_info()[["stock_id", "stock_name", "industry_category"]]
+        .drop_duplicates(subset="stock_id")
+    )
+    return df.merge(names, on="stock_id", how="left")
+
+@st.cache_resource(ttl=86400)
+def load_search_index():
+    # Name / ID / industry index over the daily stock list, shared by all sessions
+    return StockSearchIndex(cached_stock_info())
+
 @st.cache_data
 def load_industry_options():
     df = get_taiwan_stock_info()
@@ -109,83 +145,83 @@ def calculate_technical_indicators(df_price):
     if df_price.empty or len(df_price) < 5:
         return {}
     
-    # Simple Moving Averages
-    df_price['SMA_5'] = df_price['close'].rolling(window=5).mean()
-    df_price['SMA_10'] = df_price['close'].rolling(window=10).mean()
-    
-    # RSI calculation
-    delta = df_price['close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
+    # Computed on a copy by the panel engine; the cached df_price is left untouched
+    frame = stock_indicator_frame(df_price)
+    latest = frame.iloc[-1]
+    first_close = df_price['close'].iloc[0]
     
-    latest = df_price.iloc[-1]
     indicators = {
         'current_price': latest['close'],
-        'volume': latest.get('Trading_Volume', 0),
-        'sma_5': df_price['SMA_5'].iloc[-1] if not df_price['SMA_5'].isna().all() else 0,
-        'sma_10': df_price['SMA_10'].iloc[-1] if not df_price['SMA_10'].isna().all() else 0,
-        'rsi': rsi.iloc[-1] if not rsi.isna().all() else 50,
-        'price_change_pct': ((latest['close'] - df_price['close'].iloc[0]) / df_price['close'].iloc[0]) * 100 if len(df_price) > 1 and df_price['close'].iloc[0] != 0 else 0
+        'volume': latest['volume'],
+        'sma_5': latest['sma_5'] if pd.notna(latest['sma_5']) else 0,
+        'sma_10': latest['sma_10'] if pd.notna(latest['sma_10']) else 0,
+        'rsi': latest['rsi_14'] if pd.notna(latest['rsi_14']) else 50,
+        'price_change_pct': ((latest['close'] - first_close) / first_close) * 100 if len(df_price) > 1 and first_close != 0 else 0
     }
     
     return indicators
 
+@timed("figures.price_chart")
 def create_advanced_chart(df_price, stock_name, stock_id):
     """Create enhanced chart with technical indicators"""
     if df_price.empty:
         return None
     
-    # Calculate indicators
-    df_price['SMA_5'] = df_price['close'].rolling(window=5).mean()
-    df_price['SMA_10'] = df_price['close'].rolling(window=10).mean()
+    # Long ranges are aggregated to weekly/monthly candles to stay within the point budget
+    candles, interval = prepare_ohlc(df_price)
+
+    # Indicators come from the daily rows (without mutating the cached df_price) and are
+    # then sampled on the candle dates so the overlays line up with the bars
+    frame = resample_line(stock_indicator_frame(df_price)[['sma_5', 'sma_10']], interval)
+    sma_5 = frame['sma_5'].to_numpy()
+    sma_10 = frame['sma_10'].to_numpy()
+    interval_label = get_text(f'interval_{interval}')
     
     # Create subplots
     fig = make_subplots(
         rows=2, cols=1,
         row_heights=[0.7, 0.3],
-        subplot_titles=[f'{stock_name} ({stock_id}) - Price & Volume', 'Volume'],
+        subplot_titles=[f'{stock_name} ({stock_id}) - Price & Volume ({interval_label})', 'Volume'],
         vertical_spacing=0.05
     )
     
     # Candlestick chart
     fig.add_trace(go.Candlestick(
-        x=df_price["date"],
-        open=df_price["open"],
-        high=df_price["max"],
-        low=df_price["min"],
-        close=df_price["close"],
+        x=candles["date"],
+        open=candles["open"],
+        high=candles["max"],
+        low=candles["min"],
+        close=candles["close"],
         name="Price",
         increasing_line_color='#00ff88',
         decreasing_line_color='#ff3366'
     ), row=1, col=1)
     
-    # Moving averages
-    if not df_price['SMA_5'].isna().all():
-        fig.add_trace(go.Scatter(
-            x=df_price["date"],
-            y=df_price['SMA_5'],
-            name="SMA 5",
+    # Moving averages (decimated, WebGL when long)
+    if not np.isnan(sma_5).all():
+        fig.add_trace(line_trace(
+            frame.index,
+            sma_5,
+            "SMA 5",
             line=dict(color='orange', width=2)
         ), row=1, col=1)
     
-    if not df_price['SMA_10'].isna().all():
-        fig.add_trace(go.Scatter(
-            x=df_price["date"],
-            y=df_price['SMA_10'],
-            name="SMA 10",
+    if not np.isnan(sma_10).all():
+        fig.add_trace(line_trace(
+            frame.index,
+            sma_10,
+            "SMA 10",
             line=dict(color='purple', width=2)
         ), row=1, col=1)
     
     # Volume chart
     colors = ['#00ff88' if close >= open else '#ff3366' 
-              for close, open in zip(df_price['close'], df_price['open'])]
+              for close, open in zip(candles['close'], candles['open'])]
     
-    if 'Trading_Volume' in df_price.columns:
+    if 'Trading_Volume' in candles.columns:
         fig.add_trace(go.Bar(
-            x=df_price["date"],
-            y=df_price['Trading_Volume'],
+            x=candles["date"],
+            y=candles['Trading_Volume'],
             name="Volume",
             marker_color=colors,
             opacity=0.7
@@ -215,16 +251,54 @@ for key, default in {
         st.session_state[key] = default
 
 # Load data
-df_info = cached_stock_info()
+with span("load.stock_info"):
+    df_info = cached_stock_info()
 if df_info.empty:
     st.error("❌ No stock data available")
     st.stop()
 
 industry_options = load_industry_options()
 
+# --- Quick search by stock ID or name ---
+search_query = st.text_input(
+    get_text('search_stock'),
+    placeholder=get_text('search_stock_placeholder'),
+    key="stock_search"
+)
+if search_query.strip():
+    matches = load_search_index().search(search_query, limit=10)
+    if matches:
+        match_labels = {m["stock_id"]: f"{m['stock_id']} - {m['stock_name']} ({m['industry']})" for m in matches}
+        search_col1, search_col2 = st.columns([3, 1])
+        with search_col1:
+            search_pick = st.selectbox(
+                get_text('search_results'),
+                list(match_labels),
+                format_func=lambda x: match_labels[x],
+                label_visibility="collapsed",
+                key="search_pick"
+            )
+        with search_col2:
+            if st.button(f"{get_text('analyze_stock')} {search_pick}", key="search_analyze", use_container_width=True):
+                st.session_state.selected_stock = search_pick
+    else:
+        st.caption(get_text('search_no_results'))
+
 # --- Simplified Filters ---
 st.markdown(f"### {get_text('filter_options')}")
 
+mode_options = {
+    "browse": get_text('mode_browse'),
+    "screener": get_text('mode_screener')
+}
+filter_mode = st.radio(
+    get_text('filter_mode'),
+    list(mode_options.keys()),
+    format_func=lambda x: mode_options[x],
+    horizontal=True,
+    key="filter_mode"
+)
+
 # Simple layout without styled containers
 col1, col2, col3 = st.columns([2, 2, 1])
 
@@ -259,100 +333,201 @@ with col3:
 col1, col2 = st.columns([1, 1.5], gap="large")
 
 with col1:
-    # Filter stocks based on criteria
-    df_filtered = df_info.copy()
+    if filter_mode == "screener":
+        # Threshold queries over the precomputed indicators table (every listed stock)
+        st.markdown(f"### {get_text('filtered_stocks')}")
+
+        s1, s2 = st.columns(2)
+        with s1:
+            use_rsi = st.checkbox(get_text('screener_rsi_below'), key="scr_use_rsi")
+            rsi_max = st.slider(get_text('screener_rsi_below'), 0, 100, 30, disabled=not use_rsi,
+                                label_visibility="collapsed", key="scr_rsi_max")
+            above_sma_20 = st.checkbox(get_text('screener_above_sma20'), key="scr_above_sma20")
+        with s2:
+            use_volume = st.checkbox(get_text('screener_volume_spike'), key="scr_use_volume")
+            volume_spike = st.number_input(get_text('screener_volume_spike'), min_value=1.0, value=2.0, step=0.5,
+                                           disabled=not use_volume, label_visibility="collapsed", key="scr_volume")
+            return_days = st.selectbox(get_text('screener_return_days'), [None] + list(RETURN_WINDOWS),
+                                       format_func=lambda x: "—" if x is None else f"{x}D", key="scr_return_days")
+            return_min = st.number_input(get_text('screener_return_min'), value=5.0, step=1.0,
+                                         disabled=return_days is None, key="scr_return_min")
+
+        with span("load.screener_table"):
+            screener_df = cached_screener_table(store_version() + "|" + indicators_version())
+        if screener_df.empty:
+            st.info(get_text('screener_no_indicators'))
+        else:
+            sort_columns = {
+                "stock_id": ("stock_id", True),
+                "stock_name": ("stock_name", True),
+                "price": ("current_price", False),
+                "price_change": (f"return_{return_days or 20}d", False)
+            }
+            sort_column, ascending = sort_columns[st.session_state.sort_by]
+            criteria = dict(
+                rsi_max=rsi_max if use_rsi else None,
+                above_sma_20=above_sma_20,
+                volume_spike=volume_spike if use_volume else None,
+                return_days=return_days,
+                return_min=return_min if return_days else None,
+                industries=None if is_all_value(selected_industry) else [selected_industry],
+                sort_by=sort_column,
+                ascending=ascending
+            )
+
+            # The page widget is drawn after screening (it needs the match count), so read its last value
+            page_size = 25
+            page = st.session_state.get("scr_page", 1)
+            t0 = time.perf_counter()
+            results, total = screen_stocks(screener_df, page=page, page_size=page_size, **criteria)
+            elapsed_ms = (time.perf_counter() - t0) * 1000
+            record_span("compute.screen", t0)
+
+            total_pages = max(1, -(-total // page_size))
+            if page > total_pages:
+                # Fewer matches than before: screen_stocks already returned the last page
+                st.session_state.scr_page = total_pages
+            st.number_input(get_text('page'), min_value=1, max_value=total_pages, step=1, key="scr_page")
+
+            st.caption(get_text('screener_matches').format(
+                total=total, ms=elapsed_ms, date=pd.Timestamp(screener_df["date"].iloc[0]).strftime("%Y-%m-%d")
+            ))
+            if results.empty:
+                st.warning(get_text('no_matching_criteria'))
+            else:
+                display_columns = ["stock_id", "stock_name", "industry_category", "current_price",
+                                   "rsi_14", "sma_20", "volume_ratio", f"return_{return_days or 20}d"]
+                st.dataframe(
+                    results[display_columns].round(2),
+                    hide_index=True,
+                    use_container_width=True
+                )
+                page_names = dict(zip(results["stock_id"], results["stock_name"]))
+                pick = st.selectbox(
+                    get_text('analyze_stock'),
+                    list(page_names),
+                    format_func=lambda x: f"{x} - {page_names[x]}",
+                    key="scr_pick"
+                )
+                if st.button(f"{get_text('analyze_stock')} {pick}", key="scr_analyze", use_container_width=True):
+                    st.session_state.selected_stock = pick
+    else:
+        # Filter stocks based on criteria
+        df_filtered = df_info.copy()
     
-    if not is_all_value(selected_industry):
-        df_filtered = df_filtered[df_filtered["industry_category"] == selected_industry]
+        if not is_all_value(selected_industry):
+            df_filtered = df_filtered[df_filtered["industry_category"] == selected_industry]
     
-    # Create stock cards with enhanced information
-    st.markdown(f"### {get_text('filtered_stocks')}")
+        # Create stock cards with enhanced information
+        st.markdown(f"### {get_text('filtered_stocks')}")
     
-    if df_filtered.empty:
-        st.warning(get_text('no_matching_criteria'))
-    else:
-        # Add technical analysis for each stock
-        enhanced_stocks = []
-        
-        with st.spinner(get_text('analyzing_stocks')):
-            for _, row in df_filtered.head(20).iterrows():  # Limit to 20 for performance
-                stock_id = row["stock_id"]
-                try:
-                    df_price = cached_price(stock_id)
-                    if not df_price.empty and len(df_price) > 0:
-                        indicators = calculate_technical_indicators(df_price)
-                        
-                        # Only add stocks with valid price data
-                        if indicators.get('current_price', 0) > 0:
-                            enhanced_stock = {
-                                'stock_id': stock_id,
-                                'stock_name': row["stock_name"],
-                                'industry': row["industry_category"],
-                                **indicators
-                            }
-                            enhanced_stocks.append(enhanced_stock)
-                except Exception as e:
-                    # Skip stocks with data issues instead of adding empty entries
-                    continue
-        
-        # Apply additional filters
-        enhanced_df = pd.DataFrame(enhanced_stocks)
-        if enhanced_df.empty:
-            st.warning(get_text('no_valid_price_data'))
+        if df_filtered.empty:
+            st.warning(get_text('no_matching_criteria'))
         else:
-            # Only filter by industry (price and volume filters removed)
-            pass
+            # Rank every stock in the industry from the local price store (no per-stock network calls)
+            with span("load.price_snapshot"):
+                snapshot = cached_price_snapshot(store_version())
+            if not snapshot.empty:
+                enhanced_df = (
+                    df_filtered[["stock_id", "stock_name", "industry_category"]]
+                    .drop_duplicates(subset="stock_id")
+                    .rename(columns={"industry_category": "industry"})
+                    .merge(snapshot, on="stock_id", how="inner")
+                )
+                enhanced_df = enhanced_df[enhanced_df["current_price"] > 0]
+            else:
+                # Price store not ingested yet: fall back to per-stock API calls
+                enhanced_stocks = []
             
-            # Sort results
-            if st.session_state.sort_by == "price":
-                enhanced_df = enhanced_df.sort_values('current_price', ascending=False)
-            elif st.session_state.sort_by == "price_change":
-                enhanced_df = enhanced_df.sort_values('price_change_pct', ascending=False)
+                with st.spinner(get_text('analyzing_stocks')):
+                    for _, row in df_filtered.head(20).iterrows():  # Limit to 20 for performance
+                        stock_id = row["stock_id"]
+                        try:
+                            df_price = cached_price(stock_id)
+                            if not df_price.empty and len(df_price) > 0:
+                                indicators = calculate_technical_indicators(df_price)
+                            
+                                # Only add stocks with valid price data
+                                if indicators.get('current_price', 0) > 0:
+                                    enhanced_stock = {
+                                        'stock_id': stock_id,
+                                        'stock_name': row["stock_name"],
+                                        'industry': row["industry_category"],
+                                        **indicators
+                                    }
+                                    enhanced_stocks.append(enhanced_stock)
+                        except Exception as e:
+                            # Skip stocks with data issues instead of adding empty entries
+                            continue
+            
+                enhanced_df = pd.DataFrame(enhanced_stocks)
+
+            if enhanced_df.empty:
+                st.warning(get_text('no_valid_price_data'))
             else:
-                enhanced_df = enhanced_df.sort_values(st.session_state.sort_by)
+                # Only filter by industry (price and volume filters removed)
+                pass
             
-            # Display stock cards
-            for _, stock in enhanced_df.iterrows():
-                with st.container():
-                    # Handle infinite or invalid percentage values
-                    price_change_pct = stock['price_change_pct']
-                    if pd.isna(price_change_pct) or np.isinf(price_change_pct):
-                        price_change_pct = 0
-                        change_display = "N/A"
-                    else:
-                        change_display = f"{price_change_pct:+.2f}%"
+                # Sort results
+                if st.session_state.sort_by == "price":
+                    enhanced_df = enhanced_df.sort_values('current_price', ascending=False)
+                elif st.session_state.sort_by == "price_change":
+                    enhanced_df = enhanced_df.sort_values('price_change_pct', ascending=False)
+                else:
+                    enhanced_df = enhanced_df.sort_values(st.session_state.sort_by)
+
+                # Paginate the cards so a full industry stays responsive
+                page_size = 20
+                total_pages = max(1, -(-len(enhanced_df) // page_size))
+                page = st.number_input(get_text('page'), min_value=1, max_value=total_pages, value=1, step=1)
+                start = (page - 1) * page_size
+                st.caption(get_text('showing_stocks').format(
+                    start=start + 1, end=min(start + page_size, len(enhanced_df)), total=len(enhanced_df)
+                ))
+                enhanced_df = enhanced_df.iloc[start:start + page_size]
+            
+                # Display stock cards
+                for _, stock in enhanced_df.iterrows():
+                    with st.container():
+                        # Handle infinite or invalid percentage values
+                        price_change_pct = stock['price_change_pct']
+                        if pd.isna(price_change_pct) or np.isinf(price_change_pct):
+                            price_change_pct = 0
+                            change_display = "N/A"
+                        else:
+                            change_display = f"{price_change_pct:+.2f}%"
                     
-                    # Determine price change color (darker for better contrast on white background)
-                    change_color = "#28a745" if price_change_pct > 0 else "#dc3545" if price_change_pct < 0 else "#6c757d"
-                    arrow = "▲" if price_change_pct > 0 else "▼" if price_change_pct < 0 else "➖"
+                        # Determine price change color (darker for better contrast on white background)
+                        change_color = "#28a745" if price_change_pct > 0 else "#dc3545" if price_change_pct < 0 else "#6c757d"
+                        arrow = "▲" if price_change_pct > 0 else "▼" if price_change_pct < 0 else "➖"
                     
-                    # Handle price display
-                    current_price = stock.get('current_price', 0)
-                    if current_price <= 0:
-                        continue  # Skip stocks with invalid prices
+                        # Handle price display
+                        current_price = stock.get('current_price', 0)
+                        if current_price <= 0:
+                            continue  # Skip stocks with invalid prices
                     
-                    st.markdown(f"""
-                    <div class="stock-card">
-                        <div style="display: flex; justify-content: space-between; align-items: center;">
-                            <div>
-                                <h4 style="margin: 0; color: #2c3e50;">{stock['stock_id']} - {stock['stock_name']}</h4>
-                                <p style="margin: 5px 0; color: #7f8c8d; font-size: 0.9em;">{stock['industry']}</p>
-                                <small style="color: #999;">{get_text('volume_label')} {stock.get('volume', 0):,.0f}</small>
-                            </div>
-                            <div style="text-align: right;">
-                                <div style="font-size: 1.2em; font-weight: bold; color: {change_color};">
-                                    {arrow} {current_price:.2f} TWD
+                        st.markdown(f"""
+                        <div class="stock-card">
+                            <div style="display: flex; justify-content: space-between; align-items: center;">
+                                <div>
+                                    <h4 style="margin: 0; color: #2c3e50;">{stock['stock_id']} - {stock['stock_name']}</h4>
+                                    <p style="margin: 5px 0; color: #7f8c8d; font-size: 0.9em;">{stock['industry']}</p>
+                                    <small style="color: #999;">{get_text('volume_label')} {stock.get('volume', 0):,.0f}</small>
                                 </div>
-                                <div style="font-size: 0.9em; color: {change_color};">
-                                    {change_display}
+                                <div style="text-align: right;">
+                                    <div style="font-size: 1.2em; font-weight: bold; color: {change_color};">
+                                        {arrow} {current_price:.2f} TWD
+                                    </div>
+                                    <div style="font-size: 0.9em; color: {change_color};">
+                                        {change_display}
+                                    </div>
                                 </div>
                             </div>
                         </div>
-                    </div>
-                    """, unsafe_allow_html=True)
+                        """, unsafe_allow_html=True)
                     
-                    if st.button(f"{get_text('analyze_stock')} {stock['stock_id']}", key=f"analyze_{stock['stock_id']}", use_container_width=True):
-                        st.session_state.selected_stock = stock['stock_id']
+                        if st.button(f"{get_text('analyze_stock')} {stock['stock_id']}", key=f"analyze_{stock['stock_id']}", use_container_width=True):
+                            st.session_state.selected_stock = stock['stock_id']
 
 with col2:
     if 'selected_stock' in st.session_state and st.session_state.selected_stock:
@@ -360,7 +535,23 @@ with col2:
         
         # Get stock details
         stock_row = df_info[df_info["stock_id"] == selected_id].iloc[0]
-        df_price = cached_price(selected_id)
+
+        # Any lookback is served from the local price store
+        lookback_options = {
+            30: get_text('lookback_1m'),
+            90: get_text('lookback_3m'),
+            365: get_text('lookback_1y'),
+            1825: get_text('lookback_5y')
+        }
+        lookback_days = st.radio(
+            get_text('chart_range'),
+            list(lookback_options.keys()),
+            format_func=lambda x: lookback_options[x],
+            horizontal=True,
+            key="chart_lookback"
+        )
+        with span("load.price_history"):
+            df_price = cached_price_history(selected_id, lookback_days)
         
         if not df_price.empty:
             st.markdown(f"### {stock_row['stock_name']} ({selected_id})")
@@ -390,7 +581,7 @@ with col2:
             # Enhanced chart
             fig = create_advanced_chart(df_price, stock_row['stock_name'], selected_id)
             if fig:
-                st.plotly_chart(fig, use_container_width=True)
+                plotly_chart(fig, use_container_width=True)
             
             # Technical indicators
             indicators = calculate_technical_indicators(df_price)
@@ -429,67 +620,81 @@ with col2:
                     </div>
                     """, unsafe_allow_html=True)
             
-            # AI Analysis
+            # Company profile: instant lookup in the offline-generated profile store
+            current_lang = get_current_language()
+            st.markdown(f"#### {get_text('company_background')}")
+            profile = get_profile(selected_id, current_lang)
+            if profile:
+                st.markdown(f"""
+                <div style="background: #f8f9fa; padding: 1rem; border-radius: 10px; border-left: 4px solid #667eea; color: #333333;">
+                    {profile}
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.caption(get_text('no_stored_profile'))
+            
+            # AI Analysis (live LLM call, only on request)
             st.markdown(f"#### {get_text('ai_business_description')}")
-            company_name = stock_row["stock_name"]
-            industry = stock_row.get("industry_category", "N/A")
+            if st.button(get_text('run_ai_analysis'), key=f"ai_analysis_{selected_id}", use_container_width=True):
+                company_name = stock_row["stock_name"]
+                industry = stock_row.get("industry_category", "N/A")
             
-            current_lang = get_current_language()
-            if current_lang == 'zh':
-                prompt = f"""
-                分析台股公司'{company_name}'（代號{selected_id}）的投資價值。
-                行業：{industry}
-                目前股價：{latest_price:.2f} TWD
-                近期漲跌：{change_pct:+.2f}%
+                if current_lang == 'zh':
+                    prompt = f"""
+                    分析台股公司'{company_name}'（代號{selected_id}）的投資價值。
+                    行業：{industry}
+                    目前股價：{latest_price:.2f} TWD
+                    近期漲跌：{change_pct:+.2f}%
                 
-                請提供：
-                1. 公司業務簡介
-                2. 技術面分析
-                3. 投資建議
+                    請提供：
+                    1. 公司業務簡介
+                    2. 技術面分析
+                    3. 投資建議
                 
-                請用繁體中文回答，保持專業但易懂。
-                """
-            else:
-                prompt = f"""
-                Analyze the investment potential of Taiwan stock '{company_name}' (ID: {selected_id}).
-                Industry: {industry}
-                Current Price: {latest_price:.2f} TWD
-                Recent Change: {change_pct:+.2f}%
+                    請用繁體中文回答，保持專業但易懂。
+                    """
+                else:
+                    prompt = f"""
+                    Analyze the investment potential of Taiwan stock '{company_name}' (ID: {selected_id}).
+                    Industry: {industry}
+                    Current Price: {latest_price:.2f} TWD
+                    Recent Change: {change_pct:+.2f}%
                 
-                Please provide:
-                1. Company business overview
-                2. Technical analysis
-                3. Investment recommendation
+                    Please provide:
+                    1. Company business overview
+                    2. Technical analysis
+                    3. Investment recommendation
                 
-                Keep it professional but accessible.
-                """
+                    Keep it professional but accessible.
+                    """
             
-            with st.spinner(get_text('ai_analyzing')):
-                try:
-                    response = client.chat.completions.create(
-                        model="gpt-3.5-turbo",
-                        messages=[
-                            {"role": "system", "content": "You are a professional financial analyst."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        stream=True
-                    )
+                with st.spinner(get_text('ai_analyzing')):
+                    try:
+                        response = client.chat.completions.create(
+                            model="gpt-3.5-turbo",
+                            messages=[
+                                {"role": "system", "content": "You are a professional financial analyst."},
+                                {"role": "user", "content": prompt}
+                            ],
+                            stream=True
+                        )
                     
-                    analysis_text = ""
-                    analysis_container = st.empty()
+                        analysis_text = ""
+                        analysis_container = st.empty()
                     
-                    for chunk in response:
-                        content = chunk.choices[0].delta.content
-                        if content:
-                            analysis_text += content
-                            analysis_container.markdown(f"""
-                            <div style="background: #f8f9fa; padding: 1rem; border-radius: 10px; border-left: 4px solid #667eea; color: #333333;">
-                                {analysis_text}
-                            </div>
-                            """, unsafe_allow_html=True)
+                        for chunk in response:
+                            content = chunk.choices[0].delta.content
+                            if content:
+                                analysis_text += content
+                                analysis_container.markdown(f"""
+                                <div style="background: #f8f9fa; padding: 1rem; border-radius: 10px; border-left: 4px solid #667eea; color: #333333;">
+                                    {analysis_text}
+                                </div>
+                                """, unsafe_allow_html=True)
                             
-                except Exception as e:
-                    st.error(f"AI Analysis unavailable: {str(e)}")
+                    except Exception as e:
+                        st.error(f"AI Analysis unavailable: {str(e)}")
+        
         
         else:
             st.warning(get_text('no_price_data_available'))
@@ -505,4 +710,11 @@ with col2:
 # --- API Usage Display ---
 st.markdown("---")
 usage = get_api_usage(FINMIND_TOKEN)
-st.info(f"{get_text('finmind_api_remaining')} {usage}")
\ No newline at end of file
+st.info(f"{get_text('finmind_api_remaining')} {usage}")
+
+circuit = get_finmind_circuit_status()
+if circuit["state"] == "open":
+    st.caption(get_text('finmind_circuit_open').format(
+        reason=circuit["reason"],
+        minutes=max(1, circuit["retry_in_seconds"] // 60)
+    ))
\ No newline at end of file
@@ -11,6 +11,7 @@ from finmind_tools import (
     run_cashflow_column3_analysis 
 )
 from language_config import get_text
+from perf import plotly_chart
 
 # --- Load and pivot the CSV using the reusable tool ---
 try:
@@ -48,14 +49,14 @@ with col1:
         st.error(f"❌ Error in balance sheet analysis: {e}")
         st.stop()
 
-    st.plotly_chart(fig_bal_貿易百貨, use_container_width=True)
+    plotly_chart(fig_bal_貿易百貨, use_container_width=True)
 
     # --- Trend Charts ---
     st.markdown(f"#### {get_text('trend_charts_balance_sheet')}")
-    st.plotly_chart(fig1_貿易百貨, use_container_width=True)
-    st.plotly_chart(fig2_貿易百貨, use_container_width=True)
-    st.plotly_chart(fig3_貿易百貨, use_container_width=True)
-    st.plotly_chart(fig4_貿易百貨, use_container_width=True)
+    plotly_chart(fig1_貿易百貨, use_container_width=True)
+    plotly_chart(fig2_貿易百貨, use_container_width=True)
+    plotly_chart(fig3_貿易百貨, use_container_width=True)
+    plotly_chart(fig4_貿易百貨, use_container_width=True)
 
     # --- Ranking Table ---
     st.markdown(f"#### {get_text('ranked_metrics_top5_balance_sheet')}")
@@ -81,14 +82,14 @@ with col2:
         st.error(f"❌ Error in income statement analysis: {e}")
         st.stop()
 
-    st.plotly_chart(fig_inc_貿易百貨, use_container_width=True)
+    plotly_chart(fig_inc_貿易百貨, use_container_width=True)
 
     # --- Trend Charts ---
     st.markdown(f"#### {get_text('trend_charts_income_statement')}")
-    st.plotly_chart(fig5_貿易百貨, use_container_width=True)
-    st.plotly_chart(fig6_貿易百貨, use_container_width=True)
-    st.plotly_chart(fig7_貿易百貨, use_container_width=True)
-    st.plotly_chart(fig8_貿易百貨, use_container_width=True)
+    plotly_chart(fig5_貿易百貨, use_container_width=True)
+    plotly_chart(fig6_貿易百貨, use_container_width=True)
+    plotly_chart(fig7_貿易百貨, use_container_width=True)
+    plotly_chart(fig8_貿易百貨, use_container_width=True)
 
     # --- Ranking Table ---
     st.markdown(f"#### {get_text('ranked_metrics_top5_income_statement')}")
@@ -116,16 +117,16 @@ with col3:
         st.error(f"❌ Error in cash flow analysis: {e}")
         st.stop()
 
-    st.plotly_chart(fig_cf_貿易百貨, use_container_width=True)
+    plotly_chart(fig_cf_貿易百貨, use_container_width=True)
 
     # --- Trend Charts ---
     st.markdown(f"#### {get_text('trend_charts_cash_flow')}")
-    st.plotly_chart(fig9_貿易百貨, use_container_width=True)   # Free Cash Flow
-    st.plotly_chart(fig10_貿易百貨, use_container_width=True)  # Net Debt Change
-    st.plotly_chart(fig11_貿易百貨, use_container_width=True)  # Operating Cash Flow
-    st.plotly_chart(fig12_貿易百貨, use_container_width=True)  # CapEx
-    st.plotly_chart(fig13_貿易百貨, use_container_width=True)  # Debt Issued
-    st.plotly_chart(fig14_貿易百貨, use_container_width=True)  # Debt Repaid
+    plotly_chart(fig9_貿易百貨, use_container_width=True)   # Free Cash Flow
+    plotly_chart(fig10_貿易百貨, use_container_width=True)  # Net Debt Change
+    plotly_chart(fig11_貿易百貨, use_container_width=True)  # Operating Cash Flow
+    plotly_chart(fig12_貿易百貨, use_container_width=True)  # CapEx
+    plotly_chart(fig13_貿易百貨, use_container_width=True)  # Debt Issued
+    plotly_chart(fig14_貿易百貨, use_container_width=True)  # Debt Repaid
 
     # --- Ranking Table ---
     st.markdown(f"#### {get_text('ranked_metrics_top5_cash_flow')}")
@@ -2,21 +2,29 @@
 
 import streamlit as st
 import os
+import pandas as pd
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langchain.memory import ConversationBufferMemory
-from langchain.agents import create_openai_functions_agent, AgentExecutor
-from langchain_core.prompts import ChatPromptTemplate
-from finmind_tools import get_best_stock_for_industry, get_taiwan_stock_info, get_price_30days, get_api_quota_info, preload_all_industry_rankings
+from finmind_tools import get_api_quota_info, preload_all_industry_rankings, get_finmind_circuit_status, get_data_version
+from agent_core import (
+    AGENT_MODEL, EXPANDED_TURNS, MAX_SESSION_TURNS, PRESET_INDUSTRIES, SECTIONS, SECTIONS_CACHE_MODEL, SYNTHESIS_MAX_TOKENS, build_agent_prompt, pick_best_stock,
+    preset_question, route_question, build_section_prompts, build_synthesis_prompt, stream_sections,
+    create_llm, new_session_memory, prefetch_stock_panel, SessionMemory, with_history
+)
+from llm_cache import get_cached_answer, store_answer, replay_stream
+from history_store import find_answer, list_turns, save_turn
+from perf import plotly_chart, record_span, span
+from prompt_encoding import count_tokens
 import plotly.graph_objs as go
 import re
+import time
+import uuid
+from price_charts import prepare_ohlc
 from language_config import get_text, get_current_language
 
-# --- Preload all industry rankings for the agent ---
-if "industry_rankings_loaded" not in st.session_state:
-    with st.spinner("Loading industry data for agent..."):
-        preload_all_industry_rankings()
-    st.session_state.industry_rankings_loaded = True
+# --- Warm industry rankings for the agent ---
+# Loads from the disk cache or starts background workers shared by every session;
+# a question only waits for its own industry.
+preload_all_industry_rankings(wait=False)
 
 def clean_markdown_asterisks(text):
     """Remove markdown bold formatting asterisks from text"""
@@ -28,6 +36,45 @@ def clean_markdown_asterisks(text):
     text = re.sub(r'\*(.*?)\*', r'\1', text)
     return text
 
+def stream_sectioned_answer(question, industry, lang):
+    """
+    Section mode: the three ranking tables are analysed by concurrent LLM calls,
+    each rendered as it streams in, then a synthesis call writes the conclusion.
+    Returns (answer markdown, prompts sent).
+    """
+    section_prompts = build_section_prompts(industry, lang)
+    slots = {}
+    for key in section_prompts:
+        st.markdown(f"#### {get_text(SECTIONS[key][0])}")
+        slots[key] = st.empty()
+        slots[key].caption(get_text('section_generating'))
+    
+    section_texts = dict.fromkeys(section_prompts, "")
+    for key, text, _ in stream_sections(llm, section_prompts):
+        section_texts[key] = text
+        slots[key].markdown(text)
+    
+    st.markdown(f"#### {get_text('conclusion')}")
+    synthesis_prompt = build_synthesis_prompt(question, industry, section_texts, lang)
+    conclusion = st.write_stream(
+        chunk.content for chunk in llm.stream(synthesis_prompt, max_tokens=SYNTHESIS_MAX_TOKENS)
+    )
+    
+    answer = "\n\n".join(
+        f"#### {get_text(SECTIONS[key][0])}\n{text}" for key, text in section_texts.items()
+    )
+    answer += f"\n\n#### {get_text('conclusion')}\n{conclusion}"
+    return answer, [*section_prompts.values(), synthesis_prompt]
+
+def render_company_background(slot, description_future):
+    """Render the generated company description (or a fallback) into a placeholder"""
+    with slot.container():
+        st.markdown(f"##### {get_text('company_background')}")
+        try:
+            st.markdown(description_future.result())
+        except Exception:
+            st.markdown(f"*{clean_markdown_asterisks(st.session_state.best_stock_name)} (ID: {st.session_state.best_stock_id}) was selected as the top performer based on comprehensive financial analysis across balance sheet strength, profitability metrics, and cash flow performance.*")
+
 # --- Load API key ---
 load_dotenv()
 openai_api_key = os.getenv("OPENAI_API_KEY")
@@ -37,54 +84,37 @@ if not openai_api_key:
     st.stop()
 
 # --- Chatbot Setup ---
-llm = ChatOpenAI(
-    model_name="gpt-3.5-turbo",#"gpt-4o",
-    temperature=0,
-    api_key=openai_api_key,
-    streaming=True
-)
-memory = ConversationBufferMemory(memory_key="history", return_messages=True)
+@st.cache_resource(show_spinner=False)
+def load_agent_resources(api_key):
+    # Built once per process and shared by every session; the OpenAI client is safe for concurrent calls
+    return create_llm(api_key)
 
-tools = [get_best_stock_for_industry]
-
-prompt = ChatPromptTemplate.from_messages([
-    ("system", 
-"""
-You are a helpful financial assistant capable of analyzing stock metrics, rankings, and industry performance.
-
-You receive structured data for a given industry, including metrics like average ratios, margins, EPS, free cash flow, and a '% Passed' score for each category (balance sheet, income statement, cash flow).
-
-📌 '% Passed' reflects the **percentage of quarters (2020 to present)** where a stock met **all defined conditions** for that category.
-
-However, do **not focus solely on '% Passed'**. Use it as **one factor among many**. Your job is to analyze the stock **holistically** — balancing financial health (e.g. cash/debt, equity), profitability (e.g. margins, EPS), and cash flow strength.
-
-Summarize strengths and weaknesses clearly for each category, and then give a reasoned conclusion about the best stock in the industry.
-
-IMPORTANT: In your conclusion, clearly state which stock is the best choice using this format:
-"Based on the analysis, [StockName] (StockID) is the best stock in this industry because..."
-or "The best stock is [StockName] (StockID) due to..."
-
-Always include both the stock name and its 4-digit ID in parentheses when stating your final recommendation.
-"""
-),
-    ("human", "{input}"),
-    ("placeholder", "{agent_scratchpad}")
-])
-
-agent = create_openai_functions_agent(llm=llm, tools=tools, prompt=prompt)
-agent_executor = AgentExecutor(
-    agent=agent,
-    tools=tools,
-    memory=memory,
-    verbose=False,
-    return_intermediate_steps=False,
-    return_direct=True
-)
+llm = load_agent_resources(openai_api_key)
 
 # --- Session State ---
 if "chat_history" not in st.session_state:
     st.session_state.chat_history = []
 
+# Conversation memory is per session and bounded by a token budget; the shared LLM client never holds it
+if not isinstance(st.session_state.get("agent_memory"), SessionMemory):
+    st.session_state.agent_memory = new_session_memory()
+memory = st.session_state.agent_memory
+
+# Key of this session's turns in the persistent history. It is kept in the URL so a
+# reload continues the conversation: history and memory are rebuilt from the stored turns
+HISTORY_SESSION_PARAM = "chat"
+if "history_session_id" not in st.session_state:
+    session_id = st.query_params.get(HISTORY_SESSION_PARAM, "")
+    if re.fullmatch(r"[0-9a-f]{32}", session_id):
+        for turn in reversed(list_turns(session_id=session_id, limit=MAX_SESSION_TURNS)):
+            st.session_state.chat_history.append((turn["question"], turn["answer"]))
+            memory.add_turn(turn["question"], turn["answer"])
+    else:
+        session_id = uuid.uuid4().hex
+    st.session_state.history_session_id = session_id
+if st.query_params.get(HISTORY_SESSION_PARAM) != st.session_state.history_session_id:
+    st.query_params[HISTORY_SESSION_PARAM] = st.session_state.history_session_id
+
 if "user_input" not in st.session_state:
     st.session_state.user_input = ""
 
@@ -94,6 +124,9 @@ if "best_stock_id" not in st.session_state:
 if "best_stock_name" not in st.session_state:
     st.session_state.best_stock_name = None
 
+if "best_stock_industry" not in st.session_state:
+    st.session_state.best_stock_industry = ""
+
 if "page_initialized" not in st.session_state:
     st.session_state.page_initialized = False
 
@@ -217,6 +250,13 @@ if quota_info:
         </div>
         """, unsafe_allow_html=True)
 
+circuit = get_finmind_circuit_status()
+if circuit["state"] == "open" and not circuit["quota_exhausted"]:
+    st.caption(get_text('finmind_circuit_open').format(
+        reason=circuit["reason"],
+        minutes=max(1, circuit["retry_in_seconds"] // 60)
+    ))
+
 # --- Header Row (2 columns) ---
 header_col1, header_col2 = st.columns([1.0, 1.3])
 
@@ -242,7 +282,10 @@ col1, col2 = st.columns([1.0, 1.3])
 with col1:
     if st.button(get_text('clear_chat_history')):
         st.session_state.chat_history = []
-        memory.chat_memory.messages = []
+        memory.clear()
+        # A new conversation, so a reload does not bring the cleared turns back
+        st.session_state.history_session_id = uuid.uuid4().hex
+        st.query_params[HISTORY_SESSION_PARAM] = st.session_state.history_session_id
         st.session_state.user_input = ""
 
     # --- Clickable Prompt Buttons ---
@@ -263,12 +306,7 @@ with col1:
         st.markdown(f"### {get_text('example_prompts')}")
         
         # Organize prompts in a grid for better display
-        all_industries = [
-            "食品工業", "居家生活", "半導體業", "電子商務業",
-            "農業科技", "玻璃陶瓷", "水泥工業", "造紙工業", 
-            "運動休閒類", "橡膠工業", "油電燃氣業", "綠能環保類", 
-            "塑膠工業", "航運業", "文化創意業", "農業科技業", "觀光事業", "貿易百貨", "光電業", "生技醫療業"
-        ]
+        all_industries = PRESET_INDUSTRIES
         
         # Industry translation mapping for buttons
         industry_translation = {
@@ -305,16 +343,23 @@ with col1:
                 prompt_text = f"{get_text('best_stock_in')} {translated_industry}"
                 if cols[i].button(prompt_text, key=f"btn_{industry}"):
                     # But keep the Chinese name for the prompt since AI agent logic expects Chinese names
-                    chinese_prompt = f"{get_text('best_stock_in')} {industry}"
+                    chinese_prompt = preset_question(industry, get_current_language())
                     st.session_state.user_input = chinese_prompt
 
     # --- Main Input ---
+    parallel_sections = st.toggle(
+        get_text('parallel_sections'),
+        key="parallel_sections",
+        help=get_text('parallel_sections_help')
+    )
+    
     st.session_state.user_input = st.text_input(
         get_text('ask_question_placeholder'), 
         value=st.session_state.user_input, 
         key="text_input"
     )
 
+    pending_answer = None
     if st.session_state.user_input:
         # Show agent header first
         st.markdown(f"""
@@ -323,189 +368,51 @@ with col1:
         </div>
         """, unsafe_allow_html=True)
         
-        # Extract industry name from user input
+        # Build the prompt (industry detection + ranking tables) in the page language
         user_query = st.session_state.user_input
-        industry_name = ""
-        
-        # Try to extract industry from common patterns (Chinese and English)
-        industry_patterns = {
-            "食品工業": ["食品工業", "food industry", "food"],
-            "居家生活": ["居家生活", "home", "living"],
-            "半導體業": ["半導體業", "semiconductor"],
-            "電子商務業": ["電子商務業", "ecommerce", "e-commerce"],
-            "農業科技": ["農業科技", "agricultural technology", "agri tech"],
-            "玻璃陶瓷": ["玻璃陶瓷", "glass", "ceramics"],
-            "水泥工業": ["水泥工業", "cement"],
-            "造紙工業": ["造紙工業", "paper"],
-            "運動休閒類": ["運動休閒類", "sports", "leisure"],
-            "橡膠工業": ["橡膠工業", "rubber"],
-            "油電燃氣業": ["油電燃氣業", "oil", "gas", "utilities"],
-            "綠能環保類": ["綠能環保類", "green energy", "environmental"],
-            "塑膠工業": ["塑膠工業", "plastics"],
-            "航運業": ["航運業", "shipping"],
-            "文化創意業": ["文化創意業", "cultural", "creative"],
-            "農業科技業": ["農業科技業", "agricultural technology business"],
-            "觀光事業": ["觀光事業", "tourism", "travel", "hospitality", "hotel"],
-            "貿易百貨": ["貿易百貨", "trading", "department stores", "retail", "convenience"],
-            "光電業": ["光電業", "optoelectronics", "opto", "LED", "display", "optical", "photonics"],
-            "生技醫療業": ["生技醫療業", "biotechnology", "biotech", "medical", "pharmaceutical", "pharma", "healthcare", "bio", "medicine"]
-        }
-        
-        for industry_chinese, patterns in industry_patterns.items():
-            for pattern in patterns:
-                if pattern.lower() in user_query.lower():
-                    industry_name = industry_chinese
-                    break
-            if industry_name:
-                break
-        
-        # Get the tool result first (this provides the data to the LLM)
-        if industry_name:
-            tool_result = get_best_stock_for_industry(industry_name)
-        else:
-            tool_result = f"Could not identify specific industry from query: {user_query}"
-        
-        # Create language-aware system prompt
         current_lang = get_current_language()
-        
-        if current_lang == "zh":
-            system_prompt = """你是一位專業的金融分析師，能夠分析股票指標、排名和行業表現。
-
-你會收到特定行業的結構化數據，包括平均比率、利潤率、每股盈餘、自由現金流，以及各類別（資產負債表、損益表、現金流）的「通過百分比」。
-
-📌「通過百分比」反映了從2020年至今，該股票在各季度中**符合所有定義條件**的百分比。
-
-但是，**不要只關注「通過百分比」**。將其作為**眾多因素之一**。你的工作是**全面分析**股票——平衡財務健康（如現金/債務、股權）、盈利能力（如利潤率、每股盈餘）和現金流強度。
-
-請按照以下結構提供詳細分析：
-
-## 資產負債表分析
-分析每隻股票的財務健康狀況，包括現金/債務比率、負債/權益比率、通過百分比等，並說明各股票的優勢和劣勢。
-
-## 損益表分析  
-評估每隻股票的盈利能力，包括毛利率、淨利率、每股盈餘、通過百分比等，並比較各股票的表現。
-
-## 現金流分析
-檢視每隻股票的現金流強度，包括自由現金流、經營現金流、通過百分比等，並評估其現金產生能力。
-
-## 結論
-綜合所有分析，明確說明哪隻股票是最佳選擇，使用以下格式：
-"[股票名稱]（股票代號）是該行業最佳股票，因為..."
-或"最佳股票是[股票名稱]（股票代號），原因是..."
-
-重要格式要求：
-1. 絶對不要使用「我認為」、「我覺得」、「我想」、「我相信」等主觀表達
-2. 不要使用**粗體**格式
-3. 直接陳述事實和結論
-4. 在陳述最終推薦時，請務必同時包含股票名稱和4位數股票代號（括號內）
-
-請提供詳細且結構化的分析。"""
+        # Section mode only applies to industry questions; the same model key is used to
+        # look up a past answer and to store the new one
+        industry_hint = route_question(user_query)[0]
+        use_sections = parallel_sections and bool(industry_hint)
+        cache_model = SECTIONS_CACHE_MODEL if use_sections else AGENT_MODEL
+        # The same question over the same data was answered before: reuse it without building the prompt
+        past_turn = find_answer(user_query, current_lang, cache_model, get_data_version()) if industry_hint else None
+        if past_turn:
+            full_prompt, industry_name = "", past_turn["industry"]
+            best_id, best_name = past_turn["best_stock_id"], past_turn["best_stock_name"]
         else:
-            system_prompt = """You are a helpful financial assistant capable of analyzing stock metrics, rankings, and industry performance.
-
-You receive structured data for a given industry, including metrics like average ratios, margins, EPS, free cash flow, and a '% Passed' score for each category (balance sheet, income statement, cash flow).
-
-📌 '% Passed' reflects the **percentage of quarters (2020 to present)** where a stock met **all defined conditions** for that category.
-
-However, do **not focus solely on '% Passed'**. Use it as **one factor among many**. Your job is to analyze the stock **holistically** — balancing financial health (e.g. cash/debt, equity), profitability (e.g. margins, EPS), and cash flow strength.
-
-Summarize strengths and weaknesses clearly for each category, and then give a reasoned conclusion about the best stock in the industry.
-
-IMPORTANT: In your conclusion, clearly state which stock is the best choice using this format:
-"Based on the analysis, [StockName] (StockID) is the best stock in this industry because..."
-or "The best stock is [StockName] (StockID) due to..."
-
-Always include both the stock name and its 4-digit ID in parentheses when stating your final recommendation."""
-
-        full_prompt = f"""{system_prompt}
-
-User Question: {user_query}
-
-Industry Analysis Data:
-{tool_result}
-
-Please provide your analysis and recommendation:"""
-        
-        # Stream the LLM response directly
-        def generate_response():
-            for chunk in llm.stream(full_prompt):
-                yield chunk.content
-        
-        # Use Streamlit's write_stream for real streaming
-        response = st.write_stream(generate_response)
+            with span("compute.agent_prompt"):
+                full_prompt, industry_name = build_agent_prompt(user_query, current_lang)
+                # Pick the best stock deterministically so the right panel renders before the LLM streams
+                best_id, best_name = pick_best_stock(industry_name) if industry_name else (None, None)
+            if not industry_name:
+                # Comparisons and industries without rankings are answered by the single call
+                use_sections, cache_model = False, AGENT_MODEL
         
-        # Add to chat history and memory
-        st.session_state.chat_history.append((st.session_state.user_input, response))
-        memory.chat_memory.add_user_message(st.session_state.user_input)
-        memory.chat_memory.add_ai_message(response)
+        if best_id:
+            st.session_state.best_stock_id = best_id
+            st.session_state.best_stock_name = best_name
+            st.session_state.best_stock_industry = industry_name
+            # Start the right-panel fetches now so they overlap with the answer stream
+            prefetch_stock_panel(llm, best_id, best_name, industry_name, current_lang)
         
-        # Extract the best stock from response
-        # Look for patterns like "best stock is", "recommend", "top pick", "#1", or conclusion section
-        # Include both English and Chinese patterns
-        best_stock_patterns = [
-            # English patterns
-            r'(?:best stock|top pick|recommend|#1|number one|winner)(?:\s+is)?[:\s]+([^\s]+)\s*\((\d{4})\)',
-            r'(?:conclusion|overall|final recommendation)[:\s\S]*?([^\s]+)\s*\((\d{4})\)',
-            r'(\w+)\s*\((\d{4})\)(?:\s+is|stands out as)?\s+(?:the best|top|recommended)',
-            r'(?:I recommend|would recommend|choose)\s+([^\s]+)\s*\((\d{4})\)',
-            r'([^\s]+)\s*\((\d{4})\)\s+(?:emerges|appears|seems)?\s*(?:as|to be)?\s*(?:the)?\s*(?:best|strongest|top)',
-            # Chinese patterns
-            r'(?:基於分析|最佳股票是|推薦|建議)[，,：:\s]*([^\s，,（\(]+)\s*[（\(](\d{4})[）\)]',
-            r'(?:結論|總結|綜合)[：:\s\S]*?([^\s，,（\(]+)\s*[（\(](\d{4})[）\)]',
-            r'([^\s，,（\(]+)\s*[（\(](\d{4})[）\)]\s*(?:是|為)?(?:該行業)?(?:最佳|最好|首選)',
-            r'(?:我推薦|建議選擇|選擇)\s*([^\s，,（\(]+)\s*[（\(](\d{4})[）\)]'
-        ]
-        
-        stock_found = False
-        for pattern in best_stock_patterns:
-            matches = re.findall(pattern, response, re.IGNORECASE)
-            if matches:
-                # Get the last match (likely in conclusion)
-                stock_name, stock_id = matches[-1]
-                # Clean the stock name of any subjective phrases and markdown
-                stock_name = stock_name.replace("我認為", "").replace("我覺得", "").replace("我想", "").replace("我相信", "")
-                stock_name = clean_markdown_asterisks(stock_name)
-                stock_name = stock_name.strip()
-                st.session_state.best_stock_id = stock_id
-                st.session_state.best_stock_name = stock_name
-                stock_found = True
-                break
-        
-        # Fallback: look for any stock ID in conclusion section (both English and Chinese)
-        if not stock_found:
-            conclusion_match = re.search(r'(?:conclusion|overall|summary|結論|總結|綜合)[:\s\S]*', response, re.IGNORECASE)
-            if conclusion_match:
-                conclusion_text = conclusion_match.group()
-                # Look for pattern: CompanyName (1234) in both English and Chinese contexts
-                stock_matches = re.findall(r'([^\s，,（\(]+)\s*[（\(](\d{4})[）\)]', conclusion_text)
-                if stock_matches:
-                    stock_name, stock_id = stock_matches[0]  # Take first stock in conclusion
-                    # Clean the stock name
-                    stock_name = stock_name.replace("我認為", "").replace("我覺得", "").replace("我想", "").replace("我相信", "")
-                    stock_name = clean_markdown_asterisks(stock_name)
-                    stock_name = stock_name.strip()
-                    st.session_state.best_stock_id = stock_id
-                    st.session_state.best_stock_name = stock_name
-                    stock_found = True
-        
-        # Last fallback: find the first mentioned stock with ID (handle both English and Chinese punctuation)
-        if not stock_found:
-            first_stock = re.search(r'([^\s，,（\(]+)\s*[（\(](\d{4})[）\)]', response)
-            if first_stock:
-                stock_name = first_stock.group(1)
-                # Clean the stock name
-                stock_name = stock_name.replace("我認為", "").replace("我覺得", "").replace("我想", "").replace("我相信", "")
-                stock_name = clean_markdown_asterisks(stock_name)
-                stock_name = stock_name.strip()
-                st.session_state.best_stock_id = first_stock.group(2)
-                st.session_state.best_stock_name = stock_name
+        # The answer is streamed into this container once the right panel is drawn
+        answer_container = st.container()
+        pending_answer = (
+            st.session_state.user_input, full_prompt, industry_name, current_lang, use_sections, cache_model,
+            past_turn["answer"] if past_turn else None
+        )
         
         st.session_state.user_input = ""  # Clear after use
 
     # Show chat history (exclude the most recent entry which is already being streamed above)
-    chat_to_display = st.session_state.chat_history[:-1] if st.session_state.chat_history else []
+    if pending_answer:
+        chat_to_display = st.session_state.chat_history
+    else:
+        chat_to_display = st.session_state.chat_history[:-1] if st.session_state.chat_history else []
     
-    for q, a in reversed(chat_to_display):
+    def render_turn(q, a):
         # User message
         st.markdown(f"""
         <div class="chat-message user-message">
@@ -523,14 +430,68 @@ Please provide your analysis and recommendation:"""
         # Use a clean expander-like container for the response
         with st.container():
             st.markdown(a)
+    
+    # Only the latest turns are rendered on every rerun; older ones are drawn on request
+    recent_turns = chat_to_display[-EXPANDED_TURNS:]
+    older_turns = chat_to_display[:-EXPANDED_TURNS]
+    for q, a in reversed(recent_turns):
+        render_turn(q, a)
+    
+    if older_turns and st.toggle(get_text('show_earlier_turns').format(n=len(older_turns)), key="show_earlier_turns"):
+        for q, a in reversed(older_turns):
+            render_turn(q, a)
+    
+    # --- Past answers (persistent history) ---
+    # Queried only while the toggle is on, so ordinary reruns do not touch the database
+    if st.toggle(get_text('past_answers'), key="show_past_answers"):
+        history_query = st.text_input(
+            get_text('search_past_answers'),
+            placeholder=get_text('search_past_answers_placeholder'),
+            key="history_query"
+        )
+        # This session's turns; other sessions' turns only if they are reusable industry answers
+        shared_industry = st.checkbox(get_text('include_shared_answers'), key="history_shared")
+        past_turns = list_turns(query=history_query, session_id=st.session_state.history_session_id,
+                                shared_industry=shared_industry, limit=20)
+        if not past_turns:
+            st.caption(get_text('no_past_answers'))
+        else:
+            def format_past_turn(i):
+                turn = past_turns[i]
+                best = f" · {turn['best_stock_name']} ({turn['best_stock_id']})" if turn['best_stock_id'] else ""
+                return f"{turn['created_at'][:16].replace('T', ' ')} · {turn['question'][:60]}{best}"
+            
+            selected = st.selectbox(
+                get_text('past_answers'),
+                range(len(past_turns)),
+                format_func=format_past_turn,
+                key="past_answer_choice",
+                label_visibility="collapsed"
+            )
+            past = past_turns[selected]
+            st.caption(" · ".join(filter(None, [past['industry'], past['data_version'], past['model']])))
+            st.markdown(past['answer'])
 
 with col2:
+    pending_description = None
     if st.session_state.best_stock_id:
+        # Price, stock info and description run concurrently (usually already started above)
+        panel = prefetch_stock_panel(
+            llm,
+            st.session_state.best_stock_id,
+            st.session_state.best_stock_name,
+            st.session_state.best_stock_industry,
+            get_current_language()
+        )
+        
         # Display stock info
         st.markdown(f"### 🏢 {clean_markdown_asterisks(st.session_state.best_stock_name)} ({st.session_state.best_stock_id})")
         
         # Get and display price data
-        df_price = get_price_30days(st.session_state.best_stock_id)
+        try:
+            df_price = panel["price"].result()
+        except Exception:
+            df_price = pd.DataFrame()
         
         if not df_price.empty:
             # Latest price info
@@ -550,13 +511,14 @@ with col2:
             
             # Candlestick chart
             st.markdown(f"#### {get_text('price_chart_30_days')}")
+            candles, _ = prepare_ohlc(df_price)
             fig = go.Figure()
             fig.add_trace(go.Candlestick(
-                x=df_price["date"],
-                open=df_price["open"],
-                high=df_price["max"],
-                low=df_price["min"],
-                close=df_price["close"],
+                x=candles["date"],
+                open=candles["open"],
+                high=candles["max"],
+                low=candles["min"],
+                close=candles["close"],
                 name="Price"
             ))
             fig.update_layout(
@@ -566,7 +528,7 @@ with col2:
                 xaxis_rangeslider_visible=False,
                 showlegend=False
             )
-            st.plotly_chart(fig, use_container_width=True)
+            plotly_chart(fig, use_container_width=True)
         else:
             # Show a warning about API limits but still show company info
             st.warning(get_text('price_data_unavailable'))
@@ -576,8 +538,11 @@ with col2:
         st.info(f"{get_text('company')} {clean_markdown_asterisks(st.session_state.best_stock_name)}")
         st.info(f"{get_text('stock_id')} {st.session_state.best_stock_id}")
         
-        # Try to get industry from local database
-        stock_info_df = get_taiwan_stock_info()
+        # Industry from the stock info list (shared, refreshed daily)
+        try:
+            stock_info_df = panel["stock_info"].result()
+        except Exception:
+            stock_info_df = pd.DataFrame()
         industry = "N/A"
         if not stock_info_df.empty:
             company_row = stock_info_df[stock_info_df['stock_id'] == st.session_state.best_stock_id]
@@ -587,71 +552,74 @@ with col2:
         if industry != "N/A":
             st.info(f"{get_text('industry')} {industry}")
         
-        # Always use OpenAI to generate company description
-        try:
-            current_lang = get_current_language()
+        # Company description: shown now if ready, otherwise filled in after the answer stream
+        description_slot = st.empty()
+        if panel["description"].done():
+            render_company_background(description_slot, panel["description"])
+        else:
+            description_slot.caption(get_text('generating_company_description'))
+            pending_description = (description_slot, panel["description"])
+    else:
+        st.info(get_text('ask_about_best_stock'))
+
+# --- Stream the agent answer (after the right panel so it is not blocked by the LLM) ---
+if pending_answer:
+    question, full_prompt, industry_name, current_lang, use_sections, cache_model, past_answer = pending_answer
+    answer_started = time.perf_counter()
+    with answer_container:
+        # Identical questions over the same data are answered from the disk cache
+        data_version = get_data_version()
+        cached_answer = past_answer or (
+            get_cached_answer(full_prompt, cache_model, current_lang, data_version) if industry_name else None
+        )
+        
+        prompts_sent = [full_prompt]
+        if cached_answer:
+            response = st.write_stream(replay_stream(cached_answer))
+        elif use_sections:
+            response, prompts_sent = stream_sectioned_answer(question, industry_name, current_lang)
+            store_answer(full_prompt, cache_model, current_lang, data_version, response)
+        else:
+            # Industry answers are cached per prompt and stay stateless; other questions
+            # (comparisons, follow-ups) get the conversation so far from the session memory
+            llm_input = full_prompt if industry_name else with_history(full_prompt, memory)
+            if not industry_name:
+                prompts_sent = [message.content for message in llm_input]
             
-            if current_lang == "zh":
-                if industry != "N/A":
-                    prompt = f"""
-                    簡要描述{st.session_state.best_stock_name}（台股代號：{st.session_state.best_stock_id}）的業務內容。
-                    該公司屬於{industry}行業。
-                    請用2-3句話提供簡潔的公司背景和主要業務活動。
-                    重點介紹公司主要業務、產品/服務和市場地位。
-                    
-                    重要規則：
-                    1. 請直接陳述事實，絕對不要使用「我認為」、「我覺得」、「我想」、「我相信」等主觀表達
-                    2. 直接以公司名稱開頭，例如：「{st.session_state.best_stock_name}是...」
-                    3. 不要使用任何markdown格式（如**粗體**）
-                    
-                    請用繁體中文回答。
-                    """
-                else:
-                    prompt = f"""
-                    簡要描述{st.session_state.best_stock_name}（台股代號：{st.session_state.best_stock_id}）的業務內容。
-                    這是一家台灣公司。請用2-3句話提供簡潔的公司背景和主要業務活動。
-                    重點介紹公司主要業務、產品/服務和市場地位。
-                    
-                    重要規則：
-                    1. 請直接陳述事實，絕對不要使用「我認為」、「我覺得」、「我想」、「我相信」等主觀表達
-                    2. 直接以公司名稱開頭，例如：「{st.session_state.best_stock_name}是...」
-                    3. 不要使用任何markdown格式（如**粗體**）
-                    
-                    請用繁體中文回答。
-                    """
-            else:
-                if industry != "N/A":
-                    prompt = f"""
-                    Briefly describe what {st.session_state.best_stock_name} (Taiwan stock ID: {st.session_state.best_stock_id}) does.
-                    The company is in the {industry} industry sector. 
-                    Provide a concise company background and main business activities in 2-3 sentences.
-                    Focus on what the company does, their main products/services, and market position.
-                    """
-                else:
-                    prompt = f"""
-                    Briefly describe what {st.session_state.best_stock_name} (Taiwan stock ID: {st.session_state.best_stock_id}) does.
-                    This is a Taiwanese company. Provide a concise company background and main business activities in 2-3 sentences.
-                    Focus on what the company does, their main products/services, and market position.
-                    """
+            # Stream the LLM response directly
+            def generate_response():
+                for chunk in llm.stream(llm_input):
+                    yield chunk.content
             
-            with st.spinner(get_text('generating_company_description')):
-                response = llm.invoke(prompt)
-                st.markdown(f"##### {get_text('company_background')}")
-                # Clean the response to remove unwanted phrases and markdown
-                cleaned_response = response.content
-                # Remove variations of "我認為" and similar subjective phrases
-                cleaned_response = cleaned_response.replace("我認為", "")
-                cleaned_response = cleaned_response.replace("我覺得", "")
-                cleaned_response = cleaned_response.replace("我想", "")
-                cleaned_response = cleaned_response.replace("我相信", "")
-                # Also clean any markdown asterisks
-                cleaned_response = clean_markdown_asterisks(cleaned_response)
-                # Clean up any leading/trailing whitespace
-                cleaned_response = cleaned_response.strip()
-                st.markdown(cleaned_response)
-                
-        except Exception as e:
-            st.markdown(f"##### {get_text('company_background')}")
-            st.markdown(f"*{clean_markdown_asterisks(st.session_state.best_stock_name)} (ID: {st.session_state.best_stock_id}) was selected as the top performer based on comprehensive financial analysis across balance sheet strength, profitability metrics, and cash flow performance.*")
-    else:
-        st.info(get_text('ask_about_best_stock'))
\ No newline at end of file
+            # Use Streamlit's write_stream for real streaming
+            response = st.write_stream(generate_response)
+            if industry_name:
+                store_answer(full_prompt, cache_model, current_lang, data_version, response)
+        
+        # Token usage of this request (cache hits make no API call)
+        usage_key = 'token_usage_cached' if cached_answer else 'token_usage'
+        st.caption(get_text(usage_key).format(
+            prompt=sum(count_tokens(p, AGENT_MODEL) for p in prompts_sent),
+            completion=count_tokens(response, AGENT_MODEL)
+        ))
+    
+    record_span("llm.answer", answer_started)
+    
+    # Add to chat history and memory
+    st.session_state.chat_history.append((question, response))
+    del st.session_state.chat_history[:-MAX_SESSION_TURNS]
+    memory.add_turn(question, response)
+    
+    # Persist the turn so it survives reloads and can be searched and reused; a reused
+    # past answer is already stored
+    if not past_answer:
+        save_turn(
+            st.session_state.history_session_id, question, response, current_lang, cache_model, data_version,
+            industry=industry_name,
+            best_stock_id=st.session_state.best_stock_id if industry_name else None,
+            best_stock_name=st.session_state.best_stock_name if industry_name else None
+        )
+
+# --- Company description, if it was still generating when the right panel rendered ---
+if pending_description:
+    render_company_background(*pending_description)
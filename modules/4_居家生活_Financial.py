@@ -11,6 +11,7 @@ from finmind_tools import (
     run_cashflow_column3_analysis 
 )
 from language_config import get_text
+from perf import plotly_chart
 
 # --- Load and pivot the CSV using the reusable tool ---
 try:
@@ -40,14 +41,14 @@ with col1:
     fig4_居家生活 = results_居家生活["fig4"]
     ranking_bal_居家生活 = results_居家生活["ranking_df"]
 
-    st.plotly_chart(fig_bal_居家生活, use_container_width=True)
+    plotly_chart(fig_bal_居家生活, use_container_width=True)
 
     # --- Trend Charts ---
     st.markdown(f"#### {get_text('trend_charts_balance_sheet')}")
-    st.plotly_chart(fig1_居家生活, use_container_width=True)
-    st.plotly_chart(fig2_居家生活, use_container_width=True)
-    st.plotly_chart(fig3_居家生活, use_container_width=True)
-    st.plotly_chart(fig4_居家生活, use_container_width=True)
+    plotly_chart(fig1_居家生活, use_container_width=True)
+    plotly_chart(fig2_居家生活, use_container_width=True)
+    plotly_chart(fig3_居家生活, use_container_width=True)
+    plotly_chart(fig4_居家生活, use_container_width=True)
 
     # --- Ranking Table ---
     st.markdown(f"#### {get_text('ranked_metrics_top5_balance_sheet')}")
@@ -72,14 +73,14 @@ with col2:
     ranking_inc_居家生活 = results_inc_居家生活["ranking_inc"]
 
     # --- Show Plotly Heatmap ---
-    st.plotly_chart(fig_income_居家生活, use_container_width=True)
+    plotly_chart(fig_income_居家生活, use_container_width=True)
 
     # --- Trend Charts ---
     st.markdown(f"#### {get_text('trend_charts_income_statement')}")
-    st.plotly_chart(fig1_居家生活, use_container_width=True)
-    st.plotly_chart(fig2_居家生活, use_container_width=True)
-    st.plotly_chart(fig3_居家生活, use_container_width=True)
-    st.plotly_chart(fig4_居家生活, use_container_width=True)
+    plotly_chart(fig1_居家生活, use_container_width=True)
+    plotly_chart(fig2_居家生活, use_container_width=True)
+    plotly_chart(fig3_居家生活, use_container_width=True)
+    plotly_chart(fig4_居家生活, use_container_width=True)
 
     # --- Ranking Table ---
     st.markdown(f"#### {get_text('ranked_metrics_top5_income_statement')}")
@@ -94,16 +95,16 @@ with col3:
     results_cf_居家生活 = run_cashflow_column3_analysis(df_original_居家生活.copy())
 
     # --- Heatmap ---
-    st.plotly_chart(results_cf_居家生活["fig_heatmap"], use_container_width=True)
+    plotly_chart(results_cf_居家生活["fig_heatmap"], use_container_width=True)
 
     # --- Trend Charts ---
     st.markdown(f"#### {get_text('trend_charts_cash_flow')}")
-    st.plotly_chart(results_cf_居家生活["fig1"], use_container_width=True)
-    st.plotly_chart(results_cf_居家生活["fig2"], use_container_width=True)
-    st.plotly_chart(results_cf_居家生活["fig3"], use_container_width=True)
-    st.plotly_chart(results_cf_居家生活["fig4"], use_container_width=True)
-    st.plotly_chart(results_cf_居家生活["fig5"], use_container_width=True)
-    st.plotly_chart(results_cf_居家生活["fig6"], use_container_width=True)
+    plotly_chart(results_cf_居家生活["fig1"], use_container_width=True)
+    plotly_chart(results_cf_居家生活["fig2"], use_container_width=True)
+    plotly_chart(results_cf_居家生活["fig3"], use_container_width=True)
+    plotly_chart(results_cf_居家生活["fig4"], use_container_width=True)
+    plotly_chart(results_cf_居家生活["fig5"], use_container_width=True)
+    plotly_chart(results_cf_居家生活["fig6"], use_container_width=True)
 
     # --- Ranking Table ---
     st.markdown(f"#### {get_text('ranked_metrics_top5_cash_flow')}")
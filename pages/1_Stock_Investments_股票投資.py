@@ -2,6 +2,7 @@
 
 import streamlit as st
 from language_config import get_text, create_language_selector, create_sidebar_navigation
+from perf import rerun
 
 # Set page config with default title (will be overridden by sidebar)
 st.set_page_config(page_title="Stock Investments", layout="wide")
@@ -119,12 +120,14 @@ tab_info = [
 if st.session_state.current_tab_key == "stock_filter":
     st.markdown(f"### {get_text('stock_filter')}")
     st.markdown("---")
-    exec(open("modules/1_Stock_Filter_Enhanced.py").read())
+    with rerun("stock_filter"):
+        exec(open("modules/1_Stock_Filter_Enhanced.py").read())
     st.stop()
 elif st.session_state.current_tab_key == "ai_stock_agent":
     st.markdown(f"### {get_text('ai_stock_agent')}")
     st.markdown("---")
-    exec(open("modules/2_Stock_Agent.py").read())
+    with rerun("ai_stock_agent"):
+        exec(open("modules/2_Stock_Agent.py").read())
     st.stop()
 
 # Create manual tab system with session state preservation
@@ -164,11 +167,13 @@ if selected_tab_id != st.session_state.current_tab_key:
 
 # Execute the selected module
 selected_module_path = tab_info[selected_tab_index][2]
-try:
-    st.markdown("---")
-    exec(open(selected_module_path).read())
-except Exception as e:
-    st.error(f"{get_text('error_loading_module')} {selected_tab_name}: {str(e)}")
+# st.stop() inside a module (e.g. a missing CSV) is not an Exception; rerun() still closes the run
+with rerun(f"industry/{selected_tab_id}"):
+    try:
+        st.markdown("---")
+        exec(open(selected_module_path).read())
+    except Exception as e:
+        st.error(f"{get_text('error_loading_module')} {selected_tab_name}: {str(e)}")
 
 # Custom CSS for better radio button styling to look like tabs - MAIN CONTENT ONLY
 st.markdown("""
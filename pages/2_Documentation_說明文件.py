@@ -5,6 +5,7 @@ import os
 import glob
 from datetime import datetime
 from language_config import get_text, get_current_language, create_sidebar_navigation
+from perf import rerun
 
 def get_latest_data_update():
     """Get the latest modification date from data files"""
@@ -46,43 +47,43 @@ st.set_page_config(
 
 # Add sidebar navigation
 create_sidebar_navigation()
+with rerun("documentation"):
+    # Get current language
+    current_lang = get_current_language()
 
-# Get current language
-current_lang = get_current_language()
+    # Get latest data update dates
+    zh_update_date, en_update_date = get_latest_data_update()
 
-# Get latest data update dates
-zh_update_date, en_update_date = get_latest_data_update()
-
-# Main title
-if current_lang == "zh":
-    st.title("📚 應用程式說明文件")
-    st.markdown("### 瞭解此財務分析平台的運作原理")
-else:
-    st.title("📚 Application Documentation")
-    st.markdown("### Understanding How This Financial Analysis Platform Works")
-
-# Create tabs for different sections
-if current_lang == "zh":
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "🎯 概述", 
-        "📊 財務分析邏輯", 
-        "🤖 AI整合", 
-        "💾 資料來源與限制",
-        "🚀 技術架構"
-    ])
-else:
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "🎯 Overview", 
-        "📊 Financial Analysis Logic", 
-        "🤖 AI Integration", 
-        "💾 Data Sources & Limitations",
-        "🚀 Technical Architecture"
-    ])
+    # Main title
+    if current_lang == "zh":
+        st.title("📚 應用程式說明文件")
+        st.markdown("### 瞭解此財務分析平台的運作原理")
+    else:
+        st.title("📚 Application Documentation")
+        st.markdown("### Understanding How This Financial Analysis Platform Works")
 
-# Tab 1: Overview
-with tab1:
+    # Create tabs for different sections
     if current_lang == "zh":
-        st.markdown("""
+        tab1, tab2, tab3, tab4, tab5 = st.tabs([
+            "🎯 概述", 
+            "📊 財務分析邏輯", 
+            "🤖 AI整合", 
+            "💾 資料來源與限制",
+            "🚀 技術架構"
+        ])
+    else:
+        tab1, tab2, tab3, tab4, tab5 = st.tabs([
+            "🎯 Overview", 
+            "📊 Financial Analysis Logic", 
+            "🤖 AI Integration", 
+            "💾 Data Sources & Limitations",
+            "🚀 Technical Architecture"
+        ])
+
+    # Tab 1: Overview
+    with tab1:
+        if current_lang == "zh":
+            st.markdown("""
         ## 應用程式概述
         
         這是一個專為台灣股市設計的智能財務分析平台，結合了傳統的價值投資理論與現代AI技術。
@@ -109,8 +110,8 @@ with tab1:
         - 財務分析師需要快速產業概覽
         - 對台股有興趣的研究人員
         """)
-    else:
-        st.markdown("""
+        else:
+            st.markdown("""
         ## Application Overview
         
         This is an intelligent financial analysis platform designed specifically for the Taiwan stock market, 
@@ -139,10 +140,10 @@ with tab1:
         - Researchers interested in Taiwan's stock market
         """)
 
-# Tab 2: Financial Analysis Logic
-with tab2:
-    if current_lang == "zh":
-        st.markdown("""
+    # Tab 2: Financial Analysis Logic
+    with tab2:
+        if current_lang == "zh":
+            st.markdown("""
         ## 財務分析邏輯
         
         ### 1. 巴菲特資產負債表規則 📊
@@ -190,8 +191,8 @@ with tab2:
         2. 絕對財務數值（如淨資產、淨利潤）
         3. 關鍵比率（如ROE、ROA）
         """)
-    else:
-        st.markdown("""
+        else:
+            st.markdown("""
         ## Financial Analysis Logic
         
         ### 1. Buffett Balance Sheet Rules 📊
@@ -240,10 +241,10 @@ with tab2:
         3. Key Ratios (e.g., ROE, ROA)
         """)
 
-# Tab 3: AI Integration
-with tab3:
-    if current_lang == "zh":
-        st.markdown("""
+    # Tab 3: AI Integration
+    with tab3:
+        if current_lang == "zh":
+            st.markdown("""
         ## AI整合架構
         
         ### 1. GPT-3.5 整合 🧠
@@ -262,8 +263,9 @@ with tab3:
         
         **工具鏈：**
         - `get_best_stock_for_industry`: 擷取產業排名資料
-        - `ConversationBufferMemory`: 維護對話上下文
-        - `create_openai_functions_agent`: 函數調用能力
+        - `get_financial_statements`: 單一股票的季度財務報表摘要
+        - `SessionMemory`: 以 token 預算維護對話上下文，較早的對話自動摘要
+        - `compare_stocks`: 跨產業比較多檔股票
         
         **提示工程：**
         - 系統提示包含財務分析指導原則
@@ -294,8 +296,8 @@ with tab3:
         - 中文: `基於分析|最佳股票是|結論`
         - 自動擷取股票代號與名稱
         """)
-    else:
-        st.markdown("""
+        else:
+            st.markdown("""
         ## AI Integration Architecture
         
         ### 1. GPT-3.5 Integration 🧠
@@ -314,8 +316,9 @@ with tab3:
         
         **Tool Chain:**
         - `get_best_stock_for_industry`: Retrieve industry ranking data
-        - `ConversationBufferMemory`: Maintain conversation context
-        - `create_openai_functions_agent`: Function calling capabilities
+        - `get_financial_statements`: Quarterly statement summary of a single stock
+        - `SessionMemory`: Token-budgeted conversation context; older turns are summarised
+        - `compare_stocks`: Cross-industry comparison of several stocks
         
         **Prompt Engineering:**
         - System prompts contain financial analysis guidelines
@@ -347,10 +350,10 @@ with tab3:
         - Automatic extraction of stock ID and name
         """)
 
-# Tab 4: Data Sources & Limitations
-with tab4:
-    if current_lang == "zh":
-        st.markdown("""
+    # Tab 4: Data Sources & Limitations
+    with tab4:
+        if current_lang == "zh":
+            st.markdown("""
         ## 資料來源與限制
         
         ### 資料來源 📡
@@ -398,8 +401,8 @@ with tab4:
         3. **API配額**: 大量使用時可能耗盡
         4. **語言限制**: 財務數據欄位名稱為英文
         """)
-    else:
-        st.markdown("""
+        else:
+            st.markdown("""
         ## Data Sources & Limitations
         
         ### Data Sources 📡
@@ -448,10 +451,10 @@ with tab4:
         4. **Language Limitation**: Financial data column names in English
         """)
 
-# Tab 5: Technical Architecture
-with tab5:
-    if current_lang == "zh":
-        st.markdown("""
+    # Tab 5: Technical Architecture
+    with tab5:
+        if current_lang == "zh":
+            st.markdown("""
         ## 技術架構
         
         ### 技術堆疊 🔧
@@ -486,6 +489,7 @@ with tab5:
         ├── finmind_data/
         │   └── [產業CSV檔案]
         ├── finmind_tools.py (核心功能)
+        ├── agent_tools.py (AI代理工具)
         ├── language_config.py (多語言支援)
         └── Dashboard.py (主頁面)
         ```
@@ -496,7 +500,9 @@ with tab5:
         - `analyze_csv_to_wide_df()`: 資料透視處理
         - `run_buffett_analysis()`: 巴菲特規則計算
         - `preload_all_industry_rankings()`: 預載入排名
-        - `get_best_stock_for_industry()`: AI工具函數
+        
+        **agent_tools.py:**
+        - `get_best_stock_for_industry()` / `get_financial_statements()` / `compare_stocks()`: AI代理提示所用的資料工具
         
         **language_config.py:**
         - 雙語支援系統
@@ -526,8 +532,8 @@ with tab5:
         3. **會話狀態**: 使用`st.session_state`保持資料
         4. **批次處理**: 合併多個API請求
         """)
-    else:
-        st.markdown("""
+        else:
+            st.markdown("""
         ## Technical Architecture
         
         ### Technology Stack 🔧
@@ -562,6 +568,7 @@ with tab5:
         ├── finmind_data/
         │   └── [Industry CSV Files]
         ├── finmind_tools.py (Core Functions)
+        ├── agent_tools.py (AI Agent Tools)
         ├── language_config.py (Multi-language Support)
         └── Dashboard.py (Main Page)
         ```
@@ -572,7 +579,9 @@ with tab5:
         - `analyze_csv_to_wide_df()`: Data pivot processing
         - `run_buffett_analysis()`: Buffett rules calculation
         - `preload_all_industry_rankings()`: Pre-load rankings
-        - `get_best_stock_for_industry()`: AI tool function
+        
+        **agent_tools.py:**
+        - `get_best_stock_for_industry()` / `get_financial_statements()` / `compare_stocks()`: data tools the agent's prompt is built from
         
         **language_config.py:**
         - Bilingual support system
@@ -603,11 +612,12 @@ with tab5:
         4. **Batch Processing**: Combine multiple API requests
         """)
 
-# Add footer
-st.markdown("---")
-if current_lang == "zh":
-    st.info("💡 **提示**: 此文件會根據您選擇的語言自動切換內容。")
-    st.caption(f"最後更新: {zh_update_date}")
-else:
-    st.info("💡 **Tip**: This documentation automatically switches content based on your selected language.")
-    st.caption(f"Last Updated: {en_update_date}")
\ No newline at end of file
+    # Add footer
+    st.markdown("---")
+    if current_lang == "zh":
+        st.info("💡 **提示**: 此文件會根據您選擇的語言自動切換內容。")
+        st.caption(f"最後更新: {zh_update_date}")
+    else:
+        st.info("💡 **Tip**: This documentation automatically switches content based on your selected language.")
+        st.caption(f"Last Updated: {en_update_date}")
+
@@ -0,0 +1,233 @@
+# perf.py
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+import profiling
+
+# Per-rerun timing spans. A page runs its body under `with rerun(page):`;
+# span(), record_span() and timed() anywhere in the script thread (including
+# finmind_tools) add to the current rerun. Outside a rerun (worker processes,
+# CLI scripts, other threads) they do nothing. The same block brackets an
+# on-demand profile of the rerun (profiling.py).
+PERF_HISTORY_RERUNS = 50
+# Optional JSONL file every finished rerun is appended to, for offline analysis
+PERF_LOG_PATH = os.getenv("PERF_LOG_PATH", "")
+
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+class RerunTimings:
+    """Spans of one script run: (name, offset ms, duration ms, payload bytes or None)"""
+
+    def __init__(self, page, detailed=False):
+        self.page = page
+        self.detailed = detailed
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.t0 = time.perf_counter()
+        self.spans = []
+        self.total_ms = None
+
+    def add(self, name, start, payload_bytes=None):
+        now = time.perf_counter()
+        self.spans.append((name, (start - self.t0) * 1000, (now - start) * 1000, payload_bytes))
+
+    def finish(self):
+        if self.total_ms is None:
+            self.total_ms = (time.perf_counter() - self.t0) * 1000
+        return self
+
+    def by_name(self):
+        """{span name: (count, total ms, payload bytes)} in first-seen order"""
+        totals = {}
+        for name, _, ms, size in self.spans:
+            count, total, payload = totals.get(name, (0, 0.0, 0))
+            totals[name] = (count + 1, total + ms, payload + (size or 0))
+        return totals
+
+    def to_dict(self):
+        return {
+            "page": self.page,
+            "started_at": self.started_at,
+            "total_ms": round(self.total_ms or 0, 1),
+            "spans": [
+                {"name": name, "offset_ms": round(offset, 1), "ms": round(ms, 2), "bytes": size}
+                for name, offset, ms, size in self.spans
+            ],
+        }
+
+
+def current_rerun():
+    return getattr(_local, "rerun", None)
+
+
+def _session_history():
+    import streamlit as st
+    if "_perf_reruns" not in st.session_state:
+        st.session_state._perf_reruns = deque(maxlen=PERF_HISTORY_RERUNS)
+    return st.session_state._perf_reruns
+
+
+def _append_log(rerun):
+    if not PERF_LOG_PATH:
+        return
+    try:
+        with _log_lock, open(PERF_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(rerun.to_dict(), ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"⚠️ Could not write perf log: {e}")
+
+
+@contextmanager
+def rerun(page):
+    """
+    Times (and, if enabled, profiles) one script run of `page`. The rerun is
+    closed in `finally` on the script thread, so runs that end in st.stop(),
+    st.rerun() or an exception are logged and their profile written too; the
+    sidebar panel is drawn only when the body completes. Streamlit runs every
+    rerun on a new thread, so nothing left open could be closed later.
+    """
+    _start_rerun(page)
+    completed = False
+    try:
+        yield current_rerun()
+        completed = True
+    finally:
+        if completed:
+            _render_panel()
+        else:
+            _close_rerun()
+
+
+def _start_rerun(page):
+    """Begins timing this script run of `page`"""
+    import streamlit as st
+    profiling.start(page)
+    # Figure payload sizes cost a serialization, so they are measured only while the panel is open
+    _local.rerun = RerunTimings(page, detailed=bool(st.session_state.get("perf_panel")))
+    _session_history().append(_local.rerun)
+    return _local.rerun
+
+
+@contextmanager
+def span(name):
+    rerun = current_rerun()
+    if rerun is None or rerun.total_ms is not None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        rerun.add(name, start)
+
+
+def record_span(name, start):
+    """Records a span from `start` (time.perf_counter()) to now; for code that cannot be indented under span()"""
+    rerun = current_rerun()
+    if rerun is not None and rerun.total_ms is None:
+        rerun.add(name, start)
+
+
+def timed(name):
+    """Decorator form of span()"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def plotly_chart(fig, *args, **kwargs):
+    """st.plotly_chart with a 'plotly_chart' span (and the figure's JSON size while the panel is open)"""
+    import streamlit as st
+    rerun = current_rerun()
+    if rerun is None or rerun.total_ms is not None:
+        return st.plotly_chart(fig, *args, **kwargs)
+    payload = len(fig.to_json()) if rerun.detailed and hasattr(fig, "to_json") else None
+    start = time.perf_counter()
+    try:
+        return st.plotly_chart(fig, *args, **kwargs)
+    finally:
+        rerun.add("plotly_chart", start, payload)
+
+
+def page_summary(reruns):
+    """Per page: reruns, median and max total ms, and the slowest spans by median ms per rerun"""
+    pages = {}
+    for rerun in reruns:
+        if rerun.total_ms is not None:
+            pages.setdefault(rerun.page, []).append(rerun)
+
+    rows = []
+    for page, runs in pages.items():
+        totals = sorted(r.total_ms for r in runs)
+        span_totals = {}
+        for r in runs:
+            for name, (_, ms, _) in r.by_name().items():
+                span_totals.setdefault(name, []).append(ms)
+        slowest = sorted(
+            ((name, sorted(values)[len(values) // 2]) for name, values in span_totals.items()),
+            key=lambda item: -item[1]
+        )[:3]
+        rows.append({
+            "page": page,
+            "reruns": len(runs),
+            "median_ms": round(totals[len(totals) // 2], 1),
+            "max_ms": round(totals[-1], 1),
+            "slowest_spans": ", ".join(f"{name} {ms:.0f}" for name, ms in slowest),
+        })
+    return sorted(rows, key=lambda row: -row["median_ms"])
+
+
+def _close_rerun():
+    """Writes the profile and finishes and logs the current rerun; returns (rerun, profile path)"""
+    profile_path = profiling.stop()
+    rerun = current_rerun()
+    if rerun is not None and rerun.total_ms is None:
+        _append_log(rerun.finish())
+    return rerun, profile_path
+
+
+def _render_panel():
+    """Closes the current rerun and, if enabled in the sidebar, shows its spans and this session's per-page summary"""
+    import pandas as pd
+    import streamlit as st
+    from language_config import get_text
+
+    rerun, profile_path = _close_rerun()
+    if profile_path:
+        st.sidebar.caption(get_text('profile_written').format(path=profile_path))
+
+    enabled = st.sidebar.toggle(get_text('perf_panel'), key="perf_panel", help=get_text('perf_panel_help'))
+    if rerun is None or not enabled:
+        return
+
+    with st.sidebar:
+        st.caption(get_text('perf_this_rerun').format(page=rerun.page, ms=rerun.total_ms))
+        spans = rerun.by_name()
+        if spans:
+            st.dataframe(pd.DataFrame([
+                {"span": name, "n": count, "ms": round(total, 1),
+                 "KB": round(payload / 1024, 1) if payload else None}
+                for name, (count, total, payload) in spans.items()
+            ]), hide_index=True, use_container_width=True)
+
+        history = list(_session_history())
+        st.caption(get_text('perf_by_page'))
+        st.dataframe(pd.DataFrame(page_summary(history)), hide_index=True, use_container_width=True)
+        st.download_button(
+            get_text('perf_export'),
+            "\n".join(json.dumps(r.to_dict(), ensure_ascii=False) for r in history if r.total_ms is not None),
+            file_name="perf_reruns.jsonl",
+            mime="application/json"
+        )
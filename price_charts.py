@@ -0,0 +1,109 @@
+# price_charts.py
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# Point budgets per trace; above them series are decimated server-side so the
+# browser payload stays bounded whatever the chart range (30 days or 5 years)
+MAX_CANDLES = 300
+MAX_LINE_POINTS = 1000
+
+# Line traces longer than this are drawn with WebGL instead of SVG
+WEBGL_THRESHOLD = 500
+
+# Candle intervals tried in order until the series fits MAX_CANDLES
+OHLC_INTERVALS = [("D", None), ("W", "W-FRI"), ("M", "ME"), ("Q", "QE")]
+
+
+def lttb(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Returns the indices of at most `threshold` points that preserve the visual
+    shape of the line (peaks and troughs are kept). `x` must be increasing and
+    numeric; NaNs in `y` should be dropped beforehand.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # Interior points are split into threshold-2 buckets; first and last points are always kept
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+
+    selected = np.empty(threshold, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point) is the third triangle vertex
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def resample_ohlc(df_price, rule):
+    """Aggregates daily FinMind price rows (open/max/min/close/Trading_Volume) into `rule` candles"""
+    df = df_price.assign(date=pd.to_datetime(df_price["date"])).set_index("date")
+    agg = {"open": "first", "max": "max", "min": "min", "close": "last"}
+    if "Trading_Volume" in df.columns:
+        agg["Trading_Volume"] = "sum"
+    out = df.resample(rule).agg(agg).dropna(subset=["close"])
+    return out.reset_index()
+
+
+def prepare_ohlc(df_price, max_candles=MAX_CANDLES):
+    """
+    Returns (candles, interval) where interval is 'D', 'W', 'M' or 'Q'.
+
+    Daily rows are returned unchanged when they fit the budget; otherwise they
+    are aggregated to the finest interval that does. Candlesticks have no WebGL
+    trace type, so aggregation is what keeps long ranges fast.
+    """
+    if len(df_price) <= max_candles:
+        return df_price, "D"
+    for interval, rule in OHLC_INTERVALS[1:]:
+        candles = resample_ohlc(df_price, rule)
+        if len(candles) <= max_candles:
+            return candles, interval
+    return candles, interval
+
+
+def resample_line(series, interval):
+    """
+    Daily date-indexed series sampled like prepare_ohlc's candles of `interval`:
+    the value at each candle's close, labelled with the candle's date, so
+    overlays line up with the bars.
+    """
+    rule = dict(OHLC_INTERVALS)[interval]
+    if rule is None:
+        return series
+    return series.resample(rule).last()
+
+
+def line_trace(x, y, name, max_points=MAX_LINE_POINTS, **kwargs):
+    """Scatter line trace, LTTB-decimated to `max_points` and switched to WebGL when long"""
+    x = pd.to_datetime(pd.Series(x)).reset_index(drop=True)
+    y = pd.Series(np.asarray(y, dtype=float))
+    valid = y.notna().to_numpy()
+    x, y = x[valid], y[valid]
+
+    if len(y) > max_points:
+        idx = lttb(x.astype("int64").to_numpy(), y.to_numpy(), max_points)
+        x, y = x.iloc[idx], y.iloc[idx]
+
+    trace_type = go.Scattergl if len(y) > WEBGL_THRESHOLD else go.Scatter
+    return trace_type(x=x, y=y, name=name, mode="lines", **kwargs)
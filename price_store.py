@@ -0,0 +1,221 @@
+# price_store.py
+
+import glob
+import os
+import threading
+
+import pandas as pd
+
+# Local columnar store of TaiwanStockPrice rows, one parquet file per month
+# (e.g. finmind_data/prices/2025-06.parquet) holding every stock for that month.
+# Only the whole-market ingest (download_daily_prices.py) writes these partitions,
+# so every date in them is a complete market day: max_stored_date(), indicators
+# and snapshots rely on that. Single-stock fetches for charts go to the
+# `backfill/` subdirectory (same layout) and are merged in by the per-stock reads.
+PRICE_STORE_DIR = os.getenv("PRICE_STORE_DIR", "finmind_data/prices")
+BACKFILL_SUBDIR = "backfill"
+
+PRICE_COLUMNS = [
+    "date", "stock_id", "Trading_Volume", "Trading_money",
+    "open", "max", "min", "close", "spread", "Trading_turnover"
+]
+
+_write_lock = threading.Lock()
+
+
+def _partition_path(month, store_dir=None):
+    return os.path.join(store_dir or PRICE_STORE_DIR, f"{month}.parquet")
+
+
+def backfill_dir(store_dir=None):
+    """Directory of single-stock rows that belong to the store at `store_dir`"""
+    return os.path.join(store_dir or PRICE_STORE_DIR, BACKFILL_SUBDIR)
+
+
+def list_partitions(store_dir=None):
+    """Sorted list of month keys ('YYYY-MM') present in the store"""
+    files = glob.glob(os.path.join(store_dir or PRICE_STORE_DIR, "????-??.parquet"))
+    return sorted(os.path.basename(f)[:7] for f in files)
+
+
+def store_version(store_dir=None):
+    """Changes whenever a partition is written; used as a Streamlit cache key"""
+    files = glob.glob(os.path.join(store_dir or PRICE_STORE_DIR, "????-??.parquet"))
+    if not files:
+        return ""
+    return f"{len(files)}:{max(int(os.path.getmtime(f)) for f in files)}"
+
+
+def normalize_prices(df):
+    """Coerce raw FinMind price records into the store schema"""
+    if df.empty:
+        return pd.DataFrame(columns=PRICE_COLUMNS)
+    df = df.copy()
+    for col in PRICE_COLUMNS:
+        if col not in df.columns:
+            df[col] = pd.NA
+    df = df[PRICE_COLUMNS]
+    df["date"] = pd.to_datetime(df["date"])
+    df["stock_id"] = df["stock_id"].astype(str)
+    for col in PRICE_COLUMNS[2:]:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df.dropna(subset=["open", "max", "min", "close"])
+
+
+def append_prices(df, store_dir=None):
+    """
+    Merges price rows into their month partitions.
+
+    Existing (stock_id, date) rows are replaced by the new ones, so re-ingesting a
+    day is idempotent. Each partition is rewritten atomically.
+    """
+    df = normalize_prices(df)
+    if df.empty:
+        return 0
+
+    store_dir = store_dir or PRICE_STORE_DIR
+    os.makedirs(store_dir, exist_ok=True)
+
+    with _write_lock:
+        for month, part in df.groupby(df["date"].dt.strftime("%Y-%m")):
+            path = _partition_path(month, store_dir)
+            if os.path.exists(path):
+                part = pd.concat([pd.read_parquet(path), part], ignore_index=True)
+            part = (
+                part.drop_duplicates(subset=["stock_id", "date"], keep="last")
+                .sort_values(["stock_id", "date"])
+                .reset_index(drop=True)
+            )
+            tmp_path = f"{path}.tmp"
+            part.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+    return len(df)
+
+
+def append_backfill(df, store_dir=None):
+    """Merges one stock's rows into the backfill partitions, leaving the market partitions untouched"""
+    return append_prices(df, backfill_dir(store_dir))
+
+
+def max_stored_date(store_dir=None):
+    """Latest market day ingested into the store, or None if it is empty"""
+    months = list_partitions(store_dir)
+    if not months:
+        return None
+    dates = pd.read_parquet(_partition_path(months[-1], store_dir), columns=["date"])["date"]
+    return dates.max() if not dates.empty else None
+
+
+def stored_date_range(stock_id, store_dir=None, include_backfill=True):
+    """
+    (first_date, last_date) stored for one stock, or (None, None), counting its
+    backfill rows unless `include_backfill` is False.
+
+    Reads only the `date` column of partitions, with the stock_id filter pushed down,
+    scanning from the newest month backward for the last date and forward for the first.
+    """
+    if include_backfill:
+        ranges = [stored_date_range(stock_id, d, include_backfill=False)
+                  for d in (store_dir or PRICE_STORE_DIR, backfill_dir(store_dir))]
+        firsts = [first for first, _ in ranges if first is not None]
+        lasts = [last for _, last in ranges if last is not None]
+        return (min(firsts) if firsts else None), (max(lasts) if lasts else None)
+
+    months = list_partitions(store_dir)
+    filters = [("stock_id", "=", str(stock_id))]
+
+    def _dates(month):
+        return pd.read_parquet(_partition_path(month, store_dir), columns=["date"], filters=filters)["date"]
+
+    last = None
+    for month in reversed(months):
+        dates = _dates(month)
+        if not dates.empty:
+            last = dates.max()
+            break
+    if last is None:
+        return None, None
+
+    for month in months:
+        dates = _dates(month)
+        if not dates.empty:
+            return dates.min(), last
+    return None, last
+
+
+def load_history(stock_id, days=30, store_dir=None):
+    """Daily OHLCV rows for one stock over the last `days` calendar days, oldest first; market rows win over backfill"""
+    start = pd.Timestamp.now().normalize() - pd.Timedelta(days=days)
+    frames = [
+        load_prices(start_date=start, stock_ids=[stock_id], store_dir=d)
+        for d in (backfill_dir(store_dir), store_dir)
+    ]
+    df = pd.concat([f for f in frames if not f.empty] or frames[-1:], ignore_index=True)
+    df = df.drop_duplicates(subset=["date"], keep="last")
+    return df.sort_values("date").reset_index(drop=True)
+
+
+def load_prices(start_date=None, end_date=None, stock_ids=None, columns=None, store_dir=None):
+    """
+    Reads price rows for a date range, touching only the month partitions that
+    overlap it. `stock_ids` is pushed down to the parquet reader.
+    """
+    start = pd.Timestamp(start_date) if start_date is not None else None
+    end = pd.Timestamp(end_date) if end_date is not None else None
+
+    months = [
+        m for m in list_partitions(store_dir)
+        if (start is None or m >= start.strftime("%Y-%m")) and (end is None or m <= end.strftime("%Y-%m"))
+    ]
+    if not months:
+        return pd.DataFrame(columns=columns or PRICE_COLUMNS)
+
+    filters = None
+    if stock_ids is not None:
+        filters = [("stock_id", "in", [str(s) for s in stock_ids])]
+
+    frames = [
+        pd.read_parquet(_partition_path(m, store_dir), columns=columns, filters=filters)
+        for m in months
+    ]
+    df = pd.concat(frames, ignore_index=True)
+    if start is not None:
+        df = df[df["date"] >= start]
+    if end is not None:
+        df = df[df["date"] <= end]
+    return df.reset_index(drop=True)
+
+
+def load_snapshot(stock_ids=None, lookback_days=30, store_dir=None):
+    """
+    Latest close, volume and % change over the lookback window for every stock,
+    computed in one pass over the store (no per-stock work).
+
+    Returns columns: stock_id, date, current_price, volume, price_change_pct.
+    """
+    latest = max_stored_date(store_dir)
+    if latest is None:
+        return pd.DataFrame(columns=["stock_id", "date", "current_price", "volume", "price_change_pct"])
+
+    df = load_prices(
+        start_date=latest - pd.Timedelta(days=lookback_days),
+        stock_ids=stock_ids,
+        columns=["date", "stock_id", "close", "Trading_Volume"],
+        store_dir=store_dir,
+    )
+    if df.empty:
+        return pd.DataFrame(columns=["stock_id", "date", "current_price", "volume", "price_change_pct"])
+
+    # Partitions are sorted by (stock_id, date), but concatenating months breaks that order
+    df = df.sort_values(["stock_id", "date"])
+    grouped = df.groupby("stock_id", sort=False)
+    first_close = grouped["close"].first()
+    last = grouped.last()
+
+    snapshot = pd.DataFrame({
+        "date": last["date"],
+        "current_price": last["close"],
+        "volume": last["Trading_Volume"].fillna(0),
+        "price_change_pct": (last["close"] - first_close) / first_close.where(first_close != 0) * 100,
+    }).reset_index()
+    return snapshot
@@ -0,0 +1,81 @@
+# profile_store.py
+
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from functools import lru_cache
+
+# Bilingual company profiles generated offline by generate_company_profiles.py
+PROFILE_DB_PATH = os.getenv("PROFILE_DB_PATH", "profiles/company_profiles.sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS company_profiles (
+    stock_id   TEXT NOT NULL,
+    lang       TEXT NOT NULL,
+    stock_name TEXT,
+    industry   TEXT,
+    profile    TEXT NOT NULL,
+    model      TEXT,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (stock_id, lang)
+);
+CREATE INDEX IF NOT EXISTS idx_company_profiles_industry ON company_profiles (industry, lang);
+"""
+
+
+@lru_cache(maxsize=None)
+def _init_db(path):
+    """Creates the file, WAL mode and schema once per process and path"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with closing(sqlite3.connect(path, timeout=10)) as conn:
+        # WAL lets the app read while the batch job writes; the mode is stored in the file
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+
+
+def _connect(db_path=None):
+    path = db_path or PROFILE_DB_PATH
+    _init_db(path)
+    return sqlite3.connect(path, timeout=10)
+
+
+def get_profile(stock_id, lang, db_path=None):
+    """Stored profile text for a stock in a language, or None"""
+    path = db_path or PROFILE_DB_PATH
+    if not os.path.exists(path):
+        return None
+    with closing(_connect(path)) as conn:
+        row = conn.execute(
+            "SELECT profile FROM company_profiles WHERE stock_id = ? AND lang = ?",
+            (str(stock_id), lang)
+        ).fetchone()
+    return row[0] if row else None
+
+
+def save_profile(stock_id, lang, profile, stock_name=None, industry=None, model=None, db_path=None):
+    """Insert or replace one profile"""
+    with closing(_connect(db_path)) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO company_profiles "
+            "(stock_id, lang, stock_name, industry, profile, model, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (str(stock_id), lang, stock_name, industry, profile, model,
+             datetime.now().isoformat(timespec="seconds"))
+        )
+
+
+def existing_profile_keys(db_path=None):
+    """Set of (stock_id, lang) already stored; used by the batch job to resume"""
+    path = db_path or PROFILE_DB_PATH
+    if not os.path.exists(path):
+        return set()
+    with closing(_connect(path)) as conn:
+        return set(conn.execute("SELECT stock_id, lang FROM company_profiles").fetchall())
+
+
+def profile_count(db_path=None):
+    path = db_path or PROFILE_DB_PATH
+    if not os.path.exists(path):
+        return 0
+    with closing(_connect(path)) as conn:
+        return conn.execute("SELECT COUNT(*) FROM company_profiles").fetchone()[0]
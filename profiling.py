@@ -0,0 +1,89 @@
+# profiling.py
+
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+# On-demand profiling of whole page reruns, started and stopped by perf.rerun().
+# PROFILE_RERUNS:
+#   ""/"0"   off (default): one string comparison per rerun, nothing imported
+#   "1"      profile every rerun
+#   "query"  profile reruns whose URL has ?profile=1
+# pyinstrument (sampling) writes an HTML call tree per rerun; without it,
+# cProfile writes a .prof file (open with snakeviz or pstats).
+PROFILE_RERUNS = os.getenv("PROFILE_RERUNS", "").strip().lower()
+PROFILE_DIR = os.getenv("PROFILE_DIR", ".cache/profiles")
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.001"))
+
+_local = threading.local()
+
+
+def enabled_for_rerun():
+    if PROFILE_RERUNS in ("", "0", "false", "off"):
+        return False
+    if PROFILE_RERUNS == "query":
+        import streamlit as st
+        return st.query_params.get("profile", "") in ("1", "true")
+    return True
+
+
+def _new_profiler():
+    """(kind, profiler) started on this thread"""
+    try:
+        from pyinstrument import Profiler
+        profiler = Profiler(interval=PROFILE_INTERVAL, async_mode="disabled")
+        profiler.start()
+        return "pyinstrument", profiler
+    except ImportError:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return "cprofile", profiler
+
+
+def start(page):
+    """Starts profiling this rerun of `page` if enabled; perf.rerun() always pairs it with stop()"""
+    if not enabled_for_rerun():
+        return
+    try:
+        kind, profiler = _new_profiler()
+    except Exception as e:
+        # e.g. another session's cProfile is active (one profiler per process on Python 3.12+)
+        print(f"⚠️ Could not profile {page}: {e}")
+        return
+    _local.active = (page, kind, profiler, time.perf_counter())
+
+
+def stop():
+    """Stops the active profile and writes it; returns the file path, or None if nothing was profiled"""
+    active = getattr(_local, "active", None)
+    if active is None:
+        return None
+    _local.active = None
+    page, kind, profiler, started = active
+
+    # Stop before anything can fail: on Python 3.12+ a cProfile left enabled
+    # blocks every later profiler in the process
+    if kind == "pyinstrument":
+        profiler.stop()
+    else:
+        profiler.disable()
+
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    slug = re.sub(r"[^\w.-]+", "_", page)
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        if kind == "pyinstrument":
+            path = os.path.join(PROFILE_DIR, f"{stamp}_{slug}.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(profiler.output_html())
+        else:
+            path = os.path.join(PROFILE_DIR, f"{stamp}_{slug}.prof")
+            profiler.dump_stats(path)
+    except Exception as e:
+        print(f"⚠️ Could not write profile for {page}: {e}")
+        return None
+    print(f"🔬 Profiled {page} ({(time.perf_counter() - started) * 1000:.0f} ms) -> {path}")
+    return path
@@ -0,0 +1,93 @@
+# prompt_encoding.py
+
+from functools import lru_cache
+
+import pandas as pd
+
+# Short aliases for ranking columns sent to the LLM; the legend is sent once per prompt.
+# (alias, description, scale) - values are divided by scale before formatting.
+COLUMN_ALIASES = {
+    "stock_id": ("id", "stock ID", 1),
+    "stock_name": ("name", "company name", 1),
+    "% Passed": ("pass", "% of quarters since 2020 passing all rules of the category", 1),
+    "Avg % Cash/Debt": ("cash_debt", "avg cash / total debt, % (10000 = no debt)", 1),
+    "Avg Debt/Equity": ("de", "avg debt-to-equity ratio", 1),
+    "Avg % Ret. Earnings Growth": ("re_g", "avg retained earnings growth vs 4 quarters ago, %", 1),
+    "Avg Gross Margin (%)": ("gm", "avg gross margin, %", 1),
+    "Avg Interest Margin (%)": ("im", "avg interest expense / operating income, %", 1),
+    "Avg Net Profit Margin (%)": ("npm", "avg net profit margin, %", 1),
+    "Avg EPS": ("eps", "avg EPS, TWD", 1),
+    "Avg Free Cash Flow": ("fcf_m", "avg free cash flow, TWD millions", 1e6),
+    "Avg Net Debt Change": ("ndc_m", "avg net debt change, TWD millions", 1e6),
+    "balance": ("bal", "balance sheet score 0-1", 1),
+    "income": ("inc", "income statement score 0-1", 1),
+    "cashflow": ("cf", "cash flow score 0-1", 1),
+    "composite": ("score", "composite score 0-1", 1),
+}
+
+DEFAULT_PRECISION = 2
+
+# Model used for token counting when the caller does not say
+DEFAULT_TOKEN_MODEL = "gpt-3.5-turbo"
+
+
+def _format_value(value, precision):
+    if pd.isna(value):
+        return ""
+    if isinstance(value, str):
+        # Keep CSV rows unambiguous
+        return value.replace(",", " ").rstrip("%")
+    if float(value).is_integer():
+        return str(int(value))
+    return f"{value:.{precision}f}".rstrip("0").rstrip(".")
+
+
+def encode_table(df, precision=DEFAULT_PRECISION):
+    """CSV-style rows with aliased headers, scaled units and fixed precision"""
+    headers = []
+    columns = []
+    for col in df.columns:
+        alias, _, scale = COLUMN_ALIASES.get(col, (col, col, 1))
+        headers.append(alias)
+        series = df[col]
+        if scale != 1:
+            series = pd.to_numeric(series, errors="coerce") / scale
+        columns.append(series.tolist())
+
+    rows = [",".join(headers)]
+    for values in zip(*columns):
+        rows.append(",".join(_format_value(v, precision) for v in values))
+    return "\n".join(rows)
+
+
+def column_legend(*tables):
+    """Legend for the aliases that actually appear in the given tables"""
+    seen = []
+    for df in tables:
+        for col in df.columns:
+            if col in COLUMN_ALIASES and col not in seen:
+                seen.append(col)
+    return "\n".join(f"{COLUMN_ALIASES[c][0]}: {COLUMN_ALIASES[c][1]}" for c in seen)
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model):
+    try:
+        import tiktoken
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # tiktoken missing, or its BPE file cannot be downloaded
+        return None
+
+
+def count_tokens(text, model=DEFAULT_TOKEN_MODEL):
+    """Token count for `text`; falls back to a ~4 chars/token estimate without tiktoken"""
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return max(1, len(text) // 4)
+    return len(encoding.encode(text))
@@ -0,0 +1,60 @@
+# screener.py
+
+import numpy as np
+
+# Trailing-return windows precomputed by indicators.py
+RETURN_WINDOWS = (5, 20, 60)
+
+
+def screen_stocks(df, rsi_max=None, rsi_min=None, above_sma_20=False, volume_spike=None,
+                  return_days=None, return_min=None, industries=None,
+                  sort_by="stock_id", ascending=True, page=1, page_size=None):
+    """
+    Runs threshold queries over the latest-day indicator table.
+
+    Every condition is a vectorized boolean mask over precomputed columns, so a
+    full-market screen costs a few milliseconds. Conditions left as None/False are
+    not applied.
+
+    Parameters:
+        df (pd.DataFrame): indicators_latest rows, optionally merged with stock info
+        rsi_max / rsi_min (float): bounds on rsi_14
+        above_sma_20 (bool): close above its 20-day SMA
+        volume_spike (float): minimum volume / 20-day average volume
+        return_days (int) / return_min (float): minimum N-day return in %
+        industries (list): keep only these industry_category values
+        page / page_size (int): 1-based pagination of the sorted matches; a page past
+            the end returns the last page, page_size=None returns every match
+
+    Returns:
+        (page_df, total_matches)
+    """
+    if df.empty:
+        return df, 0
+
+    mask = np.ones(len(df), dtype=bool)
+    if rsi_max is not None:
+        mask &= (df["rsi_14"] < rsi_max).to_numpy()
+    if rsi_min is not None:
+        mask &= (df["rsi_14"] > rsi_min).to_numpy()
+    if above_sma_20:
+        mask &= (df["current_price"] > df["sma_20"]).to_numpy()
+    if volume_spike is not None:
+        mask &= (df["volume_ratio"] >= volume_spike).to_numpy()
+    if return_days is not None and return_min is not None:
+        if return_days not in RETURN_WINDOWS:
+            raise ValueError(f"return_days must be one of {RETURN_WINDOWS}")
+        mask &= (df[f"return_{return_days}d"] >= return_min).to_numpy()
+    if industries and "industry_category" in df.columns:
+        mask &= df["industry_category"].isin(industries).to_numpy()
+
+    matches = df[mask]
+    total = len(matches)
+    if sort_by in matches.columns:
+        matches = matches.sort_values(sort_by, ascending=ascending, na_position="last")
+
+    if page_size is None:
+        return matches.reset_index(drop=True), total
+    last_page = max(1, -(-total // page_size))
+    start = (min(max(1, page), last_page) - 1) * page_size
+    return matches.iloc[start:start + page_size].reset_index(drop=True), total
@@ -0,0 +1,151 @@
+# statement_index.py
+
+import io
+import json
+import os
+import threading
+from glob import glob
+
+import pandas as pd
+
+import finmind_tools
+
+# Byte-offset index over the long-format industry CSVs: stock_id -> [(file, start, end), ...].
+# Reading one stock is a seek plus a read of its own rows instead of parsing a whole industry.
+# The CSVs are read from data_dir, defaulting to finmind_tools.DATA_DIR (FINMIND_DATA_DIR) at call time.
+STATEMENT_INDEX_DIR = os.getenv("STATEMENT_INDEX_DIR", ".cache/statements")
+
+# Rows shown by the statement summary: (type, label, per-share). Amounts are shown in TWD millions.
+SUMMARY_METRICS = [
+    ("Revenue", "revenue", False),
+    ("GrossProfit", "gross_profit", False),
+    ("OperatingIncome", "operating_income", False),
+    ("IncomeAfterTaxes", "net_income", False),
+    ("EPS", "eps", True),
+    ("TotalAssets", "total_assets", False),
+    ("Liabilities", "total_liabilities", False),
+    ("Equity", "equity", False),
+    ("CashAndCashEquivalents", "cash", False),
+    ("CurrentAssets", "current_assets", False),
+    ("CurrentLiabilities", "current_liabilities", False),
+    ("RetainedEarnings", "retained_earnings", False),
+    ("CashFlowsFromOperatingActivities", "operating_cash_flow", False),
+    ("PropertyAndPlantAndEquipment", "capex", False),
+    ("CashFlowsProvidedFromFinancingActivities", "financing_cash_flow", False),
+]
+
+DEFAULT_QUARTERS = 8
+MAX_QUARTERS = 12
+
+_index_lock = threading.Lock()
+_indexes = {}  # data_version -> index
+
+
+def _index_path(data_version):
+    return os.path.join(STATEMENT_INDEX_DIR, f"index-{data_version}.json")
+
+
+def build_statement_index(data_dir=None):
+    """
+    One pass over every CSV in binary mode, recording the byte range of each
+    run of rows per stock. Returns {"headers": {file: header}, "stocks": {id: [[file, start, end], ...]}}.
+    """
+    data_dir = data_dir or finmind_tools.DATA_DIR
+    headers = {}
+    stocks = {}
+    for csv_file in sorted(glob(os.path.join(data_dir, "*.csv"))):
+        name = os.path.basename(csv_file)
+        with open(csv_file, "rb") as f:
+            header = f.readline()
+            columns = header.decode("utf-8-sig").strip().split(",")
+            if "stock_id" not in columns:
+                continue
+            headers[name] = header.decode("utf-8-sig")
+            col = columns.index("stock_id")
+
+            offset = f.tell()
+            run_id, run_start = None, offset
+            for line in f:
+                stock_id = line.split(b",", col + 1)[col].decode("utf-8").strip('"')
+                if stock_id != run_id:
+                    if run_id is not None:
+                        stocks.setdefault(run_id, []).append([name, run_start, offset])
+                    run_id, run_start = stock_id, offset
+                offset += len(line)
+            if run_id is not None:
+                stocks.setdefault(run_id, []).append([name, run_start, offset])
+    return {"headers": headers, "stocks": stocks}
+
+
+def load_statement_index(data_version, data_dir=None):
+    """Index for the current CSVs: memory, then disk, then built once and saved"""
+    with _index_lock:
+        index = _indexes.get(data_version)
+        if index is not None:
+            return index
+
+        path = _index_path(data_version)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = build_statement_index(data_dir)
+            try:
+                os.makedirs(STATEMENT_INDEX_DIR, exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(index, f, ensure_ascii=False)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"⚠️ Could not save statement index: {e}")
+
+        _indexes[data_version] = index
+        return index
+
+
+def read_statements(stock_id, data_version, data_dir=None):
+    """Long-format statements (date, type, value, origin_name, ...) of one stock from the local CSVs"""
+    data_dir = data_dir or finmind_tools.DATA_DIR
+    index = load_statement_index(data_version, data_dir)
+    ranges = index["stocks"].get(str(stock_id))
+    if not ranges:
+        return pd.DataFrame()
+
+    frames = []
+    for name, start, end in ranges:
+        with open(os.path.join(data_dir, name), "rb") as f:
+            f.seek(start)
+            chunk = f.read(end - start)
+        frames.append(pd.read_csv(io.StringIO(index["headers"][name] + chunk.decode("utf-8")),
+                                  dtype={"stock_id": str}))
+    df = pd.concat(frames, ignore_index=True)
+    # A stock listed under two industry files has the same rows twice, differing only in 'industry'
+    return df.drop_duplicates(subset=[c for c in df.columns if c != "industry"])
+
+
+def summarize_statements(df, quarters=DEFAULT_QUARTERS, start_date=None):
+    """
+    Pivot of SUMMARY_METRICS (rows) by the latest quarters (columns), plus free
+    cash flow. Size is bounded by the metric list and MAX_QUARTERS.
+    """
+    if df.empty:
+        return pd.DataFrame()
+    if start_date:
+        df = df[df["date"] >= start_date]
+    wide = df.pivot_table(index="type", columns="date", values="value", aggfunc="last")
+    dates = sorted(wide.columns, reverse=True)[:max(1, min(quarters, MAX_QUARTERS))]
+    wide = wide[dates]
+
+    rows = []
+    for metric, label, per_share in SUMMARY_METRICS:
+        if metric in wide.index:
+            values = wide.loc[metric]
+            rows.append((label, values if per_share else values / 1e6))
+    if {"CashFlowsFromOperatingActivities", "PropertyAndPlantAndEquipment"} <= set(wide.index):
+        # Same convention as finmind_tools: capex counts as an outflow whatever its sign
+        fcf = wide.loc["CashFlowsFromOperatingActivities"] - wide.loc["PropertyAndPlantAndEquipment"].abs()
+        rows.append(("free_cash_flow", fcf / 1e6))
+
+    summary = pd.DataFrame({label: values for label, values in rows}).T
+    summary.index.name = "metric"
+    return summary.reset_index()
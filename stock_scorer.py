@@ -0,0 +1,83 @@
+# stock_scorer.py
+
+import pandas as pd
+
+# Metric direction per ranking table: True = higher is better.
+# '% Passed' is weighted separately (PASSED_WEIGHT) as the headline signal.
+SCORE_METRICS = {
+    "balance": {
+        "Avg % Cash/Debt": True,
+        "Avg Debt/Equity": False,
+        "Avg % Ret. Earnings Growth": True,
+    },
+    "income": {
+        "Avg Gross Margin (%)": True,
+        # Interest expense / operating income; the income rule passes below 25%
+        "Avg Interest Margin (%)": False,
+        "Avg Net Profit Margin (%)": True,
+        "Avg EPS": True,
+    },
+    "cashflow": {
+        "Avg Free Cash Flow": True,
+        "Avg Net Debt Change": False,
+    },
+}
+
+PASSED_WEIGHT = 0.5
+
+
+def _numeric(series):
+    """Ranking columns mix numbers and strings such as '86%'"""
+    if series.dtype == object:
+        series = series.astype(str).str.rstrip("%")
+    return pd.to_numeric(series, errors="coerce")
+
+
+def category_scores(ranking_df, metrics):
+    """
+    Score in [0, 1] for each stock in one ranking table.
+
+    Every metric is converted to a percentile rank within the industry (flipped
+    for lower-is-better metrics); '% Passed' carries PASSED_WEIGHT and the other
+    metrics share the rest equally. Missing values rank last.
+    """
+    df = ranking_df.drop_duplicates(subset="stock_id").set_index("stock_id")
+    score = PASSED_WEIGHT * _numeric(df["% Passed"]).rank(pct=True).fillna(0)
+
+    present = [m for m in metrics if m in df.columns]
+    for metric in present:
+        ranks = _numeric(df[metric]).rank(pct=True, ascending=metrics[metric])
+        score += (1 - PASSED_WEIGHT) / len(present) * ranks.fillna(0)
+    return score
+
+
+def score_industry(rankings):
+    """
+    Composite score per stock from the balance / income / cashflow ranking tables.
+
+    `rankings` is the dict registered by finmind_tools.register_industry_rankings.
+    A stock missing from a table scores 0 for that category. Returns a DataFrame
+    (stock_id, stock_name, balance, income, cashflow, composite) best first.
+    """
+    scores = pd.DataFrame({
+        category: category_scores(rankings[category], metrics)
+        for category, metrics in SCORE_METRICS.items()
+        if rankings.get(category) is not None and not rankings[category].empty
+    })
+    if scores.empty:
+        return pd.DataFrame(columns=["stock_id", "stock_name", *SCORE_METRICS, "composite"])
+
+    scores = scores.reindex(columns=list(SCORE_METRICS)).fillna(0)
+    scores["composite"] = scores.mean(axis=1)
+
+    names = pd.concat([
+        df[["stock_id", "stock_name"]] for df in rankings.values() if df is not None
+    ]).drop_duplicates(subset="stock_id").set_index("stock_id")["stock_name"]
+    scores.insert(0, "stock_name", names.reindex(scores.index))
+
+    scores.index.name = "stock_id"
+    scores = scores.reset_index()
+    scores["stock_id"] = scores["stock_id"].astype(str)
+    # Ties broken by stock_id so the pick is stable across runs
+    return scores.sort_values(["composite", "stock_id"], ascending=[False, True]).reset_index(drop=True)
+
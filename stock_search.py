@@ -0,0 +1,273 @@
+# stock_search.py
+
+import re
+from bisect import bisect_left
+from collections import defaultdict
+
+# Keywords (Chinese and English) that name an industry in a free-text question.
+# Industry categories present in the stock list are matched by name as well.
+# English aliases match whole words only, so they must not be everyday words of
+# finance questions ("display", "trading", "led", "bio" are left out).
+INDUSTRY_ALIASES = {
+    "食品工業": ["食品工業", "food industry", "food"],
+    "居家生活": ["居家生活", "home living", "household"],
+    "半導體業": ["半導體業", "semiconductor"],
+    "電子商務業": ["電子商務業", "ecommerce", "e-commerce"],
+    "農業科技": ["農業科技", "agricultural technology", "agri tech"],
+    "玻璃陶瓷": ["玻璃陶瓷", "glass", "ceramics"],
+    "水泥工業": ["水泥工業", "cement"],
+    "造紙工業": ["造紙工業", "paper industry", "pulp"],
+    "運動休閒類": ["運動休閒類", "sports", "leisure"],
+    "橡膠工業": ["橡膠工業", "rubber"],
+    "油電燃氣業": ["油電燃氣業", "oil", "gas", "utilities"],
+    "綠能環保類": ["綠能環保類", "green energy", "environmental"],
+    "塑膠工業": ["塑膠工業", "plastics"],
+    "航運業": ["航運業", "shipping"],
+    "文化創意業": ["文化創意業", "cultural", "creative"],
+    "農業科技業": ["農業科技業", "agricultural technology business"],
+    "觀光事業": ["觀光事業", "tourism", "travel", "hospitality", "hotel"],
+    "貿易百貨": ["貿易百貨", "trading companies", "department stores", "retail", "convenience stores"],
+    "光電業": ["光電業", "optoelectronics", "opto", "display panels", "optical", "photonics"],
+    "生技醫療業": ["生技醫療業", "biotechnology", "biotech", "medical", "pharmaceutical", "pharma", "healthcare", "medicine"]
+}
+
+# Stock IDs inside free text: 4-6 digits, optionally a letter suffix (e.g. 00631L)
+_ID_PATTERN = re.compile(r"(?<![0-9A-Za-z])(\d{4,6}[A-Za-z]?)(?![0-9A-Za-z])")
+
+# 4-digit IDs that read as years (1900-2099) need an ID word close by ("代號 2023", "2023股")
+_YEAR_PATTERN = re.compile(r"(19|20)\d\d")
+_ID_CONTEXT = re.compile(r"代號|代碼|股|id|ticker|stock", re.IGNORECASE)
+_ID_CONTEXT_CHARS = 8
+
+# Two-character names (幸福, 冠軍, 富強) are also common words, so they only count
+# as whole tokens: next to the text edge, punctuation, ASCII or a joining particle
+_SHORT_NAME_LENGTH = 2
+_NAME_BOUNDARY_CHARS = set("的和與跟及或比對同在是嗎呢")
+
+# Minimum n-gram similarity (Dice coefficient) for a fuzzy name match
+FUZZY_MIN_SCORE = 0.4
+
+
+def _normalize(text):
+    return re.sub(r"\s+", "", str(text)).lower()
+
+
+def _alias_pattern(alias):
+    """Whole-word regex for an ASCII alias; None for CJK aliases, which match as substrings"""
+    if not alias.isascii():
+        return None
+    return re.compile(rf"(?<![0-9a-z]){re.escape(alias)}(?![0-9a-z])")
+
+
+def _grams(text):
+    """Characters plus bigrams: Chinese names are 2-4 characters, so bigrams alone
+    miss one-character typos such as 台集電 for 台積電"""
+    return set(text) | {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _is_year_token(text, start, end):
+    """A 19xx/20xx number with no ID word around it"""
+    if not _YEAR_PATTERN.fullmatch(text[start:end]):
+        return False
+    around = text[max(0, start - _ID_CONTEXT_CHARS):end + _ID_CONTEXT_CHARS]
+    return not _ID_CONTEXT.search(around)
+
+
+def _is_boundary(char):
+    return not char.isalpha() or char.isascii() or char in _NAME_BOUNDARY_CHARS
+
+
+def _is_whole_token(text, start, end):
+    """Whether text[start:end] is not part of a longer word"""
+    return ((start == 0 or _is_boundary(text[start - 1])) and
+            (end == len(text) or _is_boundary(text[end])))
+
+
+class StockSearchIndex:
+    """
+    In-memory lookup over stock_id, stock_name and industry built once from the
+    stock info snapshot. Exact, prefix and fuzzy lookups touch only dicts, a
+    sorted key list (bisect) and an n-gram inverted index, so they take
+    microseconds regardless of the number of stocks.
+    """
+
+    def __init__(self, stock_info, industry_aliases=INDUSTRY_ALIASES):
+        records = {}
+        if stock_info is not None and not stock_info.empty:
+            columns = [c for c in ("stock_id", "stock_name", "industry_category") if c in stock_info.columns]
+            for row in stock_info[columns].drop_duplicates(subset="stock_id").itertuples(index=False):
+                row = row._asdict()
+                stock_id = str(row["stock_id"])
+                records[stock_id] = {
+                    "stock_id": stock_id,
+                    "stock_name": str(row.get("stock_name") or ""),
+                    "industry": str(row.get("industry_category") or ""),
+                }
+        self.records = records
+
+        # Exact lookups
+        self.by_id = {sid.lower(): sid for sid in records}
+        self.by_name = {}
+        for sid, rec in records.items():
+            if rec["stock_name"]:
+                self.by_name.setdefault(_normalize(rec["stock_name"]), sid)
+        self.name_lengths = sorted({len(n) for n in self.by_name}, reverse=True)
+
+        # Prefix lookups: one sorted list over ids and names
+        self.prefix_keys = sorted([(k, sid) for k, sid in self.by_id.items()] +
+                                  [(k, sid) for k, sid in self.by_name.items()])
+
+        # Fuzzy lookups: name n-gram -> stock ids
+        self.gram_index = defaultdict(set)
+        self.name_grams = {}
+        for name, sid in self.by_name.items():
+            grams = _grams(name)
+            self.name_grams[sid] = grams
+            for gram in grams:
+                self.gram_index[gram].add(sid)
+
+        # Industry aliases, longest first so "農業科技業" wins over "農業科技"
+        aliases = {industry: list(words) for industry, words in industry_aliases.items()}
+        for rec in records.values():
+            if rec["industry"]:
+                aliases.setdefault(rec["industry"], [rec["industry"]])
+        self.industry_aliases = sorted(
+            ((word.lower(), industry) for industry, words in aliases.items() for word in words),
+            key=lambda item: -len(item[0])
+        )
+        self.alias_patterns = [(alias, industry, _alias_pattern(alias)) for alias, industry in self.industry_aliases]
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, stock_id):
+        """Record for an exact stock ID, or None"""
+        sid = self.by_id.get(str(stock_id).lower())
+        return self.records[sid] if sid else None
+
+    def prefix(self, query, limit=10):
+        """Stocks whose ID or name starts with `query`"""
+        key = _normalize(query)
+        if not key:
+            return []
+        found = []
+        start = bisect_left(self.prefix_keys, (key, ""))
+        for k, sid in self.prefix_keys[start:]:
+            if not k.startswith(key):
+                break
+            if sid not in found:
+                found.append(sid)
+                if len(found) == limit:
+                    break
+        return found
+
+    def fuzzy(self, query, limit=10):
+        """(stock_id, score) by n-gram Dice similarity of names, best first"""
+        grams = _grams(_normalize(query))
+        if not grams:
+            return []
+        overlap = defaultdict(int)
+        for gram in grams:
+            for sid in self.gram_index.get(gram, ()):
+                overlap[sid] += 1
+        scored = [
+            (sid, 2 * hits / (len(grams) + len(self.name_grams[sid])))
+            for sid, hits in overlap.items()
+        ]
+        scored = [item for item in scored if item[1] >= FUZZY_MIN_SCORE]
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
+
+    def search(self, query, limit=10):
+        """
+        Ranked records for a search box query. Each whitespace-separated term
+        is tried as an exact ID/name (score 1), a prefix (0.9), a name substring
+        (0.8) and a fuzzy name match (Dice score, below 0.8), and the best
+        score per stock is kept. Industry names/aliases add that industry's stocks
+        (0.5), so "半導體" or "biotech" also return matches.
+        """
+        scores = {}
+
+        def add(sid, score):
+            if score > scores.get(sid, 0):
+                scores[sid] = score
+
+        for term in str(query).split():
+            key = _normalize(term)
+            if not key:
+                continue
+            exact = self.by_id.get(key) or self.by_name.get(key)
+            if exact:
+                add(exact, 1.0)
+            for sid in self.prefix(key, limit):
+                add(sid, 0.9)
+            if len(key) >= 2:
+                for name, sid in self.by_name.items():
+                    if key in name:
+                        add(sid, 0.8)
+            for sid, score in self.fuzzy(key, limit):
+                add(sid, min(score, 0.79))
+            industry = self.find_industry(term) or self._industry_prefix(key)
+            if industry:
+                for sid, rec in self.records.items():
+                    if rec["industry"] == industry:
+                        add(sid, 0.5)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [dict(self.records[sid], score=round(score, 3)) for sid, score in ranked]
+
+    def _industry_prefix(self, key):
+        """Industry whose name or alias starts with `key` ("金融" -> 金融業)"""
+        if len(key) < 2:
+            return ""
+        for alias, industry in self.industry_aliases:
+            if alias.startswith(key):
+                return industry
+        return ""
+
+    def find_stocks(self, text):
+        """
+        Stocks mentioned in free text, in order of appearance: IDs such as 2330 and
+        exact company names such as 台積電 (longest name wins where names overlap).
+        Year-like IDs need an ID word nearby and two-character names must be whole
+        tokens, so "2023 年" and "幸福感" mention no stock.
+        """
+        text = str(text)
+        found = []
+        for match in _ID_PATTERN.finditer(text):
+            if _is_year_token(text, match.start(1), match.end(1)):
+                continue
+            sid = self.by_id.get(match.group(1).lower())
+            if sid:
+                found.append((match.start(), sid))
+
+        normalized = text.lower()
+        i = 0
+        while i < len(normalized):
+            for length in self.name_lengths:
+                sid = self.by_name.get(normalized[i:i + length])
+                if sid and length <= _SHORT_NAME_LENGTH and not _is_whole_token(normalized, i, i + length):
+                    continue
+                if sid:
+                    found.append((i, sid))
+                    i += length - 1
+                    break
+            i += 1
+
+        mentioned = []
+        for _, sid in sorted(found):
+            if sid not in mentioned:
+                mentioned.append(sid)
+        return [self.records[sid] for sid in mentioned]
+
+    def find_industry(self, text):
+        """Industry named in free text (longest alias wins), or ''"""
+        return self.match_industry(text)[0]
+
+    def match_industry(self, text):
+        """(industry, matched alias) for free text, or ('', ''). English aliases match whole words only."""
+        query = str(text).lower()
+        for alias, industry, pattern in self.alias_patterns:
+            if pattern.search(query) if pattern else alias in query:
+                return industry, alias
+        return "", ""
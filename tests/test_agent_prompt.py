@@ -0,0 +1,35 @@
+import agent_core
+
+STOCK_2409 = {"stock_id": "2409", "stock_name": "友達", "industry": "光電業"}
+STOCK_3034 = {"stock_id": "3034", "stock_name": "聯詠", "industry": "光電業"}
+
+
+def _route(monkeypatch, industry, stocks):
+    monkeypatch.setattr(agent_core, "route_question", lambda query: (industry, stocks))
+    monkeypatch.setattr(agent_core, "detect_industry", lambda query: "")
+    monkeypatch.setattr(agent_core, "get_best_stock_for_industry", lambda industry, lang: f"RANKINGS {industry}")
+    monkeypatch.setattr(agent_core, "loaded_industries", lambda: [])
+    monkeypatch.setattr(agent_core, "get_financial_statements", lambda stock_id: f"STATEMENTS {stock_id}")
+    monkeypatch.setattr(agent_core, "compare_stocks", lambda stock_ids: f"COMPARE {','.join(stock_ids)}")
+
+
+def test_single_stock_question_gets_its_statements(monkeypatch):
+    _route(monkeypatch, "光電業", [STOCK_2409])
+    prompt, _ = agent_core.build_agent_prompt("友達的財務狀況如何?", "zh")
+    assert "RANKINGS 光電業" in prompt
+    assert "STATEMENTS 2409" in prompt
+
+
+def test_comparison_uses_the_metrics_cube(monkeypatch):
+    _route(monkeypatch, "光電業", [STOCK_2409, STOCK_3034])
+    prompt, industry = agent_core.build_agent_prompt("2409 vs 3034", "en")
+    assert "COMPARE 2409,3034" in prompt
+    assert "STATEMENTS" not in prompt and "RANKINGS" not in prompt
+    assert industry == ""
+
+
+def test_industry_question_gets_no_statements(monkeypatch):
+    _route(monkeypatch, "光電業", [])
+    prompt, _ = agent_core.build_agent_prompt("best optoelectronics stock", "en")
+    assert "RANKINGS 光電業" in prompt
+    assert "STATEMENTS" not in prompt
@@ -0,0 +1,44 @@
+import requests
+
+from finmind_client import CircuitBreaker, sdk_failure_kind
+
+
+def test_opens_after_consecutive_outages():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure("timeout")
+    assert breaker.allow_request()
+    breaker.record_failure("timeout")
+    assert breaker.is_open()
+    assert not breaker.allow_request()
+
+
+def test_half_open_lets_one_probe_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure("timeout")
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.allow_request() and breaker.allow_request()
+
+
+def test_released_probe_can_be_taken_again():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure("timeout")
+    assert breaker.allow_request()
+    breaker.release_probe()
+    assert breaker.allow_request()
+
+
+def test_quota_opens_immediately():
+    breaker = CircuitBreaker(failure_threshold=5)
+    breaker.trip_quota()
+    assert breaker.is_open()
+    assert breaker.status()["quota_exhausted"]
+
+
+def test_sdk_failures_are_classified():
+    assert sdk_failure_kind(Exception("Final response status: 402, text: limit")) == "quota"
+    assert sdk_failure_kind(Exception("Final response status: 503, text: busy")) == "outage"
+    assert sdk_failure_kind(requests.ConnectionError("down")) == "outage"
+    assert sdk_failure_kind(Exception("Final response status: 400, text: bad stock_id")) is None
+    assert sdk_failure_kind(KeyError("date")) is None
@@ -0,0 +1,34 @@
+import history_store
+
+
+def test_find_answer_matches_question_key_and_data(tmp_path):
+    db = str(tmp_path / "history.sqlite")
+    history_store.save_turn("s1", "Best stock in 光電業?", "2409", "en", "m", "v1", industry="光電業", db_path=db)
+
+    assert history_store.find_answer("  best STOCK in 光電業? ", "en", "m", "v1", db_path=db)["answer"] == "2409"
+    assert history_store.find_answer("Best stock in 光電業?", "zh", "m", "v1", db_path=db) is None
+    assert history_store.find_answer("Best stock in 光電業?", "en", "m", "v2", db_path=db) is None
+
+
+def test_answers_without_industry_are_not_reused(tmp_path):
+    db = str(tmp_path / "history.sqlite")
+    history_store.save_turn("s1", "compare 2409 and 3034", "3034", "en", "m", "v1", db_path=db)
+    assert history_store.find_answer("compare 2409 and 3034", "en", "m", "v1", db_path=db) is None
+
+
+def test_list_turns_is_scoped_to_the_session(tmp_path):
+    db = str(tmp_path / "history.sqlite")
+    history_store.save_turn("s1", "industry question", "a", "en", "m", "v", industry="光電業", db_path=db)
+    history_store.save_turn("s1", "private s1", "a", "en", "m", "v", db_path=db)
+    history_store.save_turn("s2", "private s2", "a", "en", "m", "v", db_path=db)
+
+    own = [t["question"] for t in history_store.list_turns(session_id="s2", db_path=db)]
+    shared = [t["question"] for t in history_store.list_turns(session_id="s2", shared_industry=True, db_path=db)]
+    assert own == ["private s2"]
+    assert shared == ["private s2", "industry question"]
+
+
+def test_missing_database_reads_as_empty(tmp_path):
+    db = str(tmp_path / "none.sqlite")
+    assert history_store.list_turns(db_path=db) == []
+    assert history_store.find_answer("q", "en", "m", "v", db_path=db) is None
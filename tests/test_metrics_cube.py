@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+from metrics_cube import HISTORY_METRICS, MetricsCube
+
+
+def make_cube():
+    rows = []
+    # 2330 reports every quarter, 2317 is one quarter behind; nobody reports 2024-12
+    for stock_id, name, dates in (
+        ("2330", "台積電", ["2024-03-31", "2024-06-30", "2024-09-30"]),
+        ("2317", "鴻海", ["2023-12-31", "2024-03-31", "2024-06-30"]),
+    ):
+        for i, date in enumerate(dates):
+            rows.append({
+                "stock_id": stock_id, "stock_name": name, "industry": "半導體業", "date": date,
+                "EPS": float(i + 1), "GrossMargin": 0.5, "FreeCashFlow": 2e6,
+                "PassedBalance": i % 2, "PassedIncome": 1, "PassedCashflow": 0,
+            })
+    rows.append({"stock_id": "1101", "stock_name": "台泥", "industry": "水泥工業",
+                 "date": "2024-12-31", "EPS": 9.0})
+    return MetricsCube.from_frame(pd.DataFrame(rows))
+
+
+def test_history_aligns_on_quarters_the_selected_stocks_report():
+    _, history, _ = make_cube().compare(["2330", "2317"], quarters=3)
+    # 2024-12 belongs only to 1101 and is outside the window
+    assert list(history.columns) == ["metric:stock", "2024-03", "2024-06", "2024-09"]
+    eps = history.set_index("metric:stock").loc[["eps:2330", "eps:2317"]]
+    assert eps.loc["eps:2330"].tolist() == [1.0, 2.0, 3.0]
+    assert eps.loc["eps:2317"].iloc[:2].tolist() == [2.0, 3.0]
+    assert np.isnan(eps.loc["eps:2317", "2024-09"])
+    assert len(history) == len(HISTORY_METRICS) * 2
+
+
+def test_summary_averages_window_and_scales():
+    summary, _, _ = make_cube().compare(["2330", "2317"], quarters=2)
+    summary = summary.set_index("stock_id")
+    assert summary.loc["2330", "eps"] == 2.5
+    assert summary.loc["2317", "eps"] == 3.0
+    assert summary.loc["2330", "gm"] == 50.0  # ratio shown as %
+    assert summary.loc["2330", "fcf_m"] == 2.0
+    # Pass rates cover every reported quarter, not just the window
+    assert summary.loc["2330", "pass_bal"] == 33
+    assert summary.loc["2330", "pass_inc"] == 100
+
+
+def test_unknown_ids_are_reported_missing():
+    summary, _, missing = make_cube().compare([" 2330", "9999", "2330", "0000"])
+    assert summary["stock_id"].tolist() == ["2330"]
+    assert missing == ["9999", "0000"]
+
+
+def test_all_missing_returns_empty_frames():
+    summary, history, missing = make_cube().compare(["9999"])
+    assert summary.empty and history.empty
+    assert missing == ["9999"]
+
+
+def test_save_load_round_trip(tmp_path):
+    cube = make_cube()
+    path = tmp_path / "cube.npz"
+    cube.save(str(path))
+    loaded = MetricsCube.load(str(path))
+    assert loaded.stock_ids.tolist() == cube.stock_ids.tolist()
+    np.testing.assert_array_equal(loaded.values, cube.values)
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from price_charts import MAX_CANDLES, lttb, prepare_ohlc, resample_line
+
+
+def _daily_prices(days):
+    dates = pd.bdate_range("2020-01-01", periods=days)
+    close = np.linspace(10, 20, days)
+    return pd.DataFrame({
+        "date": dates.strftime("%Y-%m-%d"),
+        "open": close - 0.5, "max": close + 1, "min": close - 1, "close": close,
+        "Trading_Volume": np.full(days, 100),
+    })
+
+
+def test_lttb_keeps_endpoints_and_extremes():
+    x = np.arange(1000)
+    y = np.zeros(1000)
+    y[123], y[777] = 50, -50
+    idx = lttb(x, y, 100)
+    assert len(idx) == 100
+    assert idx[0] == 0 and idx[-1] == 999
+    assert 123 in idx and 777 in idx
+    assert (np.diff(idx) > 0).all()
+
+
+def test_lttb_returns_everything_under_the_threshold():
+    assert lttb(np.arange(10), np.arange(10), 50).tolist() == list(range(10))
+
+
+def test_short_range_stays_daily():
+    df = _daily_prices(100)
+    candles, interval = prepare_ohlc(df)
+    assert interval == "D"
+    assert candles is df
+
+
+def test_long_range_is_aggregated_within_budget():
+    df = _daily_prices(1300)
+    candles, interval = prepare_ohlc(df)
+    assert interval == "W"
+    assert len(candles) <= MAX_CANDLES
+    # Volume is summed and the range is covered end to end
+    assert candles["Trading_Volume"].sum() == df["Trading_Volume"].sum()
+    assert candles["close"].iloc[-1] == df["close"].iloc[-1]
+
+
+def test_resample_line_matches_candle_dates():
+    df = _daily_prices(1300)
+    candles, interval = prepare_ohlc(df)
+    series = df.assign(date=pd.to_datetime(df["date"])).set_index("date")["close"]
+    line = resample_line(series, interval)
+    assert line.index.tolist() == candles["date"].tolist()
+    assert np.allclose(line.to_numpy(), candles["close"].to_numpy())
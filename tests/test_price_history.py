@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+
+import finmind_tools
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    calls = []
+    monkeypatch.setattr(finmind_tools, "_price_checked_at", finmind_tools.OrderedDict())
+    monkeypatch.setattr(finmind_tools, "stored_date_range", lambda stock_id: (None, None))
+    monkeypatch.setattr(finmind_tools, "_fetch_prices_into_store", lambda stock_id, *a, **k: calls.append(stock_id))
+    monkeypatch.setattr(finmind_tools, "load_history", lambda stock_id, days: pd.DataFrame())
+    return calls
+
+
+def test_checks_are_throttled_per_stock_and_lookback(fetches):
+    finmind_tools.get_price_history("2330", 30)
+    finmind_tools.get_price_history("2330", 30)
+    finmind_tools.get_price_history("2330", 365)
+    assert fetches == ["2330", "2330"]
+
+
+def test_expired_checks_are_swept(fetches, monkeypatch):
+    finmind_tools.get_price_history("2330", 30)
+    stale = pd.Timestamp.now() - pd.Timedelta(minutes=finmind_tools.PRICE_RECHECK_MINUTES + 1)
+    finmind_tools._price_checked_at[("2330", 30)] = stale
+    finmind_tools.get_price_history("2409", 30)
+    assert ("2330", 30) not in finmind_tools._price_checked_at
+    finmind_tools.get_price_history("2330", 30)
+    assert fetches == ["2330", "2409", "2330"]
+
+
+def test_remembered_checks_are_bounded(fetches, monkeypatch):
+    monkeypatch.setattr(finmind_tools, "PRICE_CHECKS_MAX", 10)
+    for i in range(50):
+        finmind_tools.get_price_history(str(1000 + i), 30)
+    assert len(finmind_tools._price_checked_at) <= 10
+    assert ("1049", 30) in finmind_tools._price_checked_at
@@ -0,0 +1,51 @@
+import pandas as pd
+
+import price_store
+from indicators import compute_latest_indicators
+
+
+def _rows(stock_id, dates, close=10.0):
+    return pd.DataFrame({
+        "date": dates, "stock_id": stock_id, "Trading_Volume": 1000,
+        "open": close, "max": close + 1, "min": close - 1, "close": close,
+    })
+
+
+def _market_store(tmp_path):
+    store = str(tmp_path / "prices")
+    days = pd.bdate_range(end=pd.Timestamp.now().normalize() - pd.Timedelta(days=7), periods=40)
+    for stock_id in ("1101", "2330"):
+        price_store.append_prices(_rows(stock_id, days), store)
+    return store, days[-1]
+
+
+def test_backfill_does_not_move_the_market_date(tmp_path):
+    store, market_day = _market_store(tmp_path)
+    newer = pd.bdate_range(start=market_day + pd.Timedelta(days=1), periods=3)
+    price_store.append_backfill(_rows("2330", newer, close=12.0), store)
+
+    assert price_store.max_stored_date(store) == market_day
+    snapshot = price_store.load_snapshot(store_dir=store)
+    assert (snapshot["date"] == market_day).all()
+    indicators = compute_latest_indicators(store_dir=store)
+    assert (indicators["date"] == market_day).all()
+    assert (indicators["volume"] > 0).all()
+
+
+def test_history_and_range_include_backfill(tmp_path):
+    store, market_day = _market_store(tmp_path)
+    newer = pd.bdate_range(start=market_day + pd.Timedelta(days=1), periods=3)
+    price_store.append_backfill(_rows("2330", newer, close=12.0), store)
+
+    history = price_store.load_history("2330", days=120, store_dir=store)
+    assert history["date"].max() == newer[-1]
+    assert history["date"].is_unique
+    assert price_store.stored_date_range("2330", store)[1] == newer[-1]
+    assert price_store.stored_date_range("1101", store)[1] == market_day
+
+
+def test_market_rows_win_over_backfill(tmp_path):
+    store, market_day = _market_store(tmp_path)
+    price_store.append_backfill(_rows("2330", [market_day], close=99.0), store)
+    history = price_store.load_history("2330", days=120, store_dir=store)
+    assert history.loc[history["date"] == market_day, "close"].tolist() == [10.0]
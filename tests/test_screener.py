@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from screener import screen_stocks
+
+
+def _indicators(n=25):
+    return pd.DataFrame({
+        "stock_id": [f"{1000 + i}" for i in range(n)],
+        "rsi_14": [i * 4.0 for i in range(n)],
+        "current_price": [10.0] * n,
+        "sma_20": [9.0 if i % 2 else 11.0 for i in range(n)],
+        "volume_ratio": [1.0 + i / 10 for i in range(n)],
+        "return_5d": [float(i) for i in range(n)],
+        "industry_category": ["A" if i < 10 else "B" for i in range(n)],
+    })
+
+
+def test_conditions_are_combined():
+    df = _indicators()
+    result, total = screen_stocks(df, rsi_max=60, above_sma_20=True, industries=["A"])
+    assert total == len(result) == 5
+    assert (result["rsi_14"] < 60).all()
+    assert (result["current_price"] > result["sma_20"]).all()
+    assert set(result["industry_category"]) == {"A"}
+
+
+def test_pages_split_sorted_matches():
+    df = _indicators()
+    first, total = screen_stocks(df, sort_by="rsi_14", ascending=False, page=1, page_size=10)
+    second, _ = screen_stocks(df, sort_by="rsi_14", ascending=False, page=2, page_size=10)
+    assert total == 25
+    assert first["rsi_14"].tolist() == sorted(df["rsi_14"], reverse=True)[:10]
+    assert second["rsi_14"].tolist() == sorted(df["rsi_14"], reverse=True)[10:20]
+
+
+def test_page_past_the_end_returns_last_page():
+    result, total = screen_stocks(_indicators(), page=99, page_size=10)
+    assert total == 25
+    assert result["stock_id"].tolist() == [f"{1000 + i}" for i in range(20, 25)]
+
+
+def test_unknown_return_window_is_rejected():
+    with pytest.raises(ValueError):
+        screen_stocks(_indicators(), return_days=7, return_min=1)
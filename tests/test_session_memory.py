@@ -0,0 +1,40 @@
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from agent_core import SUMMARY_QUESTIONS, SessionMemory, with_history
+
+
+def test_window_stays_within_the_token_budget():
+    memory = SessionMemory(token_budget=100)
+    for i in range(20):
+        memory.add_turn(f"question {i}", "answer " * 40)
+    assert memory.tokens <= 100
+    # Turns that left the window are summarised by their question, the latest SUMMARY_QUESTIONS only
+    summary = memory.summary()
+    assert "question 18" in summary and "question 19" not in summary
+    assert "question 0;" not in summary
+    assert summary.count(";") == SUMMARY_QUESTIONS - 1
+
+
+def test_newest_turn_is_kept_even_over_budget():
+    memory = SessionMemory(token_budget=5)
+    memory.add_turn("long question", "answer " * 100)
+    assert len(memory) == 1
+
+
+def test_history_precedes_the_new_prompt():
+    memory = SessionMemory(token_budget=10_000)
+    memory.add_turn("q1", "a1")
+    messages = with_history("q2", memory)
+    assert [type(m) for m in messages] == [HumanMessage, AIMessage, HumanMessage]
+    assert messages[-1].content == "q2"
+
+
+def test_summary_is_sent_as_a_system_message():
+    memory = SessionMemory(token_budget=20)
+    memory.add_turn("first question", "answer " * 30)
+    memory.add_turn("second question", "answer " * 30)
+    messages = memory.messages()
+    assert isinstance(messages[0], SystemMessage)
+    assert "first question" in messages[0].content
+    memory.clear()
+    assert memory.messages() == []
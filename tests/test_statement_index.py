@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+import finmind_tools
+import statement_index
+from statement_index import read_statements, summarize_statements
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    rows = []
+    for stock_id, name, ocf, capex in (("2409", "友達", 10e6, -3e6), ("3034", "聯詠", 20e6, 4e6)):
+        for date in ("2024-03-31", "2024-06-30"):
+            rows += [
+                {"date": date, "stock_id": stock_id, "stock_name": name, "type": "CashFlowsFromOperatingActivities", "value": ocf},
+                {"date": date, "stock_id": stock_id, "stock_name": name, "type": "PropertyAndPlantAndEquipment", "value": capex},
+                {"date": date, "stock_id": stock_id, "stock_name": name, "type": "EPS", "value": 1.5},
+            ]
+    csv_dir = tmp_path / "data"
+    csv_dir.mkdir()
+    pd.DataFrame(rows).to_csv(csv_dir / "光電業.csv", index=False)
+    monkeypatch.setattr(finmind_tools, "DATA_DIR", str(csv_dir))
+    monkeypatch.setattr(statement_index, "STATEMENT_INDEX_DIR", str(tmp_path / "index"))
+    monkeypatch.setattr(statement_index, "_indexes", {})
+    return csv_dir
+
+
+def test_reads_one_stock_from_finmind_data_dir(data_dir):
+    df = read_statements("3034", "v1")
+    assert set(df["stock_id"]) == {"3034"}
+    assert len(df) == 6
+
+
+def test_unknown_stock_reads_empty(data_dir):
+    assert read_statements("9999", "v1").empty
+
+
+@pytest.mark.parametrize("stock_id", ["2409", "3034"])
+def test_free_cash_flow_subtracts_capex_whatever_its_sign(data_dir, stock_id):
+    summary = summarize_statements(read_statements(stock_id, "v1")).set_index("metric")
+    ocf = summary.loc["operating_cash_flow"]
+    capex = summary.loc["capex"]
+    assert (summary.loc["free_cash_flow"] == ocf - capex.abs()).all()
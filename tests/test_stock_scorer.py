@@ -0,0 +1,39 @@
+import pandas as pd
+
+from stock_scorer import SCORE_METRICS, category_scores, score_industry
+
+
+def _income(interest_margins, passed=(50, 50)):
+    return pd.DataFrame({
+        "stock_id": ["1101", "1102"],
+        "stock_name": ["A", "B"],
+        "% Passed": [f"{p}%" for p in passed],
+        "Avg Gross Margin (%)": [30.0, 30.0],
+        "Avg Interest Margin (%)": interest_margins,
+        "Avg Net Profit Margin (%)": [10.0, 10.0],
+        "Avg EPS": [2.0, 2.0],
+    })
+
+
+def test_lower_interest_margin_scores_higher():
+    scores = category_scores(_income([5.0, 40.0]), SCORE_METRICS["income"])
+    assert scores["1101"] > scores["1102"]
+
+
+def test_best_stock_prefers_lower_interest_margin():
+    scores = score_industry({"income": _income([40.0, 5.0])})
+    assert scores["stock_id"].tolist() == ["1102", "1101"]
+
+
+def test_passed_share_outweighs_single_metric():
+    scores = category_scores(_income([40.0, 5.0], passed=(90, 10)), SCORE_METRICS["income"])
+    assert scores["1101"] > scores["1102"]
+
+
+def test_missing_category_scores_zero():
+    income = _income([5.0, 40.0])
+    cashflow = pd.DataFrame({"stock_id": ["1101"], "stock_name": ["A"], "% Passed": ["100%"],
+                             "Avg Free Cash Flow": [1.0], "Avg Net Debt Change": [0.0]})
+    scores = score_industry({"income": income, "cashflow": cashflow}).set_index("stock_id")
+    assert scores.loc["1102", "cashflow"] == 0
+    assert scores.loc["1101", "balance"] == 0
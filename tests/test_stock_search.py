@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from stock_search import StockSearchIndex
+
+
+@pytest.fixture(scope="module")
+def index():
+    return StockSearchIndex(pd.DataFrame({
+        "stock_id": ["2023", "2409", "3034", "1234", "2330"],
+        "stock_name": ["幸福", "友達", "聯詠", "冠軍", "台積電"],
+        "industry_category": ["鋼鐵工業", "光電業", "光電業", "食品工業", "半導體業"],
+    }))
+
+
+@pytest.mark.parametrize("question", [
+    "Which stocks have the best display of cash flow?",
+    "Tell me the biography of the founder",
+    "Which company is best at trading volume growth?",
+    "Any homework on living costs?",
+    "Is the toilet paper shortage over?",
+    "Best stock in Las Vegas?",
+])
+def test_everyday_english_words_name_no_industry(index, question):
+    assert index.find_industry(question) == ""
+
+
+@pytest.mark.parametrize("question, industry", [
+    ("best semiconductor stock", "半導體業"),
+    ("top biotech picks", "生技醫療業"),
+    ("oil and gas leaders", "油電燃氣業"),
+    ("e-commerce winners", "電子商務業"),
+    ("光電業最好的股票", "光電業"),
+    ("半導體業semiconductor", "半導體業"),
+])
+def test_industry_aliases(index, question, industry):
+    assert index.find_industry(question) == industry
+
+
+def test_years_are_not_stock_ids(index):
+    assert index.find_stocks("2023年營收") == []
+    assert [r["stock_id"] for r in index.find_stocks("代號 2023")] == ["2023"]
+
+
+def test_short_names_must_be_whole_tokens(index):
+    assert index.find_stocks("我很幸福感") == []
+    assert [r["stock_id"] for r in index.find_stocks("友達和聯詠比較")] == ["2409", "3034"]
+    assert [r["stock_id"] for r in index.find_stocks("台積電好嗎")] == ["2330"]
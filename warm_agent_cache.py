@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Pre-generates Stock Agent answers for every preset industry button, in both
+languages, into the LLM answer cache (llm_cache.py).
+
+Run after downloading new industry CSVs: answers are keyed by the CSV data
+version, so stale ones are simply never looked up again.
+"""
+
+import argparse
+import os
+import time
+
+from dotenv import load_dotenv
+
+from agent_core import AGENT_MODEL, PRESET_INDUSTRIES, build_agent_prompt, create_llm, preset_question
+from finmind_tools import get_data_version, preload_all_industry_rankings
+from llm_cache import LLM_CACHE_DIR, get_cached_answer, store_answer
+
+
+def warm_cache(languages, industries, force=False, sleep=0.5, cache_dir=None):
+    """Generates missing answers; returns (generated, skipped, failed) counts"""
+    load_dotenv()
+    llm = create_llm(os.getenv("OPENAI_API_KEY"), streaming=False)
+
+    print("📊 Loading industry rankings...")
+    preload_all_industry_rankings()
+    data_version = get_data_version()
+    print(f"🔑 Data version: {data_version}")
+
+    generated = skipped = failed = 0
+    jobs = [(industry, lang) for industry in industries for lang in languages]
+    for i, (industry, lang) in enumerate(jobs, 1):
+        prompt, matched = build_agent_prompt(preset_question(industry, lang), lang)
+        if not matched:
+            print(f"  [{i}/{len(jobs)}] {industry} ({lang}): no ranking data, skipped")
+            skipped += 1
+            continue
+        if not force and get_cached_answer(prompt, AGENT_MODEL, lang, data_version, cache_dir):
+            print(f"  [{i}/{len(jobs)}] {industry} ({lang}): already cached")
+            skipped += 1
+            continue
+
+        try:
+            start = time.time()
+            answer = llm.invoke(prompt).content
+            store_answer(prompt, AGENT_MODEL, lang, data_version, answer, cache_dir)
+            generated += 1
+            print(f"  [{i}/{len(jobs)}] {industry} ({lang}): ✅ {len(answer)} chars in {time.time() - start:.1f}s")
+        except Exception as e:
+            failed += 1
+            print(f"  [{i}/{len(jobs)}] {industry} ({lang}): ❌ {e}")
+
+        time.sleep(sleep)  # Rate limiting
+
+    return generated, skipped, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pre-generate Stock Agent answers for preset industries')
+    parser.add_argument('--languages', nargs='+', default=['en', 'zh'], choices=['en', 'zh'],
+                        help='Languages to generate (default: en zh)')
+    parser.add_argument('--industries', nargs='+', default=PRESET_INDUSTRIES,
+                        help='Industries to generate (default: all preset industries)')
+    parser.add_argument('--force', action='store_true', help='Regenerate answers that are already cached')
+    parser.add_argument('--cache-dir', type=str, default=None, help=f'Cache directory (default: {LLM_CACHE_DIR})')
+    args = parser.parse_args()
+
+    generated, skipped, failed = warm_cache(args.languages, args.industries, args.force, cache_dir=args.cache_dir)
+    print(f"✅ Generated {generated}, skipped {skipped}, failed {failed}")
+
+
+if __name__ == "__main__":
+    main()